@@ -10,11 +10,8 @@ import requests
 app = Flask(__name__)
 app.secret_key = 'Joy@#12345'
 
-# Database and upload folder settings
+# Database settings
 DATABASE = 'geeklogin.db'
-UPLOAD_FOLDER = 'uploads'
-app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
 # Activity label mapping for predictions
 label_map = {
@@ -162,16 +159,14 @@ def predict():
         if not acc_file or not gyro_file:
             flash('Please upload both Accelerometer and Gyroscope CSV files!', 'warning')
         else:
-            # Save uploads
-            acc_path = os.path.join(app.config['UPLOAD_FOLDER'], secure_filename(acc_file.filename))
-            gyro_path = os.path.join(app.config['UPLOAD_FOLDER'], secure_filename(gyro_file.filename))
-            acc_file.save(acc_path)
-            gyro_file.save(gyro_path)
-
+            # Forward the upload streams as-is; nothing is written to disk
             try:
                 resp = requests.post(
                     'http://localhost:8000/predict/',
-                    files={'acc_file': open(acc_path, 'rb'), 'gyro_file': open(gyro_path, 'rb')}
+                    files={
+                        'acc_file': (secure_filename(acc_file.filename), acc_file.stream, acc_file.mimetype),
+                        'gyro_file': (secure_filename(gyro_file.filename), gyro_file.stream, gyro_file.mimetype)
+                    }
                 )
                 resp.raise_for_status()
                 data = resp.json().get('activity_summary_seconds', {})
@@ -0,0 +1,228 @@
+"""
+End-to-end benchmarks for the training and serving hot paths.
+
+Run from the repository root::
+
+    python -m benchmarks.run --duration 600 --output bench.json
+    python -m benchmarks.run --duration 600 --baseline bench.json
+
+Everything runs on synthetic 50 Hz recordings inside a scratch workspace
+(the repo's config is symlinked in, artifacts are written to the scratch
+directory), so the benchmark never touches ``artifacts/``.
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import argparse
+import tempfile
+import subprocess
+import tracemalloc
+from pathlib import Path
+from statistics import median
+from typing import Callable
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+
+def measure(fn: Callable, n_windows: int, repeat: int, warmup: bool = True) -> dict:
+    """
+    Time ``fn`` (after one warm-up call) and record its memory footprint.
+
+    ``peak_alloc_mb`` is the largest Python/NumPy heap growth during one
+    extra traced call. ``peak_rss_mb`` is the process high-water mark once
+    the stage has run, so it only grows over the course of a run.
+    """
+    # Imported lazily like the rest of the package, so logs/ lands in the scratch workspace
+    from src.actionguardian.utils.run_metrics import peak_rss_mb
+
+    if warmup:
+        fn()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    fn()
+    _, peak_alloc = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "median_s": median(times),
+        "min_s": min(times),
+        "repeat": repeat,
+        "windows": n_windows,
+        "windows_per_s": n_windows / median(times) if median(times) > 0 else None,
+        "peak_alloc_mb": peak_alloc / (1 << 20),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def prepare_workspace() -> Path:
+    """Scratch directory with the repo's config files linked in; becomes the working directory."""
+    workspace = Path(tempfile.mkdtemp(prefix="actionguardian-bench-"))
+    for name in ("config", "params.yaml", "schema.yaml"):
+        os.symlink(REPO_ROOT / name, workspace / name)
+    os.chdir(workspace)
+    return workspace
+
+
+def run_benchmarks(duration_s: float, repeat: int, train_duration_s: float, endpoint: bool) -> dict:
+    # Imported after chdir so logs/ and artifacts/ land in the scratch workspace
+    from benchmarks.synthetic import synthetic_sensor_csvs, synthetic_training_frame
+    from src.actionguardian.config.configuration import ConfigurationManager
+    from src.actionguardian.components.data_preprocessing import DataPreprocessor
+    from src.actionguardian.components.model_trainer import ModelTrainer
+    from src.actionguardian.pipeline.prediction_pipeline import (
+        load_and_merge_sensor_data,
+        create_sliding_windows,
+        extract_features_from_windows,
+        load_serving_artifacts,
+        predict_window_proba
+    )
+    from src.actionguardian.utils.model_registry import registry
+    from src.actionguardian.utils.onnx_model import OnnxClassifier
+
+    manager = ConfigurationManager()
+    serving_config = manager.get_serving_config()
+    window, step, rate = serving_config.window_size, serving_config.step_size, serving_config.sampling_rate
+    results = {}
+
+    # ---------------------- training path ----------------------
+    preprocessor = DataPreprocessor(manager.get_data_preprocessing_config())
+    train_windows, train_labels = preprocessor.create_sliding_windows(synthetic_training_frame(train_duration_s, rate))
+    results["DataPreprocessor.extract_features"] = measure(
+        lambda: preprocessor.extract_features(train_windows), len(train_windows), repeat
+    )
+
+    trainer = ModelTrainer(manager.get_model_trainer_config())
+    train_features = preprocessor.extract_features(train_windows)
+    X_scaled = trainer.scale_features(train_features)
+    y_enc = trainer.encode_labels(train_labels)
+    results["ModelTrainer.train_and_evaluate"] = measure(
+        lambda: trainer.train_and_evaluate(X_scaled, y_enc), len(train_windows), repeat=1, warmup=False
+    )
+
+    # ---------------------- serving path ----------------------
+    acc_bytes, gyro_bytes = synthetic_sensor_csvs(duration_s, rate)
+    df = load_and_merge_sensor_data(acc_bytes, gyro_bytes)
+    X_windows, _ = create_sliding_windows(df, window, step)
+    features = extract_features_from_windows(X_windows, rate)
+    n = len(X_windows)
+
+    results["load_and_merge_sensor_data"] = measure(lambda: load_and_merge_sensor_data(acc_bytes, gyro_bytes), n, repeat)
+    results["create_sliding_windows"] = measure(lambda: create_sliding_windows(df, window, step), n, repeat)
+    results["extract_features_from_windows"] = measure(lambda: extract_features_from_windows(X_windows, rate), n, repeat)
+
+    model = registry.get(serving_config.model_path)
+    X_served = registry.get(serving_config.scaler_path).transform(features)
+    results["model.predict"] = measure(lambda: model.predict(X_served), n, repeat)
+    if serving_config.compiled_model_path.exists():
+        compiled = registry.get(serving_config.compiled_model_path)
+        results["compiled_model.predict"] = measure(lambda: compiled.predict(X_served), n, repeat)
+    if serving_config.compact_model_path.exists():
+        compact = registry.get(serving_config.compact_model_path)
+        results["compact_model.predict"] = measure(lambda: compact.predict(X_served), n, repeat)
+    if serving_config.onnx_model_path.exists():
+        # The ONNX graph includes the scaler, so it takes the raw features
+        onnx_model = OnnxClassifier(serving_config.onnx_model_path, serving_config.onnx_intra_op_threads)
+        results["onnx_model.predict"] = measure(lambda: onnx_model.predict(features), n, repeat)
+    results["predict_window_proba"] = measure(
+        lambda: predict_window_proba(features, *load_serving_artifacts(serving_config)[:2]), n, repeat
+    )
+
+    if endpoint:
+        from fastapi.testclient import TestClient
+        import fast_api_server
+
+        files = {"acc_file": ("Accelerometer.csv", acc_bytes), "gyro_file": ("Gyroscope.csv", gyro_bytes)}
+        with TestClient(fast_api_server.app) as client:
+            def post(headers=None, expect=None):
+                response = client.post("/predict/", files=files, headers=headers)
+                response.raise_for_status()
+                assert expect is None or response.headers["X-Cache"] == expect, response.headers["X-Cache"]
+            # Bypass the result cache so every call runs the whole prediction
+            results["POST /predict/"] = measure(lambda: post({"Cache-Control": "no-cache"}, "BYPASS"), n, repeat)
+            post()   # fill the cache for the same upload
+            results["POST /predict/ (cache hit)"] = measure(lambda: post(expect="HIT"), n, repeat)
+
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "duration_s": duration_s,
+            "train_duration_s": train_duration_s,
+            "window_size": window,
+            "step_size": step,
+            "sampling_rate": rate,
+            "serving_backend": serving_config.backend,
+        },
+        "results": results,
+    }
+
+
+def print_report(report: dict, baseline: dict = None):
+    base = (baseline or {}).get("results", {})
+    header = f"{'stage':36} {'median ms':>10} {'windows/s':>12} {'alloc MB':>9} {'RSS MB':>8}"
+    if base:
+        header += f" {'vs ' + baseline['meta']['commit']:>12}"
+    print(header)
+    for stage, r in report["results"].items():
+        line = (f"{stage:36} {r['median_s'] * 1e3:10.2f} {r['windows_per_s'] or 0:12.0f} "
+                f"{r['peak_alloc_mb']:9.1f} {r['peak_rss_mb']:8.0f}")
+        if stage in base and base[stage]["windows_per_s"] and r["windows_per_s"]:
+            # Throughput ratio, so runs over different durations stay comparable
+            line += f" {r['windows_per_s'] / base[stage]['windows_per_s']:11.2f}x"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the ActionGuardian training and serving paths.")
+    parser.add_argument("--duration", type=float, default=600.0, help="Seconds of synthetic upload data (default: 600)")
+    parser.add_argument("--train-duration", type=float, default=1800.0, help="Seconds of synthetic training data (default: 1800)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per stage after one warm-up (default: 5)")
+    parser.add_argument("--no-endpoint", action="store_true", help="Skip the /predict/ round trip through TestClient")
+    parser.add_argument("--output", type=Path, help="Write the JSON report here")
+    parser.add_argument("--baseline", type=Path, help="Earlier JSON report to compare against (throughput ratio per stage)")
+    parser.add_argument("--keep-workspace", action="store_true", help="Keep the scratch directory with the trained artifacts")
+    args = parser.parse_args()
+
+    output = args.output.resolve() if args.output else None
+    baseline = json.loads(args.baseline.read_text()) if args.baseline else None
+
+    workspace = prepare_workspace()
+    try:
+        report = run_benchmarks(args.duration, args.repeat, args.train_duration, endpoint=not args.no_endpoint)
+    finally:
+        os.chdir(REPO_ROOT)
+        if not args.keep_workspace:
+            shutil.rmtree(workspace, ignore_errors=True)
+
+    print_report(report, baseline)
+    if output:
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(report, indent=4))
+        print(f"Wrote {output}")
+    else:
+        print(json.dumps(report, indent=4))
+
+
+if __name__ == "__main__":
+    main()
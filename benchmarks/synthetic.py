@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+from typing import Tuple
+
+from src.actionguardian.components.data_transformation import SENSOR_COLUMNS
+
+ACTIVITIES = ("walking", "jogging", "sitting", "standing", "upstair", "downstair")
+
+# Dominant frequency (Hz) and amplitude of the synthetic motion per activity
+_ACTIVITY_MOTION = {
+    "walking": (1.8, 3.0), "jogging": (2.8, 8.0), "sitting": (0.2, 0.1),
+    "standing": (0.3, 0.2), "upstair": (1.5, 3.5), "downstair": (1.7, 4.0),
+}
+
+
+def _signal(seconds: np.ndarray, activity_idx: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """Three axes of periodic motion plus noise, shaped by the activity at each sample."""
+    freq, amp = np.array([_ACTIVITY_MOTION[ACTIVITIES[i]] for i in range(len(ACTIVITIES))]).T
+    f, a = freq[activity_idx], amp[activity_idx]
+    phases = np.array([0.0, 0.7, 1.9])
+    axes = a[:, None] * np.sin(2 * np.pi * f[:, None] * seconds[:, None] + phases)
+    return (axes + rng.normal(scale=0.3, size=axes.shape)).astype(np.float32)
+
+
+def synthetic_activity_index(n_samples: int, sampling_rate: int, segment_seconds: float = 30.0) -> np.ndarray:
+    """Activity index per sample, switching to the next activity every ``segment_seconds``."""
+    segment = np.arange(n_samples) // int(segment_seconds * sampling_rate)
+    return segment % len(ACTIVITIES)
+
+
+def synthetic_sensor_frame(duration_s: float, sampling_rate: int = 50, offset_s: float = 0.0,
+                           seed: int = 0) -> pd.DataFrame:
+    """
+    One sensor recording in the phone-export layout of ``schema.yaml``.
+
+    Args:
+        duration_s (float): Recording length in seconds.
+        sampling_rate (int): Samples per second.
+        offset_s (float): Shift of the sample clock, so two sensors aren't perfectly aligned.
+        seed (int): Random seed for the noise.
+
+    Returns:
+        pd.DataFrame: Columns ``time`` (ns), ``seconds_elapsed``, ``z``, ``y``, ``x``.
+    """
+    rng = np.random.default_rng(seed)
+    n = int(duration_s * sampling_rate)
+    seconds = np.arange(n) / sampling_rate + offset_s
+    axes = _signal(seconds, synthetic_activity_index(n, sampling_rate), rng)
+    return pd.DataFrame({
+        "time": (1.7e18 + seconds * 1e9).astype(np.int64),
+        "seconds_elapsed": seconds,
+        "z": axes[:, 0], "y": axes[:, 1], "x": axes[:, 2],
+    })
+
+
+def synthetic_sensor_csvs(duration_s: float, sampling_rate: int = 50, seed: int = 0) -> Tuple[bytes, bytes]:
+    """
+    Accelerometer and gyroscope CSV uploads for ``/predict/``, as raw bytes.
+    """
+    acc = synthetic_sensor_frame(duration_s, sampling_rate, seed=seed)
+    gyro = synthetic_sensor_frame(duration_s, sampling_rate, offset_s=0.5 / sampling_rate, seed=seed + 1)
+    return acc.to_csv(index=False).encode(), gyro.to_csv(index=False).encode()
+
+
+def synthetic_training_frame(duration_s: float, sampling_rate: int = 50, seed: int = 0) -> pd.DataFrame:
+    """
+    Labelled, merged frame in the layout DataTransformation writes to ``data.parquet``.
+    """
+    rng = np.random.default_rng(seed)
+    n = int(duration_s * sampling_rate)
+    seconds = np.arange(n) / sampling_rate
+    activity = synthetic_activity_index(n, sampling_rate)
+    values = np.hstack([_signal(seconds, activity, rng), _signal(seconds, activity, rng)])
+    df = pd.DataFrame(values, columns=SENSOR_COLUMNS)
+    df["seconds_elapsed"] = seconds
+    df["label"] = pd.Categorical(np.asarray(ACTIVITIES)[activity])
+    return df
@@ -1,60 +1,271 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException
-from pathlib import Path
-import os
-import joblib
+import time
+import json
+import asyncio
+from fastapi import FastAPI, UploadFile, File, HTTPException, WebSocket, WebSocketDisconnect, Request, Response
 
 from src.actionguardian.pipeline.prediction_pipeline import(
-    load_and_merge_sensor_data,
-    create_sliding_windows,
+    build_window_features,
     extract_features_from_windows,
-    summarize_activity_predictions
+    load_serving_artifacts,
+    predict_window_proba,
+    class_names,
+    build_activity_timeline,
+    span
 )
+from src.actionguardian.config.configuration import ConfigurationManager
+from src.actionguardian.utils.model_registry import registry
+from services.streaming import SensorStream, samples_from_message
+from services.batching import PredictionBatcher
+from services.executor import BoundedProcessPool, PoolSaturated
+from services.result_cache import ResultCache, upload_key
+from services.metrics import MetricsRegistry, CONTENT_TYPE, LATENCY_BUCKETS, WINDOW_BUCKETS, ROW_BUCKETS
 
 app = FastAPI(title="Activity-Summary API")
 
-UPLOAD_DIR = Path("uploads")
-UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+serving_config = ConfigurationManager().get_serving_config()
+hop_seconds = serving_config.step_size / serving_config.sampling_rate
 
-model = joblib.load("artifacts/model_trainer/activity_model.pkl")
+def serving_artifacts():
+    return load_serving_artifacts(serving_config)
+
+def predict_proba_batch(X):
+    model, scaler, _ = serving_artifacts()
+    return predict_window_proba(X, model, scaler)
+
+# Warm the registry at startup; the batcher fetches it per batch so a retrained model is hot-swapped.
+serving_artifacts()
+
+batcher = PredictionBatcher(
+    predict_fn=predict_proba_batch,
+    max_delay_ms=serving_config.batch_max_delay_ms,
+    max_rows=serving_config.batch_max_rows,
+    n_threads=serving_config.predict_threads
+)
+
+preprocess_pool = BoundedProcessPool(
+    max_workers=serving_config.preprocess_workers,
+    max_pending=serving_config.preprocess_max_pending
+)
+
+result_cache = ResultCache(
+    max_entries=serving_config.result_cache_entries,
+    max_mb=serving_config.result_cache_mb,
+    db_path=serving_config.result_cache_db,
+    db_max_entries=serving_config.result_cache_db_entries
+)
+# Settings besides the uploads that change a /predict/ answer
+cache_context = (f"{serving_config.window_size}/{serving_config.step_size}/{serving_config.sampling_rate}/"
+                 f"{serving_config.warmup_seconds}/{serving_config.smoothing}/{serving_config.smoothing_window}")
+
+def model_version() -> str:
+    """Version of every artifact that shapes a prediction; changes whenever one is replaced."""
+    paths = [serving_config.model_path, serving_config.compiled_model_path, serving_config.compact_model_path,
+             serving_config.onnx_model_path, serving_config.scaler_path, serving_config.label_encoder_path]
+    return serving_config.backend + ":" + ",".join(registry.version(p) if p.exists() else "-" for p in paths)
+
+@app.on_event("shutdown")
+def shutdown_pools():
+    preprocess_pool.shutdown()
+    result_cache.close()
+
+# ---------------------- Prometheus metrics ----------------------
+
+metrics = MetricsRegistry()
+request_duration = metrics.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route.", LATENCY_BUCKETS, ("method", "route", "status")
+)
+stage_duration = metrics.histogram(
+    "predict_stage_duration_seconds",
+    "Time spent in each /predict/ step (upload_read, cache_lookup, pool_wait, csv_parse, merge, windowing, features, predict, timeline).",
+    LATENCY_BUCKETS, ("stage",)
+)
+rows_per_request = metrics.histogram("predict_rows_per_request", "Merged sensor rows per /predict/ request.", ROW_BUCKETS)
+windows_per_request = metrics.histogram("predict_windows_per_request", "Windows classified per /predict/ request.", WINDOW_BUCKETS)
+requests_in_progress = 0
+metrics.gauge("http_requests_in_progress", "HTTP requests currently being handled.", lambda: requests_in_progress)
+metrics.gauge("predict_batch_queue_depth", "Feature matrices waiting for the prediction batcher.", lambda: batcher.queue_depth)
+metrics.gauge("preprocess_pool_in_flight", "Uploads running or queued in the preprocessing pool.", lambda: preprocess_pool.in_flight)
+metrics.gauge("preprocess_pool_capacity", "Uploads the preprocessing pool admits before answering 503.", lambda: preprocess_pool.capacity)
+metrics.counter_fn("preprocess_pool_rejected_total", "Uploads rejected with 503 because the pool was saturated.", lambda: preprocess_pool.rejected)
+metrics.counter_fn("preprocess_pool_restarts_total", "Preprocessing pools replaced after a worker died.", lambda: preprocess_pool.restarts)
+metrics.counter_fn("result_cache_hits_total", "/predict/ responses served from the result cache.", lambda: result_cache.hits)
+metrics.counter_fn("result_cache_disk_hits_total", "Result cache hits served from the SQLite tier.", lambda: result_cache.disk_hits)
+metrics.counter_fn("result_cache_misses_total", "/predict/ requests that had to be computed.", lambda: result_cache.misses)
+metrics.counter_fn("result_cache_evictions_total", "Entries evicted from the in-memory result cache.", lambda: result_cache.evictions)
+metrics.counter_fn("result_cache_invalidations_total", "Result cache flushes caused by a model change.", lambda: result_cache.invalidations)
+metrics.counter_fn("result_cache_stale_puts_total", "Responses not cached because the model changed while computing them.", lambda: result_cache.stale_puts)
+metrics.gauge("result_cache_entries", "Responses held in the in-memory result cache.", lambda: len(result_cache))
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    global requests_in_progress
+    requests_in_progress += 1
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        requests_in_progress -= 1
+        # Route templates keep label cardinality bounded; unknown paths share one label
+        route = request.scope.get("route")
+        request_duration.observe(time.perf_counter() - start, request.method,
+                                 getattr(route, "path", "unmatched"), status)
+
+@app.get("/metrics", summary="Prometheus metrics")
+async def prometheus_metrics():
+    return Response(content=metrics.render(), media_type=CONTENT_TYPE)
 
 @app.post("/predict/", summary="Upload 2 CSV to get Activity Summary")
 async def predict_activity(
+    request: Request,
     acc_file: UploadFile = File(..., description="Accelerometer CSV"),
     gyro_file: UploadFile = File(..., description="Gyroscope CSV")
 ):
+    """
+    Identical uploads are answered from the result cache (``X-Cache: HIT``)
+    until the model artifacts change. Send ``Cache-Control: no-cache`` (or
+    ``no-store``) to bypass the cache and always compute the prediction.
+    """
 
-    acc_path = UPLOAD_DIR / acc_file.filename
-    gyro_path = UPLOAD_DIR / gyro_file.filename
+    timings = {}
     try:
-        with open(acc_path, "wb") as f:
-            f.write(await acc_file.read())
-        with open(gyro_path, "wb") as f:
-            f.write(await gyro_file.read())
+        with span(timings, "upload_read"):
+            acc_bytes = await acc_file.read()
+            gyro_bytes = await gyro_file.read()
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Could not save uploaded files: {e}")
+        raise HTTPException(status_code=500, detail=f"Could not read uploaded files: {e}")
 
-    
-    df = load_and_merge_sensor_data(str(acc_path), str(gyro_path))
-    if df.empty:
-        raise HTTPException(status_code=400, detail="Sensor data merge returned no rows. Check your timestamps/ranges.")
+    loop = asyncio.get_running_loop()
+    cache_control = request.headers.get("cache-control", "").lower()
+    use_cache = "no-cache" not in cache_control and "no-store" not in cache_control
+    cached = None
+    if use_cache:
+        with span(timings, "cache_lookup"):
+            # blake2b releases the GIL, so hashing large uploads off-loop doesn't stall other requests
+            key = await loop.run_in_executor(None, lambda: upload_key(acc_bytes, gyro_bytes, context=cache_context))
+            version = model_version()
+            # The SQLite tier reads (and may write) the disk, so it stays off the event loop too
+            cached = await loop.run_in_executor(None, result_cache.get, key, version)
+    if cached is not None:
+        for stage, seconds in timings.items():
+            stage_duration.observe(seconds, stage)
+        return Response(content=cached, media_type="application/json", headers={"X-Cache": "HIT"})
 
-    X_windows, timestamps = create_sliding_windows(df)
-    if X_windows.size == 0:
-        raise HTTPException(status_code=400, detail="Not enough rows to form any window. Try more data or smaller window_size.")
+    try:
+        with span(timings, "preprocess"):
+            features, timestamps, stats = await preprocess_pool.run(
+                build_window_features, acc_bytes, gyro_bytes,
+                serving_config.window_size, serving_config.step_size, serving_config.sampling_rate,
+                serving_config.warmup_seconds
+            )
+    except PoolSaturated:
+        raise HTTPException(
+            status_code=503,
+            detail="Server is busy processing other uploads. Please retry shortly.",
+            headers={"Retry-After": str(serving_config.retry_after_seconds)}
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    features = extract_features_from_windows(X_windows)
-    if features.ndim != 2 or features.shape[0] == 0:
-        raise HTTPException(status_code=400, detail="Feature extraction yielded no valid features.")
+    # Worker-side steps; whatever remains of the pool round trip is queueing and IPC
+    timings.update(stats["spans"])
+    timings["pool_wait"] = max(timings.pop("preprocess") - sum(stats["spans"].values()), 0.0)
 
     try:
-        preds = model.predict(features)
+        with span(timings, "predict"):
+            proba = await batcher.predict(features)
+        with span(timings, "timeline"):
+            model, _, encoder = serving_artifacts()
+            # Window starts are row offsets into the merged recording (after warm-up trimming)
+            result = build_activity_timeline(
+                proba,
+                start_seconds=timestamps / serving_config.sampling_rate,
+                classes=class_names(model, encoder),
+                hop_seconds=hop_seconds,
+                smoothing=serving_config.smoothing,
+                smoothing_window=serving_config.smoothing_window
+            )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Model prediction failed: {e}")
 
-    summary = summarize_activity_predictions(preds, timestamps)
-    plain_summary = {str(int(k)): int(v) for k, v in summary.items()}
-    print(f"Prediction Summary: {plain_summary}")
-    return {"activity_summary_seconds": plain_summary}
+    for stage, seconds in timings.items():
+        stage_duration.observe(seconds, stage)
+    rows_per_request.observe(stats["rows"])
+    windows_per_request.observe(stats["windows"])
+
+    body = json.dumps({"window_seconds": serving_config.window_size / serving_config.sampling_rate,
+                       "hop_seconds": hop_seconds, **result}).encode()
+    if not use_cache:
+        return Response(content=body, media_type="application/json", headers={"X-Cache": "BYPASS"})
+    await loop.run_in_executor(None, result_cache.put, key, version, body)
+    return Response(content=body, media_type="application/json", headers={"X-Cache": "MISS"})
+
+
+@app.websocket("/stream/")
+async def stream_activity(websocket: WebSocket):
+    """
+    Live inference over a WebSocket.
+
+    The client sends columnar sample batches (see ``services.streaming.samples_from_message``)
+    for either sensor in any interleaving; the server replies with a prediction
+    for every window completed by the batch, one message per batch that completes windows.
+    A frame that isn't valid JSON or a valid sample batch gets an ``{"error": ...}``
+    reply and the session carries on.
+    """
+    await websocket.accept()
+    stream = SensorStream(
+        window_size=serving_config.window_size,
+        step_size=serving_config.step_size,
+        sampling_rate=serving_config.sampling_rate,
+        warmup_seconds=serving_config.warmup_seconds,
+        max_lead_seconds=serving_config.stream_max_lead_seconds
+    )
+    loop = asyncio.get_running_loop()
+    try:
+        while True:
+            text = await websocket.receive_text()
+            try:
+                # JSONDecodeError is a ValueError, so a garbled frame is answered like a malformed batch
+                sensor, samples = samples_from_message(json.loads(text))
+            except ValueError as e:
+                await websocket.send_json({"error": str(e)})
+                continue
+
+            X_windows, timestamps = stream.push(sensor, samples)
+            if len(X_windows) == 0:
+                continue
+
+            # Featurizing a large push is CPU-bound; keep the event loop free for other sessions and requests
+            features = await loop.run_in_executor(
+                None, lambda: extract_features_from_windows(X_windows, sampling_rate=serving_config.sampling_rate)
+            )
+            proba = await batcher.predict(features)
+            model, _, encoder = serving_artifacts()
+            classes = class_names(model, encoder)
+            await websocket.send_json({
+                "predictions": [
+                    {"timestamp": float(t), "activity": classes[k], "confidence": round(float(p[k]), 4)}
+                    for t, p, k in zip(timestamps, proba, proba.argmax(axis=1))
+                ]
+            })
+    except WebSocketDisconnect:
+        pass
+
+
+@app.get("/stats/", summary="Prediction batching statistics")
+async def prediction_stats():
+    return {
+        "batching": batcher.stats(),
+        "preprocessing": {
+            "in_flight": preprocess_pool.in_flight,
+            "capacity": preprocess_pool.capacity,
+            "rejected": preprocess_pool.rejected,
+            "restarts": preprocess_pool.restarts
+        },
+        "result_cache": result_cache.stats()
+    }
 
 
 if __name__ == "__main__":
@@ -1,43 +1,178 @@
 import sys
+import argparse
+from pathlib import Path
 
 from src.actionguardian import logger
+from src.actionguardian.config.configuration import ConfigurationManager
+from src.actionguardian.utils.stage_cache import StageCache
+from src.actionguardian.utils.run_metrics import RunMetrics, measure_stage, PROFILERS
 from src.actionguardian.pipeline.data_ingestion_pipeline import DataIngestionTrainingPipeline
 from src.actionguardian.pipeline.data_validation_pipeline import DataValidationTrainingPipeline
 from src.actionguardian.pipeline.data_transformation_pipeline import DataTransformationTrainingPipeline
 from src.actionguardian.pipeline.data_preprocessing_pipeline import DataPreprocessingTrainingPipeline
+from src.actionguardian.pipeline.model_tuning_pipeline import ModelTuningTrainingPipeline
 from src.actionguardian.pipeline.model_training_pipeline import ModelTrainingTrainingPipeline
 from src.actionguardian.pipeline.model_evaluation_pipeline import ModelEvaluationTrainingPipeline
 
+PACKAGE_DIR = Path("src/actionguardian")
+# Shared code every stage runs through (config loading, config entities, YAML/JSON helpers, logging)
+COMMON_SOURCES = ["__init__.py", "constants/__init__.py", "config/configuration.py",
+                  "entity/config_entity.py", "utils/common.py"]
 
-def run_stage(name: str, pipeline_cls: type, method: str) -> None:
+
+def run_stage(name: str, pipeline_cls: type, method: str, outputs: list = (),
+              profiler: str = None, profile_path: Path = None) -> dict:
     """
     Execute a pipeline stage with standardized logging and error handling.
+
+    Returns:
+        dict: Wall/CPU time, peak memory and output sizes (see ``measure_stage``).
     """
     logger.info(f"Starting {name}...")
-    try:
+    with measure_stage(outputs, profiler, profile_path) as metrics:
         pipeline = pipeline_cls()
         getattr(pipeline, method)()
-        logger.info(f"Finished {name} successfully.")
-    except Exception:
-        logger.exception(f"Failed {name}.")
-        sys.exit(1)
+    logger.info(f"Finished {name} successfully in {metrics['wall_s']:.2f}s "
+                f"(CPU {metrics['cpu_s'] + metrics['children_cpu_s']:.2f}s, peak RSS {metrics['peak_rss_mb']:.0f} MB).")
+    return metrics
+
+
+def stage_dependencies(manager: ConfigurationManager) -> dict:
+    """
+    Declare what each stage reads and writes, keyed by stage id.
+
+    ``config`` holds the settings that change a stage's result, ``inputs`` the
+    upstream artifacts, ``outputs`` what the stage must leave behind, and
+    ``sources`` the code implementing it (relative to ``src/actionguardian``;
+    ``COMMON_SOURCES`` are added to every stage).
+    """
+    cfg, params = manager.config, manager.params
+    trainer_dir = Path(cfg.model_trainer.root_dir)
+    # In stream mode the raw CSVs are read from the archive and never extracted
+    streaming = cfg.data_ingestion.mode == "stream"
+    raw_data = cfg.data_ingestion.local_data_file if streaming else cfg.data_validation.unzip_data_dir
+    return {
+        "ingestion": {
+            "config": {"data_ingestion": cfg.data_ingestion},
+            "inputs": [],
+            "outputs": [cfg.data_ingestion.local_data_file] + ([] if streaming else [cfg.data_ingestion.unzip_dir]),
+            "sources": ["components/data_ingestion.py", "pipeline/data_ingestion_pipeline.py", "utils/download.py"],
+        },
+        "validation": {
+            "config": {"data_validation": cfg.data_validation, "schema": manager.schema},
+            "inputs": [raw_data],
+            "outputs": [cfg.data_validation.STATUS_FILE],
+            "sources": ["components/data_validation.py", "pipeline/data_validation_pipeline.py", "utils/sensor_source.py"],
+        },
+        "transformation": {
+            "config": {"data_transformation": cfg.data_transformation},
+            "inputs": [raw_data if streaming else cfg.data_transformation.base_data_dir, cfg.data_validation.STATUS_FILE],
+            "outputs": [cfg.data_preprocessing.data_path],
+            "sources": ["components/data_transformation.py", "pipeline/data_transformation_pipeline.py", "utils/sensor_source.py",
+                        "utils/alignment.py"],
+        },
+        "preprocessing": {
+            "config": {"data_preprocessing": cfg.data_preprocessing},
+            "inputs": [cfg.data_preprocessing.data_path],
+            "outputs": [cfg.model_trainer.features_path, cfg.model_trainer.labels_path],
+            "sources": ["components/data_preprocessing.py", "pipeline/data_preprocessing_pipeline.py",
+                        "utils/features.py", "utils/windowing.py", "utils/feature_store.py"],
+        },
+        "tuning": {
+            "config": {"model_tuning": cfg.model_tuning, "test_size": cfg.model_trainer.test_size,
+                       "random_state": params.get(cfg.model_tuning.params_section, {}).get("random_state")},
+            "inputs": [cfg.model_trainer.features_path, cfg.model_trainer.labels_path],
+            "outputs": [cfg.model_tuning.results_file],
+            "sources": ["components/model_tuner.py", "pipeline/model_tuning_pipeline.py"],
+        },
+        "training": {
+            "config": {"model_trainer": cfg.model_trainer, "model_compaction": cfg.model_compaction,
+                       "params": params.get("RandomForestClassifier", {})},
+            "inputs": [cfg.model_trainer.features_path, cfg.model_trainer.labels_path],
+            # The ONNX graph is only kept if it passes the parity check, so metrics.json (which records it) stands in
+            "outputs": [trainer_dir / cfg.model_trainer.model_filename,
+                        trainer_dir / cfg.model_trainer.compiled_model_filename,
+                        trainer_dir / cfg.model_trainer.scaler_filename,
+                        trainer_dir / cfg.model_trainer.label_encoder_filename,
+                        trainer_dir / cfg.model_trainer.metrics_filename,
+                        trainer_dir / "X_test.npy", trainer_dir / "y_test.npy"]
+                       + ([trainer_dir / cfg.model_compaction.compact_model_filename] if cfg.model_compaction.enabled else []),
+            # The stage also compacts the forest; features/windowing define the columns it is trained on
+            "sources": ["components/model_trainer.py", "pipeline/model_training_pipeline.py", "utils/compiled_forest.py",
+                        "components/model_compactor.py", "utils/onnx_model.py", "utils/features.py", "utils/windowing.py"],
+        },
+        "evaluation": {
+            "config": {"model_evaluation": cfg.model_evaluation, "params": params.get(cfg.model_evaluation.params_section, {})},
+            "inputs": [cfg.model_evaluation.test_features_path, cfg.model_evaluation.test_labels_path,
+                       cfg.model_evaluation.model_path],
+            "outputs": [cfg.model_evaluation.metric_file_name],
+            "sources": ["components/model_evaluation.py", "pipeline/model_evaluation_pipeline.py",
+                        "utils/model_registry.py", "utils/run_metrics.py"],
+        },
+    }
+
+
+def parse_args(stage_ids: list) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run the ActionGuardian training pipeline.")
+    parser.add_argument(
+        "--force", action="append", default=[], choices=stage_ids + ["all"], metavar="STAGE",
+        help=f"Re-run a stage even if its inputs are unchanged (repeatable). One of: {', '.join(stage_ids + ['all'])}"
+    )
+    parser.add_argument(
+        "--profile", nargs="?", const="cprofile", choices=PROFILERS, default=None,
+        help="Profile every stage that runs and write the reports to <artifacts_root>/profiles/ "
+             "(default profiler: cprofile; pyinstrument must be installed separately)"
+    )
+    return parser.parse_args()
 
 
 def main() -> None:
-    
+
     stages = [
-        ("Data Ingestion", DataIngestionTrainingPipeline, "initiate_data_ingestion"),
-        ("Data Validation", DataValidationTrainingPipeline, "initiate_data_validation"),
-        ("Data Transformation", DataTransformationTrainingPipeline, "initiate_data_transformation"),
-        ("Data Preprocessing", DataPreprocessingTrainingPipeline, "initiate_data_preprocessing"),
-        ("Model Training", ModelTrainingTrainingPipeline, "initiate_model_training"),
-        ("Model Evaluation", ModelEvaluationTrainingPipeline, "initiate_model_evaluation"),
+        ("ingestion", "Data Ingestion", DataIngestionTrainingPipeline, "initiate_data_ingestion"),
+        ("validation", "Data Validation", DataValidationTrainingPipeline, "initiate_data_validation"),
+        ("transformation", "Data Transformation", DataTransformationTrainingPipeline, "initiate_data_transformation"),
+        ("preprocessing", "Data Preprocessing", DataPreprocessingTrainingPipeline, "initiate_data_preprocessing"),
+        ("tuning", "Model Tuning", ModelTuningTrainingPipeline, "initiate_model_tuning"),
+        ("training", "Model Training", ModelTrainingTrainingPipeline, "initiate_model_training"),
+        ("evaluation", "Model Evaluation", ModelEvaluationTrainingPipeline, "initiate_model_evaluation"),
     ]
+    args = parse_args([stage_id for stage_id, *_ in stages])
+
+    manager = ConfigurationManager()
+    dependencies = stage_dependencies(manager)
+    cache = StageCache(Path(manager.config.artifacts_root) / "stage_cache.json")
+    run_metrics = RunMetrics(Path(manager.config.run_metrics_file))
+    profile_dir = Path(manager.config.artifacts_root) / "profiles"
 
-    for stage_name, cls, method in stages:
-        run_stage(stage_name, cls, method)
+    for stage_id, stage_name, cls, method in stages:
+        deps = dependencies[stage_id]
+        outputs = [Path(p) for p in deps["outputs"]]
+        fingerprint = cache.fingerprint(
+            config=deps["config"],
+            inputs=[Path(p) for p in deps["inputs"]],
+            sources=[PACKAGE_DIR / p for p in COMMON_SOURCES + deps["sources"]]
+        )
+        forced = stage_id in args.force or "all" in args.force
+        if not forced and cache.is_fresh(stage_id, fingerprint, outputs):
+            logger.info(f"Skipping {stage_name}: inputs unchanged, reusing outputs from {manager.config.artifacts_root}/")
+            run_metrics.record(stage_id, "skipped")
+            continue
+
+        try:
+            metrics = run_stage(stage_name, cls, method, outputs, args.profile, profile_dir / stage_id)
+        except Exception:
+            logger.exception(f"Failed {stage_name}.")
+            run_metrics.record(stage_id, "failed")
+            sys.exit(1)
+        run_metrics.record(stage_id, "ran", metrics)
+        if all(p.exists() for p in outputs):
+            cache.record(stage_id, fingerprint)
+        # Tuning rewrites params.yaml; later stages must be fingerprinted with the new values
+        dependencies = stage_dependencies(ConfigurationManager())
+
+    run_metrics.log_summary()
 
 
 if __name__ == "__main__":
     main()
-
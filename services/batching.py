@@ -0,0 +1,133 @@
+# services/batching.py
+import asyncio
+import time
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Tuple
+
+
+class PredictionBatcher:
+    """
+    Coalesces feature matrices from concurrent requests into one ``predict`` call.
+
+    The first queued request opens a batch; the batch is closed after
+    ``max_delay_ms`` or as soon as ``max_rows`` feature rows are collected,
+    whichever comes first. The stacked matrix is predicted once on a worker
+    thread (keeping the event loop free) and the result rows are scattered
+    back to the waiting requests in submission order.
+
+    Up to ``n_threads`` batches are predicted at the same time. A new batch
+    is only opened once a thread is free, so while all of them are busy
+    the queued requests join one larger batch instead of waiting in line.
+    """
+
+    def __init__(self, predict_fn: Callable[[np.ndarray], np.ndarray],
+                 max_delay_ms: float = 3.0, max_rows: int = 2048, n_threads: int = 1):
+        self.predict_fn = predict_fn
+        self.max_delay = max_delay_ms / 1000.0
+        self.max_rows = max_rows
+        self.n_threads = n_threads
+        self._executor = ThreadPoolExecutor(max_workers=n_threads, thread_name_prefix="predict")
+        self._queue = None
+        self._worker = None
+        self._slots = None
+        self._dispatched = set()   # strong references to running batch tasks
+
+        self.total_requests = 0
+        self.total_rows = 0
+        self.total_batches = 0
+        self.max_batch_rows = 0
+        self.last_batch_rows = 0
+        self.last_batch_requests = 0
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def stats(self) -> dict:
+        batches = max(self.total_batches, 1)
+        return {
+            "queue_depth": self.queue_depth,
+            "total_requests": self.total_requests,
+            "total_batches": self.total_batches,
+            "total_rows": self.total_rows,
+            "mean_batch_rows": self.total_rows / batches,
+            "mean_batch_requests": self.total_requests / batches,
+            "max_batch_rows": self.max_batch_rows,
+            "last_batch_rows": self.last_batch_rows,
+            "last_batch_requests": self.last_batch_requests,
+        }
+
+    def _ensure_started(self):
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._slots = asyncio.Semaphore(self.n_threads)
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def predict(self, features: np.ndarray) -> np.ndarray:
+        """
+        Queue ``features`` for the next batch and wait for its predictions.
+        """
+        self._ensure_started()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((features, future))
+        return await future
+
+    async def _collect(self) -> List[Tuple[np.ndarray, asyncio.Future]]:
+        batch = [await self._queue.get()]
+        rows = len(batch[0][0])
+        deadline = time.monotonic() + self.max_delay
+        while rows < self.max_rows:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            batch.append(item)
+            rows += len(item[0])
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._slots.acquire()
+            try:
+                batch = await self._collect()
+            except BaseException:
+                self._slots.release()
+                raise
+            task = loop.create_task(self._dispatch(batch))
+            self._dispatched.add(task)
+            task.add_done_callback(self._dispatched.discard)
+
+    async def _dispatch(self, batch: List[Tuple[np.ndarray, asyncio.Future]]):
+        try:
+            await self._predict_batch(batch)
+        finally:
+            self._slots.release()
+
+    async def _predict_batch(self, batch: List[Tuple[np.ndarray, asyncio.Future]]):
+        loop = asyncio.get_running_loop()
+        sizes = [len(features) for features, _ in batch]
+        try:
+            stacked = np.concatenate([features for features, _ in batch])
+            preds = await loop.run_in_executor(self._executor, self.predict_fn, stacked)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        offsets = np.cumsum([0] + sizes)
+        for (_, future), start, stop in zip(batch, offsets[:-1], offsets[1:]):
+            if not future.done():
+                future.set_result(preds[start:stop])
+
+        self.total_requests += len(batch)
+        self.total_rows += int(offsets[-1])
+        self.total_batches += 1
+        self.last_batch_rows = int(offsets[-1])
+        self.last_batch_requests = len(batch)
+        self.max_batch_rows = max(self.max_batch_rows, self.last_batch_rows)
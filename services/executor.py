@@ -0,0 +1,86 @@
+# services/executor.py
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable
+
+
+class PoolSaturated(Exception):
+    """Raised when a job is submitted while the pool already holds its maximum backlog."""
+
+
+def _default_start_method() -> str:
+    # The server process already runs threads (batcher, executors); forking it could copy a held lock
+    return "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+class BoundedProcessPool:
+    """
+    Process pool for CPU-bound request work with admission control.
+
+    At most ``max_workers`` jobs run at once and at most ``max_pending`` more
+    wait in line; anything beyond that is rejected immediately with
+    ``PoolSaturated`` instead of queueing without bound, so the caller can
+    shed load (HTTP 503) while the event loop stays responsive.
+
+    Workers are started with ``forkserver`` (``spawn`` where unavailable),
+    never forked from the threaded server. If a worker dies (OOM kill,
+    crash in a native extension), the broken executor is replaced and the
+    job is retried once, so one crash doesn't fail every later request.
+    """
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 8, start_method: str = None):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.in_flight = 0
+        self.rejected = 0
+        self.restarts = 0
+        self._mp_context = multiprocessing.get_context(start_method or _default_start_method())
+        self._executor = None
+
+    @property
+    def capacity(self) -> int:
+        return self.max_workers + self.max_pending
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=self._mp_context)
+        return self._executor
+
+    def _replace(self, broken: ProcessPoolExecutor):
+        # Every job on the broken executor fails at once; only the first one to get here replaces it
+        if self._executor is broken:
+            broken.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            self.restarts += 1
+
+    async def run(self, fn: Callable, *args) -> Any:
+        """
+        Run ``fn(*args)`` in a worker process and await its result.
+
+        Raises:
+            PoolSaturated: If ``capacity`` jobs are already admitted.
+            BrokenProcessPool: If the job's worker died on the retry too.
+        """
+        if self.in_flight >= self.capacity:
+            self.rejected += 1
+            raise PoolSaturated(f"{self.in_flight} jobs in flight (capacity {self.capacity})")
+
+        self.in_flight += 1
+        try:
+            for attempt in range(2):
+                executor = self._get_executor()
+                try:
+                    return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+                except BrokenProcessPool:
+                    self._replace(executor)
+                    if attempt:
+                        raise
+        finally:
+            self.in_flight -= 1
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -1,8 +1,15 @@
 # services/model_loader.py
-import joblib
+from functools import partial
+from pathlib import Path
 
-def load_model(model_path: str):
+from src.actionguardian.utils.model_registry import registry
+from src.actionguardian.utils.onnx_model import OnnxClassifier
+
+def load_model(model_path: str, intra_op_threads: int = 1):
+    """Load a joblib model, or an ONNX graph (``.onnx``) as an onnxruntime-backed classifier."""
     try:
-        return joblib.load(model_path)
+        if Path(model_path).suffix == ".onnx":
+            return registry.get(model_path, loader=partial(OnnxClassifier, intra_op_threads=intra_op_threads))
+        return registry.get(model_path)
     except Exception as e:
         raise RuntimeError(f"Error loading model: {e}")
@@ -0,0 +1,155 @@
+# services/result_cache.py
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+
+def upload_key(*payloads: bytes, context: str = "") -> str:
+    """
+    Content hash identifying a set of uploads under a given serving context.
+
+    ``context`` should hold everything else that changes the answer
+    (window/step size, smoothing, ...) so those can't collide.
+    """
+    h = hashlib.blake2b(digest_size=20)
+    for payload in payloads:
+        h.update(len(payload).to_bytes(8, "little"))
+        h.update(payload)
+    h.update(context.encode())
+    return h.hexdigest()
+
+
+class ResultCache:
+    """
+    Two-tier cache of serialized ``/predict/`` responses keyed by upload hash.
+
+    The memory tier is an LRU bounded by entry count and total bytes. The
+    optional SQLite tier (``db_path``) survives restarts and is shared by
+    every server process on the host; it keeps the ``db_max_entries`` most
+    recently used rows. Every entry is stored with the model version it was
+    computed with: as soon as a lookup arrives with a different version,
+    both tiers drop the stale entries, so a retrained model never serves
+    old results. A ``put`` for any other version than the one last looked
+    up comes from a request that started before the swap and is dropped.
+
+    Lookups and stores may touch SQLite, so async callers should run them
+    in an executor; a lock serializes them.
+    """
+
+    def __init__(self, max_entries: int = 256, max_mb: float = 64.0,
+                 db_path: Optional[Path] = None, db_max_entries: int = 10000):
+        self.max_entries = max_entries
+        self.max_bytes = int(max_mb * (1 << 20))
+        self.db_max_entries = db_max_entries
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._bytes = 0
+        self._version = None
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.stale_puts = 0
+
+        self._db = None
+        if db_path:
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(db_path), check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, version TEXT NOT NULL, value BLOB NOT NULL, last_access REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS results_last_access ON results (last_access)")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _check_version(self, version: str):
+        if version == self._version:
+            return
+        if self._version is not None:
+            self.invalidations += 1
+        self._entries.clear()
+        self._bytes = 0
+        self._version = version
+        if self._db is not None:
+            self._db.execute("DELETE FROM results WHERE version != ?", (version,))
+
+    def _store(self, key: str, value: bytes):
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= len(old)
+        if len(value) > self.max_bytes:
+            return
+        self._entries[key] = value
+        self._bytes += len(value)
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+            self.evictions += 1
+
+    def get(self, key: str, version: str) -> Optional[bytes]:
+        """
+        Cached response for ``key`` computed with model ``version``, or None.
+        """
+        with self._lock:
+            self._check_version(version)
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+
+            if self._db is not None:
+                row = self._db.execute("SELECT value FROM results WHERE key = ? AND version = ?",
+                                       (key, version)).fetchone()
+                if row is not None:
+                    self._db.execute("UPDATE results SET last_access = ? WHERE key = ?", (time.time(), key))
+                    self._store(key, row[0])
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return row[0]
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, version: str, value: bytes):
+        with self._lock:
+            if version != self._version:
+                # Computed with a model that has since been replaced: don't let it flush the new entries
+                self.stale_puts += 1
+                return
+            self._store(key, value)
+            if self._db is not None:
+                self._db.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+                                 (key, version, sqlite3.Binary(value), time.time()))
+                self._db.execute(
+                    "DELETE FROM results WHERE key IN (SELECT key FROM results ORDER BY last_access DESC "
+                    "LIMIT -1 OFFSET ?)", (self.db_max_entries,)
+                )
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "stale_puts": self.stale_puts,
+        }
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
@@ -0,0 +1,153 @@
+# services/streaming.py
+import numpy as np
+from typing import Tuple
+
+from src.actionguardian.utils.windowing import sliding_windows
+from src.actionguardian.utils.alignment import grid_count, interpolate_samples
+
+SENSORS = ("accelerometer", "gyroscope")
+SAMPLE_FIELDS = ("seconds_elapsed", "z", "y", "x")
+
+
+def samples_from_message(message: dict) -> Tuple[str, np.ndarray]:
+    """
+    Parse one streaming message into ``(sensor, samples)``.
+
+    Messages are columnar JSON objects::
+
+        {"sensor": "accelerometer", "seconds_elapsed": [...], "z": [...], "y": [...], "x": [...]}
+
+    Raises:
+        ValueError: If the sensor name or sample columns are invalid.
+
+    Returns:
+        Tuple[str, np.ndarray]: Sensor name and an ``(n, 4)`` array of
+        ``seconds_elapsed, z, y, x`` rows.
+    """
+    if not isinstance(message, dict):
+        raise ValueError(f"Expected a JSON object, got {type(message).__name__}")
+    sensor = str(message.get("sensor", "")).lower()
+    if sensor not in SENSORS:
+        raise ValueError(f"Unknown sensor '{sensor}', expected one of {SENSORS}")
+    try:
+        samples = np.column_stack([np.asarray(message[f], dtype=np.float64) for f in SAMPLE_FIELDS])
+    except KeyError as e:
+        raise ValueError(f"Missing sample field {e}")
+    except TypeError as e:
+        # e.g. an object inside a column; the session must survive a malformed message
+        raise ValueError(f"Sample columns must hold numbers only: {e}")
+    if samples.ndim != 2 or samples.shape[1] != len(SAMPLE_FIELDS):
+        raise ValueError(f"Sample fields {SAMPLE_FIELDS} must be flat arrays of equal length")
+    if not np.isfinite(samples).all():
+        # numpy turns a null into NaN, which would break the time ordering of the buffers
+        raise ValueError("Sample columns must not contain null, NaN or infinite values")
+    return sensor, samples
+
+
+class SensorStream:
+    """
+    Incremental counterpart of ``load_and_merge_sensor_data`` + ``create_sliding_windows``
+    for one live session.
+
+    Both sensors are interpolated onto the same ``sampling_rate`` grid as
+    ``align_sensors``, but a grid time is only emitted once both sensors
+    have a sample at or after it, so a row can never change later and the
+    rows equal those of the batch path. All buffers are trimmed after every
+    push, so the work per update depends on the message size, not on how
+    long the session has been running.
+
+    A sensor can only run ahead of the other by ``max_lead_seconds``: while
+    one sensor is silent, the other's oldest samples are dropped (counted
+    in ``samples_dropped``) so its buffer stays bounded.
+    """
+
+    def __init__(self, window_size: int, step_size: int, sampling_rate: int = 50, warmup_seconds: float = 5.0,
+                 max_lead_seconds: float = 30.0):
+        self.window_size = window_size
+        self.step_size = step_size
+        self.sampling_rate = sampling_rate
+        self.warmup_seconds = warmup_seconds
+        self.max_lead_seconds = max_lead_seconds
+
+        self._acc = np.empty((0, 4))
+        self._gyro = np.empty((0, 4))
+        self._rows = np.empty((0, 6), dtype=np.float32)   # aligned rows not yet consumed by a window
+        self._row_ts = np.empty(0)
+        self._origin = None                 # first grid time: common start + warm-up
+        self._n_aligned = 0                 # grid times emitted so far
+        self.windows_emitted = 0
+        self.samples_dropped = 0
+
+    def _append(self, buf: np.ndarray, samples: np.ndarray) -> np.ndarray:
+        samples = samples[np.argsort(samples[:, 0], kind="stable")]
+        if len(buf):
+            samples = samples[samples[:, 0] >= buf[-1, 0]]   # drop late, out-of-order rows
+        return np.concatenate([buf, samples]) if len(buf) else samples
+
+    def _bound_lead(self, buf: np.ndarray) -> np.ndarray:
+        # _merge_ready already trimmed up to the other sensor, so anything older than the lead is unmatched
+        cutoff = buf[-1, 0] - self.max_lead_seconds
+        if buf[0, 0] >= cutoff:
+            return buf
+        # Keep the last sample before the cutoff so the first grid time after it still has a bracket
+        first = max(np.searchsorted(buf[:, 0], cutoff, side="left") - 1, 0)
+        self.samples_dropped += first
+        return buf[first:]
+
+    def _merge_ready(self):
+        if not len(self._acc) or not len(self._gyro):
+            return
+        if self._origin is None:
+            self._origin = max(self._acc[0, 0], self._gyro[0, 0]) + self.warmup_seconds
+
+        # Grid times covered by both sensors so far; the grid is indexed from the origin like time_grid
+        ready_until = min(self._acc[-1, 0], self._gyro[-1, 0])
+        n_ready = grid_count(self._origin, ready_until, self.sampling_rate)
+        if n_ready <= self._n_aligned:
+            return
+        grid = self._origin + np.arange(self._n_aligned, n_ready) / self.sampling_rate
+        self._n_aligned = n_ready
+
+        # Same column order as load_and_merge_sensor_data: acc z,y,x then gyro z,y,x
+        merged = np.hstack([interpolate_samples(self._acc[:, 0], self._acc[:, 1:], grid),
+                            interpolate_samples(self._gyro[:, 0], self._gyro[:, 1:], grid)])
+        self._rows = np.concatenate([self._rows, merged])
+        self._row_ts = np.concatenate([self._row_ts, grid])
+
+        # Later grid times are > grid[-1]: only the last sample at or before it can still bracket one
+        self._acc = self._acc[max(np.searchsorted(self._acc[:, 0], grid[-1], side="right") - 1, 0):]
+        self._gyro = self._gyro[max(np.searchsorted(self._gyro[:, 0], grid[-1], side="right") - 1, 0):]
+
+    def push(self, sensor: str, samples: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Add samples from one sensor and return every window completed by them.
+
+        Args:
+            sensor (str): ``"accelerometer"`` or ``"gyroscope"``.
+            samples (np.ndarray): ``(n, 4)`` rows of ``seconds_elapsed, z, y, x``.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Windows of shape
+            ``(k, window_size, 6)`` and the start timestamp of each (``k`` may be 0).
+        """
+        if len(samples):
+            if sensor == "accelerometer":
+                self._acc = self._append(self._acc, samples)
+            else:
+                self._gyro = self._append(self._gyro, samples)
+            self._merge_ready()
+            self._acc = self._bound_lead(self._acc) if len(self._acc) else self._acc
+            self._gyro = self._bound_lead(self._gyro) if len(self._gyro) else self._gyro
+
+        if len(self._rows) < self.window_size:
+            return np.empty((0, self.window_size, 6)), np.empty(0)
+
+        windows = np.array(sliding_windows(self._rows, self.window_size, self.step_size))
+        starts = np.arange(len(windows)) * self.step_size
+        timestamps = self._row_ts[starts]
+
+        consumed = len(windows) * self.step_size
+        self._rows = self._rows[consumed:]
+        self._row_ts = self._row_ts[consumed:]
+        self.windows_emitted += len(windows)
+        return windows, timestamps
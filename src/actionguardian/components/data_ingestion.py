@@ -1,32 +1,124 @@
 import os
-import urllib.request as request
+import json
+import shutil
 from src.actionguardian import logger
+from src.actionguardian.utils.download import ResumableDownloader, sha256_file
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
 from src.actionguardian.entity.config_entity import DataIngestionConfig
 
 class DataIngestion:
     def __init__(self,config:DataIngestionConfig):
         self.config=config
-    
+
     # Downloading the zip file
     def download_file(self):
-        if not os.path.exists(self.config.local_data_file):
-            filename, headers = request.urlretrieve(
-                url = self.config.source_URL,
-                filename = self.config.local_data_file
-            )
-            logger.info(f"{filename} download! with following info: \n{headers}")
-        else:
-            logger.info(f"File already exists")
+        """
+        Fetch the dataset archive, resuming any interrupted download.
+
+        The archive only appears under ``local_data_file`` once it is complete
+        (and matches ``sha256`` when one is configured), so an existing file is
+        trusted unless it fails that checksum.
+        """
+        local_file = Path(self.config.local_data_file)
+        if not self.config.sha256:
+            logger.warning("data_ingestion.sha256 is empty; the dataset archive will not be verified")
+        if local_file.exists():
+            if not self.config.sha256 or sha256_file(local_file) == self.config.sha256.lower():
+                logger.info(f"File already exists")
+                return
+            logger.warning(f"{local_file} does not match the configured SHA-256; downloading again")
+            local_file.unlink()
+
+        downloader = ResumableDownloader(
+            chunk_size=int(self.config.chunk_size_mb * (1 << 20)),
+            n_workers=self.config.download_workers,
+            max_retries=self.config.max_retries
+        )
+        downloader.download(self.config.source_URL, local_file, sha256=self.config.sha256 or None)
+        logger.info(f"{local_file} downloaded from {self.config.source_URL}")
+
+    def index_zip_members(self) -> dict:
+        """
+        Read the archive's central directory without decompressing anything.
+
+        Returns:
+            dict: Member name -> [CRC-32, uncompressed size] for every file.
+        """
+        with zipfile.ZipFile(self.config.local_data_file, 'r') as zip_ref:
+            return {i.filename: [i.CRC, i.file_size] for i in zip_ref.infolist() if not i.is_dir()}
+
+    def _manifest_path(self) -> Path:
+        return Path(self.config.unzip_dir) / ".extract_manifest.json"
+
+    def _extract_member(self, zip_ref: zipfile.ZipFile, member: str):
+        root = Path(self.config.unzip_dir).resolve()
+        target = (root / member).resolve()
+        if root not in target.parents:
+            raise ValueError(f"Refusing to extract {member} outside {root}")
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp_target = target.with_name(target.name + ".part")
+        with zip_ref.open(member) as src, open(tmp_target, 'wb') as dst:
+            shutil.copyfileobj(src, dst, 1 << 20)
+        os.replace(tmp_target, target)
+
+    def _remove_member(self, member: str):
+        root = Path(self.config.unzip_dir).resolve()
+        target = (root / member).resolve()
+        if root not in target.parents:
+            return
+        target.unlink(missing_ok=True)
+        # Recording folders are globbed, so an emptied one must go too
+        for parent in target.parents:
+            if parent == root or any(parent.iterdir()):
+                break
+            parent.rmdir()
 
     def extract_zip_file(self):
         """
         zip_file_path: str
         Extracts the zip file into the data directory
         Function returns None
+
+        Extraction is incremental: a member is only written when its CRC/size
+        in the central directory differs from the last extraction or its file
+        is missing, and changed members are decompressed in parallel. Files
+        of members that were removed from the archive are deleted. In
+        ``stream`` mode nothing is extracted; later stages read the CSVs
+        straight from the archive.
         """
+        members = self.index_zip_members()
+        if self.config.mode == "stream":
+            logger.info(f"Stream mode: indexed {len(members)} members of {self.config.local_data_file}, skipping extraction")
+            return
+
         unzip_path = self.config.unzip_dir
         os.makedirs(unzip_path, exist_ok=True)
-        with zipfile.ZipFile(self.config.local_data_file, 'r') as zip_ref:
-            zip_ref.extractall(unzip_path)
+
+        manifest_path = self._manifest_path()
+        manifest = {}
+        if manifest_path.exists():
+            with open(manifest_path, 'r') as f:
+                manifest = json.load(f)
+
+        changed = [
+            name for name, sig in members.items()
+            if manifest.get(name) != sig or not (Path(unzip_path) / name).exists()
+        ]
+        removed = [name for name in manifest if name not in members]
+        logger.info(f"Extracting {len(changed)} of {len(members)} archive members into {unzip_path}")
+
+        if removed:
+            logger.info(f"Removing {len(removed)} files no longer in the archive")
+            for name in removed:
+                self._remove_member(name)
+
+        if changed:
+            with zipfile.ZipFile(self.config.local_data_file, 'r') as zip_ref:
+                with ThreadPoolExecutor(max_workers=self.config.n_workers) as executor:
+                    list(executor.map(lambda name: self._extract_member(zip_ref, name), changed))
+
+        with open(manifest_path, 'w') as f:
+            json.dump(members, f, indent=4)
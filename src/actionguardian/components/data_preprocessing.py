@@ -1,67 +1,193 @@
 import os
 import pandas as pd
 import numpy as np
-from scipy.fft import fft
+from pathlib import Path
 from glob import glob
-from typing import Tuple
+from typing import Iterator, List, Optional, Tuple
 from src.actionguardian import logger
+from src.actionguardian.utils.features import extract_window_features, FEATURES_PER_AXIS
+from src.actionguardian.utils.windowing import sliding_windows, majority_labels
+from src.actionguardian.utils.feature_store import FeatureStore, recording_hash
 
 from src.actionguardian.entity.config_entity import DataPreprocessingConfig
 
+NON_SENSOR_COLUMNS = ('id', 'recording', 'timestamp', 'seconds_elapsed', 'label')
+# A window never spans a change in any of these columns
+SEGMENT_COLUMNS = ('recording', 'id', 'label')
+
 class DataPreprocessor:
     def __init__(self, config: DataPreprocessingConfig):
         self.cfg = config
         os.makedirs(self.cfg.root_dir, exist_ok=True)
 
     def load_data(self) -> pd.DataFrame:
-        df = pd.read_csv(self.cfg.data_path)
+        if self.cfg.data_path.suffix == '.parquet':
+            df = pd.read_parquet(self.cfg.data_path)
+        else:
+            df = pd.read_csv(self.cfg.data_path)
         logger.info(f"Loaded data for preprocessing: {self.cfg.data_path} (shape={df.shape})")
         return df
 
     def create_sliding_windows(self, df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
-        X, y = [], []
-        df = df.drop(columns=['id','timestamp','seconds_elapsed'], errors='ignore')
-        data_vals = df.drop(columns=['label']).values
-        labels = df['label'].values
-
-        for start in range(0, len(df) - self.cfg.window_size + 1, self.cfg.step_size):
-            window = data_vals[start:start + self.cfg.window_size]
-            label_mode = pd.Series(labels[start:start + self.cfg.window_size]).mode()[0]
-            if window.shape[0] == self.cfg.window_size:
-                X.append(window)
-                y.append(label_mode)
-
-        X_arr = np.stack(X)
-        y_arr = np.array(y)
+        sensor_cols = [c for c in df.columns if c not in NON_SENSOR_COLUMNS]
+        data_vals = df[sensor_cols].to_numpy()
+        labels = df['label'].to_numpy()
+
+        X_arr = sliding_windows(data_vals, self.cfg.window_size, self.cfg.step_size)
+        y_arr = majority_labels(labels, self.cfg.window_size, self.cfg.step_size)
         logger.info(f"Created {len(X_arr)} windows of size {self.cfg.window_size}")
         return X_arr, y_arr
 
     def extract_features(self, X: np.ndarray) -> np.ndarray:
-        def zero_cross_rate(sig):
-            return ((sig[:-1] * sig[1:]) < 0).sum()
-
-        feats = []
-        for window in X:
-            stats = []
-            num_features = window.shape[-1]  # support 2D windows
-            for i in range(num_features):
-                col = window[:, i]
-                # Time-domain
-                stats += [np.mean(col), np.std(col), np.min(col), np.max(col), np.median(col), np.sum(col**2)]
-                # Jerk
-                jerk = np.diff(col) * self.cfg.sampling_rate
-                stats += [np.mean(jerk), np.std(jerk), np.sum(jerk**2)]
-                # Zero crossing
-                stats.append(zero_cross_rate(col))
-                # Frequency-domain
-                fft_vals = np.abs(fft(col))
-                stats += [np.mean(fft_vals), np.max(fft_vals), np.std(fft_vals)]
-            feats.append(stats)
-        feat_arr = np.stack(feats)
+        feat_arr = extract_window_features(X, sampling_rate=self.cfg.sampling_rate)
         logger.info(f"Extracted features: {feat_arr.shape[1]} features per {feat_arr.shape[0]} windows")
         return feat_arr
 
+    def recordings(self, df: pd.DataFrame) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Split the merged dataset into ``(sensor values, labels)`` per recording, in dataset order.
+
+        Windows never span two recordings. Data without a ``recording``
+        column (legacy data.csv) is treated as one recording.
+        """
+        sensor_cols = [c for c in df.columns if c not in NON_SENSOR_COLUMNS]
+        data_vals = df[sensor_cols].to_numpy()
+        labels = df['label'].to_numpy()
+        if 'recording' not in df.columns:
+            return [(data_vals, labels)]
+        groups = df.groupby('recording', sort=False, observed=True).indices
+        return [(data_vals[idx], labels[idx]) for idx in groups.values()]
+
+    def build_features(self, df: pd.DataFrame, window_size: Optional[int] = None,
+                       step_size: Optional[int] = None) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Per-recording ``(features, labels)`` for one windowing, served from the feature store.
+
+        Only recordings whose content hash has no entry for this
+        ``(window_size, step_size, sampling_rate)`` are windowed and
+        featurized; the rest are memory-mapped from disk. Defaults come from
+        the config, so sweeps can pass other window sizes.
+        """
+        window_size = window_size or self.cfg.window_size
+        step_size = step_size or self.cfg.step_size
+        rate = self.cfg.sampling_rate
+        store = FeatureStore(self.cfg.feature_store_dir)
+
+        parts = []
+        for values, labels in self.recordings(df):
+            if len(values) < window_size:
+                continue
+            def compute(values=values, labels=labels):
+                X = sliding_windows(values, window_size, step_size)
+                return extract_window_features(X, sampling_rate=rate), majority_labels(labels, window_size, step_size)
+            parts.append(store.get_or_compute(recording_hash(values, labels), window_size, step_size, rate, compute))
+
+        logger.info(f"Features for window={window_size}, step={step_size}: {store.hits} recordings from "
+                    f"{store.version_dir}, {store.misses} computed")
+        return parts
+
+    def save_features(self, parts: List[Tuple[np.ndarray, np.ndarray]]):
+        """Assemble per-recording features into the X_windows.npy / y_labels.npy pair the trainer reads."""
+        FeatureStore.assemble(parts, Path(self.cfg.root_dir) / 'X_windows.npy', Path(self.cfg.root_dir) / 'y_labels.npy')
+
     def save_numpy(self, X: np.ndarray, y: np.ndarray):
         np.save(os.path.join(self.cfg.root_dir, 'X_windows.npy'), X)
         np.save(os.path.join(self.cfg.root_dir, 'y_labels.npy'), y)
-        logger.info(f"Saved sliding windows and labels to {self.cfg.root_dir}")
\ No newline at end of file
+        logger.info(f"Saved sliding windows and labels to {self.cfg.root_dir}")
+
+    # ---------------------- streaming mode ----------------------
+
+    def _column_names(self) -> List[str]:
+        if self.cfg.data_path.suffix == '.parquet':
+            import pyarrow.parquet as pq
+            return pq.ParquetFile(self.cfg.data_path).schema_arrow.names
+        return list(pd.read_csv(self.cfg.data_path, nrows=0).columns)
+
+    def _iter_chunks(self, columns: List[str]) -> Iterator[pd.DataFrame]:
+        """``chunk_rows`` rows at a time: Arrow record batches for parquet, ``read_csv`` chunks otherwise."""
+        if self.cfg.data_path.suffix == '.parquet':
+            import pyarrow.parquet as pq
+            for batch in pq.ParquetFile(self.cfg.data_path).iter_batches(batch_size=self.cfg.chunk_rows, columns=columns):
+                yield batch.to_pandas()
+        else:
+            yield from pd.read_csv(self.cfg.data_path, usecols=columns, chunksize=self.cfg.chunk_rows)
+
+    def _runs(self, columns: List[str], key_cols: List[str]) -> Iterator[Tuple[tuple, pd.DataFrame]]:
+        """
+        Contiguous pieces of rows sharing the same segment key, in file order.
+
+        A segment that straddles a chunk boundary comes out as consecutive
+        pieces with the same key.
+        """
+        for chunk in self._iter_chunks(columns):
+            if chunk.empty:
+                continue
+            keys = [chunk[c].to_numpy() for c in key_cols]
+            change = np.zeros(len(chunk) - 1, dtype=bool)
+            for k in keys:
+                change |= k[1:] != k[:-1]
+            bounds = np.concatenate([[0], np.flatnonzero(change) + 1, [len(chunk)]])
+            for start, stop in zip(bounds[:-1], bounds[1:]):
+                yield tuple(str(k[start]) for k in keys), chunk.iloc[start:stop]
+
+    def stream_features(self):
+        """
+        Window and featurize the merged dataset in constant memory.
+
+        Two streaming passes over ``data_path``. The first reads only the
+        segment columns to count the windows, so ``X_windows.npy`` and
+        ``y_labels.npy`` can be preallocated as memory-mapped ``.npy`` files.
+        The second reads ``chunk_rows`` rows at a time; the last
+        ``< window_size`` unconsumed samples of a segment are carried into the
+        next chunk, so windows match the in-memory path exactly, and the
+        carry is dropped whenever ``recording``/``id``/``label`` changes.
+        Rows of a segment are expected to be contiguous, as DataTransformation
+        writes them.
+        """
+        window, step, rate = self.cfg.window_size, self.cfg.step_size, self.cfg.sampling_rate
+        columns = self._column_names()
+        key_cols = [c for c in SEGMENT_COLUMNS if c in columns]
+        sensor_cols = [c for c in columns if c not in NON_SENSOR_COLUMNS]
+
+        # Pass 1: segment lengths -> exact output size
+        segments = []
+        for key, piece in self._runs(key_cols, key_cols):
+            if segments and segments[-1][0] == key:
+                segments[-1][1] += len(piece)
+            else:
+                segments.append([key, len(piece)])
+        n_windows = sum((n - window) // step + 1 for _, n in segments if n >= window)
+        if n_windows == 0:
+            raise ValueError("No features to assemble: every recording is shorter than one window")
+        label_pos = key_cols.index('label')
+        label_len = max(len(key[label_pos]) for key, _ in segments)
+
+        x_path = Path(self.cfg.root_dir) / 'X_windows.npy'
+        y_path = Path(self.cfg.root_dir) / 'y_labels.npy'
+        x_tmp, y_tmp = x_path.with_name(x_path.name + '.tmp'), y_path.with_name(y_path.name + '.tmp')
+        X_out = np.lib.format.open_memmap(x_tmp, mode='w+', dtype=np.float64,
+                                          shape=(n_windows, FEATURES_PER_AXIS * len(sensor_cols)))
+        y_out = np.lib.format.open_memmap(y_tmp, mode='w+', dtype=f'<U{label_len}', shape=(n_windows,))
+
+        # Pass 2: window each piece together with the carried tail of its segment
+        written = 0
+        current, tail = None, np.empty((0, len(sensor_cols)))
+        for key, piece in self._runs(key_cols + sensor_cols, key_cols):
+            if key != current:
+                current, tail = key, np.empty((0, len(sensor_cols)))
+            values = np.concatenate([tail, piece[sensor_cols].to_numpy()])
+            if len(values) < window:
+                tail = values
+                continue
+            X = sliding_windows(values, window, step)
+            X_out[written:written + len(X)] = extract_window_features(X, sampling_rate=rate)
+            y_out[written:written + len(X)] = key[label_pos]
+            written += len(X)
+            tail = values[len(X) * step:]
+
+        for out, tmp, path in ((X_out, x_tmp, x_path), (y_out, y_tmp, y_path)):
+            out.flush()
+            del out
+            os.replace(tmp, path)
+        logger.info(f"Streamed {written} windows from {len(segments)} segments of {self.cfg.data_path} "
+                    f"into {x_path} and {y_path} ({self.cfg.chunk_rows} rows per chunk)")
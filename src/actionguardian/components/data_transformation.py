@@ -1,52 +1,99 @@
 import os
+import numpy as np
 import pandas as pd
-from glob import glob
-from typing import List
-from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
 from src.actionguardian import logger
+from src.actionguardian.utils.sensor_source import get_sensor_source
+from src.actionguardian.utils.alignment import align_sensors
 from pathlib import Path
 
 
 from src.actionguardian.entity.config_entity import DataTransformationConfig
 
+SENSOR_COLUMNS = ['z_acc', 'y_acc', 'x_acc', 'z_gyro', 'y_gyro', 'x_gyro']
+RAW_COLUMNS = ['seconds_elapsed', 'z', 'y', 'x']
+
+
+def load_recording(task: Tuple[object, str, str, int, int]) -> Optional[pd.DataFrame]:
+    """
+    Load, merge and label one recording folder.
+
+    Module-level so it can run in a worker process; takes a single
+    ``(source, folder, label, duration, sampling_rate)`` tuple to suit
+    ``Executor.map``, where ``source`` is the directory or zip the CSVs are read from.
+
+    Returns:
+        Optional[pd.DataFrame]: The labelled recording, or None if a sensor file is missing.
+    """
+    source, folder, label, duration, sampling_rate = task
+    accel_path = os.path.join(folder, "Accelerometer.csv")
+    gyro_path = os.path.join(folder, "Gyroscope.csv")
+
+    if not source.exists(accel_path) or not source.exists(gyro_path):
+        logger.warning(f"Missing file in {folder}")
+        return None
+
+    with source.open(accel_path) as accel_file, source.open(gyro_path) as gyro_file:
+        df = DataTransformation._load_and_merge(accel_file, gyro_file, duration, sampling_rate)
+    df['label'] = label
+    df['recording'] = os.path.basename(os.path.normpath(folder))
+    return df
+
+
 class DataTransformation:
     def __init__(self, config: DataTransformationConfig):
         self.base_dir = config.base_data_dir
         self.output_dir = config.output_data_dir
+        self.n_workers = config.n_workers or os.cpu_count()
+        self.sampling_rate = config.sampling_rate
+        self.source = get_sensor_source(config.source_zip, config.source_root)
         os.makedirs(self.output_dir, exist_ok=True)
 
-    def _load_and_merge(self, accel_path: str, gyro_path: str, duration: int = 60) -> pd.DataFrame:
-        acc = pd.read_csv(accel_path)
-        gyro = pd.read_csv(gyro_path)
+    @staticmethod
+    def _load_and_merge(accel_path, gyro_path, duration: int = 60, sampling_rate: int = 50) -> pd.DataFrame:
+        """
+        Resample both sensors onto a common ``sampling_rate`` grid over seconds (10, 10 + duration].
 
-        acc['seconds_elapsed'] = acc['seconds_elapsed'].round(3)
-        gyro['seconds_elapsed'] = gyro['seconds_elapsed'].round(3)
+        Uses the same ``align_sensors`` interpolation as serving, so sensors
+        whose clocks are out of phase still yield a row per grid time.
+        """
+        acc = pd.read_csv(accel_path, usecols=RAW_COLUMNS)[RAW_COLUMNS].to_numpy(np.float64)
+        gyro = pd.read_csv(gyro_path, usecols=RAW_COLUMNS)[RAW_COLUMNS].to_numpy(np.float64)
 
-        merged = pd.merge(acc, gyro, on='seconds_elapsed', suffixes=('_acc', '_gyro'))
-        merged = merged[(merged['seconds_elapsed'] > 10) & (merged['seconds_elapsed'] <= 10 + duration)]
-        merged.drop(columns=['time_acc', 'time_gyro'], inplace=True, errors='ignore')
+        seconds, values = align_sensors(acc, gyro, sampling_rate, start=10 + 1 / sampling_rate, stop=10 + duration)
+        merged = pd.DataFrame(values, columns=SENSOR_COLUMNS)
+        merged.insert(0, 'seconds_elapsed', seconds)
         return merged
 
     def _process_activity(self, folder_paths: List[str], label: str, duration: int = 60) -> pd.DataFrame:
-        dfs = []
-        for folder in folder_paths:
-            accel_path = os.path.join(folder, "Accelerometer.csv")
-            gyro_path = os.path.join(folder, "Gyroscope.csv")
-
-            if not os.path.exists(accel_path) or not os.path.exists(gyro_path):
-                logger.warning(f"Missing file in {folder}")
-                continue
-
-            df = self._load_and_merge(accel_path, gyro_path, duration)
-            df['label'] = label
-            dfs.append(df)
-
+        tasks = [(self.source, f, label, duration, self.sampling_rate) for f in folder_paths]
+        dfs = [df for df in self._load_recordings(tasks) if df is not None]
         return pd.concat(dfs, ignore_index=True) if dfs else pd.DataFrame()
 
+    def _load_recordings(self, tasks: List[Tuple[object, str, str, int, int]]) -> List[Optional[pd.DataFrame]]:
+        """Load recordings in task order, fanning out over worker processes when configured."""
+        if self.n_workers > 1 and len(tasks) > 1:
+            workers = min(self.n_workers, len(tasks))
+            logger.info(f"Loading {len(tasks)} recordings with {workers} worker processes")
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                return list(executor.map(load_recording, tasks))
+        return [load_recording(task) for task in tasks]
+
+    @staticmethod
+    def _to_storage_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+        """Compact column types for the columnar artifacts: float32 axes, categorical labels."""
+        df[SENSOR_COLUMNS] = df[SENSOR_COLUMNS].astype('float32')
+        df['label'] = df['label'].astype('category')
+        df['recording'] = df['recording'].astype('category')
+        if 'id' in df.columns:
+            df['id'] = df['id'].astype('int16')
+        return df
+
     def transform_and_save(self) -> pd.DataFrame:
         activity_map = {
-            "upstair": glob(os.path.join(self.base_dir, "Upstair_all_1", "Upstair_*")),
-            "downstair": glob(os.path.join(self.base_dir, "Downstair_all_1", "Downstairs_*")),
+            "upstair": self.source.glob(os.path.join(self.base_dir, "Upstair_all_1", "Upstair_*")),
+            "downstair": self.source.glob(os.path.join(self.base_dir, "Downstair_all_1", "Downstairs_*")),
             "jogging": [os.path.join(self.base_dir, "Jogging_1")],
             "sitting": [os.path.join(self.base_dir, "Sitting_1")],
             "standing": [os.path.join(self.base_dir, "Standing_1")],
@@ -57,21 +104,35 @@ class DataTransformation:
         all_dfs = []
         file_map = {}
 
-        for idx, (label, folders) in enumerate(activity_map.items(), start=1):
-            df = self._process_activity(folders, label, duration=durations[label])
+        # Every recording is independent: load them all in one parallel pass, then regroup by activity
+        tasks = [(self.source, folder, label, durations[label], self.sampling_rate)
+                 for label, folders in activity_map.items() for folder in folders]
+        by_label = {label: [] for label in activity_map}
+        for (_, _, label, _, _), df in zip(tasks, self._load_recordings(tasks)):
+            if df is not None:
+                by_label[label].append(df)
+
+        for idx, (label, dfs) in enumerate(by_label.items(), start=1):
+            df = pd.concat(dfs, ignore_index=True) if dfs else pd.DataFrame()
             if not df.empty:
                 df['id'] = idx
-                file_path = os.path.join(self.output_dir, f"{label}_final.csv")
-                df.to_csv(file_path, index=False)
+                df = self._to_storage_dtypes(df)
+                file_path = os.path.join(self.output_dir, f"{label}_final.parquet")
+                df.to_parquet(file_path, index=False)
                 logger.info(f"Saved {label} to {file_path}")
                 all_dfs.append(df)
                 file_map[idx] = file_path
 
         final_df = pd.concat(all_dfs, ignore_index=True)
-        final_df['timestamp'] = final_df['seconds_elapsed'].apply(lambda x: (datetime(2025, 1, 1) + timedelta(seconds=x)).strftime("%Y-%m-%d %H:%M:%S"))
-
-        merged_csv = os.path.join(self.output_dir, "data.csv")
-        final_df.to_csv(merged_csv, index=False)
-        logger.info(f"Merged final dataset saved to {merged_csv}")
+        # concat of differing categories falls back to object; restore the categorical label
+        final_df['label'] = final_df['label'].astype('category')
+        final_df['recording'] = final_df['recording'].astype('category')
+        final_df['timestamp'] = (
+            pd.Timestamp(2025, 1, 1) + pd.to_timedelta(final_df['seconds_elapsed'], unit='s')
+        ).dt.floor('s')
+
+        merged_path = os.path.join(self.output_dir, "data.parquet")
+        final_df.to_parquet(merged_path, index=False)
+        logger.info(f"Merged final dataset saved to {merged_path}")
 
         return final_df
\ No newline at end of file
@@ -1,41 +1,159 @@
 import os
+import json
+import hashlib
+import numpy as np
 import pandas as pd
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+from src.actionguardian import logger
+from src.actionguardian.utils.sensor_source import get_sensor_source
 
 from src.actionguardian.entity.config_entity import DataValidationConfig
 
+SENSOR_FILES = {"Accelerometer.csv": "ACCELEROMETER_COLUMNS", "Gyroscope.csv": "GYROSCOPE_COLUMNS"}
+
+# schema.yaml type name -> pandas dtype predicate
+DTYPE_CHECKS = {
+    "float": pd.api.types.is_numeric_dtype,
+    "int": pd.api.types.is_integer_dtype,
+    "str": lambda dtype: True,
+}
+
 class DataValidation:
-    def __init__(self, config):
+    def __init__(self, config: DataValidationConfig):
         self.config = config
         self.acc_schema = config.all_schema["ACCELEROMETER_COLUMNS"]
         self.gyro_schema = config.all_schema["GYROSCOPE_COLUMNS"]
+        self.source = get_sensor_source(config.source_zip, config.source_root)
+        self._cache = self._load_cache()
+        self._unreadable = set()
+
+    # ---------------------- per-file checks ----------------------
+
+    def validate_csv_file(self, csv_path, expected_schema: Dict[str, str]) -> List[str]:
+        """
+        Check one sensor CSV against its schema and return the problems found.
+
+        Only the header plus ``sample_rows`` rows are parsed for the column and
+        dtype checks. With ``full_check`` enabled the file is additionally
+        streamed once in chunks to verify that ``seconds_elapsed`` is monotonic,
+        that no values are missing, and that the mean sampling rate is within
+        ``max_rate_drift`` of ``sampling_rate``.
+        """
+        with self.source.open(str(csv_path)) as f:
+            sample = pd.read_csv(f, nrows=self.config.sample_rows)
+        if set(sample.columns) != set(expected_schema.keys()):
+            return [f"columns {sorted(sample.columns)} != expected {sorted(expected_schema.keys())}"]
+
+        problems = []
+        for col, type_name in expected_schema.items():
+            check = DTYPE_CHECKS.get(str(type_name), lambda dtype: True)
+            if not check(sample[col].dtype):
+                problems.append(f"column '{col}' has dtype {sample[col].dtype}, expected {type_name}")
+
+        if self.config.full_check and not problems:
+            problems += self._stream_checks(csv_path, list(expected_schema.keys()))
+        return problems
+
+    def _stream_checks(self, csv_path, columns: List[str]) -> List[str]:
+        problems = []
+        n_rows = n_nan = 0
+        first_t = last_t = None
+        monotonic = True
+
+        with self.source.open(str(csv_path)) as f:
+            for chunk in pd.read_csv(f, usecols=columns, chunksize=self.config.chunk_rows):
+                n_rows += len(chunk)
+                n_nan += int(chunk.isna().to_numpy().sum())
+                t = chunk["seconds_elapsed"].to_numpy()
+                if len(t) == 0:
+                    continue
+                if last_t is not None and t[0] < last_t:
+                    monotonic = False
+                if np.any(np.diff(t) < 0):
+                    monotonic = False
+                first_t = t[0] if first_t is None else first_t
+                last_t = t[-1]
+
+        if n_nan:
+            problems.append(f"{n_nan} missing values")
+        if not monotonic:
+            problems.append("seconds_elapsed is not monotonic")
+        if n_rows > 1 and last_t > first_t:
+            rate = (n_rows - 1) / (last_t - first_t)
+            drift = abs(rate - self.config.sampling_rate) / self.config.sampling_rate
+            if drift > self.config.max_rate_drift:
+                problems.append(f"sampling rate {rate:.1f} Hz drifts {drift:.0%} from {self.config.sampling_rate} Hz")
+        return problems
 
-    def validate_csv_file(self, csv_path, expected_columns):
-        df = pd.read_csv(csv_path)
-        actual_cols = list(df.columns)
-        return set(actual_cols) == set(expected_columns)
+    # ---------------------- result cache ----------------------
+
+    def _settings_key(self) -> str:
+        settings = {
+            "schema": {"acc": dict(self.acc_schema), "gyro": dict(self.gyro_schema)},
+            "sample_rows": self.config.sample_rows,
+            "full_check": self.config.full_check,
+            "sampling_rate": self.config.sampling_rate,
+            "max_rate_drift": self.config.max_rate_drift,
+        }
+        return hashlib.sha256(json.dumps(settings, sort_keys=True).encode()).hexdigest()
+
+    def _load_cache(self) -> dict:
+        path = self.config.cache_file
+        if path and os.path.exists(path):
+            with open(path, 'r') as f:
+                cache = json.load(f)
+            if cache.get("settings") == self._settings_key():
+                return cache
+        return {"settings": self._settings_key(), "files": {}}
+
+    def _save_cache(self):
+        if not self.config.cache_file:
+            return
+        tmp_path = f"{self.config.cache_file}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self._cache, f, indent=4)
+        os.replace(tmp_path, self.config.cache_file)
+
+    def _validate_cached(self, file_path: str) -> List[str]:
+        sig = list(self.source.signature(file_path))
+        entry = self._cache["files"].get(str(file_path))
+        if entry is not None and entry["sig"] == sig:
+            return entry["problems"]
+
+        schema = self.acc_schema if Path(file_path).name == "Accelerometer.csv" else self.gyro_schema
+        try:
+            problems = self.validate_csv_file(file_path, schema)
+        except Exception as e:
+            # Not cached: a read failure may be transient (permissions, NFS, zip I/O), so check again next run
+            self._unreadable.add(str(file_path))
+            return [f"unreadable: {e}"]
+        self._cache["files"][str(file_path)] = {"sig": sig, "problems": problems}
+        return problems
+
+    # ---------------------- whole dataset ----------------------
 
     def validate_all_sensor_files(self) -> bool:
-        base_dir = self.config.unzip_data_dir
+        base_dir = str(self.config.unzip_data_dir)
+        files = sorted(p for name in SENSOR_FILES for p in self.source.find(base_dir, name))
+
+        with ThreadPoolExecutor(max_workers=self.config.n_workers) as executor:
+            results = list(executor.map(self._validate_cached, files))
+        self._save_cache()
+
         validation_status = True
+        for file_path, problems in zip(files, results):
+            if problems:
+                validation_status = False
+                logger.warning(f"Invalid sensor file {file_path}: {'; '.join(problems)}")
+        logger.info(f"Validated {len(files)} sensor files, {sum(bool(p) for p in results)} invalid")
+        if self._unreadable:
+            # Fail the stage rather than record a verdict main.py's stage cache would keep replaying
+            raise OSError(f"Could not read {len(self._unreadable)} sensor files: {sorted(self._unreadable)}")
 
-        for root, dirs, files in os.walk(base_dir):
-            for file in files:
-                if file in ["Accelerometer.csv", "Gyroscope.csv"]:
-                    file_path = Path(root) / file
-                    if "Accelerometer" in file:
-                        is_valid = self.validate_csv_file(file_path, self.acc_schema.keys())
-                    else:
-                        is_valid = self.validate_csv_file(file_path, self.gyro_schema.keys())
-
-                    if not is_valid:
-                        validation_status = False
-                        print(f"Invalid columns in: {file_path}")
-                    else:
-                        print(f"Validated: {file_path}")
-        
         # Write status to file
         with open(self.config.STATUS_FILE, 'w') as f:
             f.write(f"Validation status: {validation_status}")
-        
-        return validation_status
\ No newline at end of file
+
+        return validation_status
@@ -0,0 +1,175 @@
+import io
+import time
+import itertools
+import joblib
+import numpy as np
+from pathlib import Path
+from statistics import median
+from typing import Dict, Iterator, List, Tuple
+from sklearn.model_selection import train_test_split
+from sklearn.ensemble import RandomForestClassifier, HistGradientBoostingClassifier
+from src.actionguardian import logger
+from src.actionguardian.utils.common import load_json, save_json
+from src.actionguardian.utils.compiled_forest import CompiledForest
+from src.actionguardian.components.model_trainer import dump_atomic
+
+from src.actionguardian.entity.config_entity import ModelCompactionConfig
+
+
+def compressed_size(model, compress: int) -> int:
+    """Bytes the model takes as a compressed joblib artifact."""
+    buffer = io.BytesIO()
+    joblib.dump(model, buffer, compress=compress)
+    return buffer.getbuffer().nbytes
+
+
+def predict_latency(model, X: np.ndarray, repeat: int = 5, single_calls: int = 200) -> Tuple[float, float]:
+    """
+    Median latency of one-window calls (ms) and per-window cost of one batched call (µs).
+    """
+    rows = X[:single_calls]
+    model.predict_proba(rows[:1])  # warm-up (numba compilation, lazy imports)
+    single = []
+    for i in range(len(rows)):
+        start = time.perf_counter()
+        model.predict_proba(rows[i:i + 1])
+        single.append(time.perf_counter() - start)
+    batch = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        model.predict_proba(X)
+        batch.append(time.perf_counter() - start)
+    return median(single) * 1e3, median(batch) / len(X) * 1e6
+
+
+class ModelCompactor:
+    """
+    Post-training search for a smaller, faster serving model.
+
+    Candidates are forests refitted on the trainer's training split with
+    fewer trees, a depth cap and only the most important features (enough
+    to cover ``importance_coverage`` of the trained forest's impurity
+    importance), plus optionally a gradient-boosted model distilled from the
+    forest's predictions. Forests are exported as compacted ``CompiledForest``
+    objects that still take the full feature vector. Each candidate is
+    scored on the trainer's test split for accuracy, compressed size and
+    latency. The fastest one within ``max_accuracy_drop`` of the trained
+    forest (and within ``latency_budget_ms``, if set) is written to
+    ``compact_model_path``, and the comparison goes into ``metrics.json``.
+    """
+
+    def __init__(self, config: ModelCompactionConfig):
+        self.cfg = config
+
+    def split(self, X: np.ndarray, y: np.ndarray):
+        """The trainer's train/test split (same ``test_size`` and ``random_state``)."""
+        return train_test_split(X, y, test_size=self.cfg.test_size, random_state=self.cfg.random_state)
+
+    def feature_subsets(self, forest) -> Dict[float, np.ndarray]:
+        """Smallest set of top-importance features covering each requested share of total importance."""
+        importances = forest.feature_importances_
+        order = np.argsort(importances)[::-1]
+        covered = np.cumsum(importances[order]) / importances.sum()
+        subsets = {}
+        for coverage in self.cfg.importance_coverage:
+            k = min(int(np.searchsorted(covered, coverage - 1e-12)) + 1, len(order))
+            subsets[coverage] = np.sort(order[:k])
+        return subsets
+
+    def _score(self, name: str, model, X_test, y_test, baseline_accuracy: float, **details) -> Dict:
+        accuracy = float(np.mean(model.predict(X_test) == y_test))
+        single_ms, batch_us = predict_latency(model, X_test)
+        result = {
+            "name": name,
+            **details,
+            "test_accuracy": accuracy,
+            "accuracy_delta": accuracy - baseline_accuracy,
+            "size_bytes": compressed_size(model, self.cfg.compress),
+            "latency_ms_single": single_ms,
+            "latency_us_per_window_batch": batch_us,
+        }
+        logger.info(f"{name}: accuracy {accuracy:.4f} ({result['accuracy_delta']:+.4f}), "
+                    f"{result['size_bytes'] / 1024:.0f} KiB, {single_ms:.3f} ms/window single, "
+                    f"{batch_us:.1f} µs/window batched")
+        return result
+
+    def candidates(self, forest, X_train, y_train) -> Iterator[Tuple[str, object, Dict]]:
+        """Yield ``(name, model, details)`` for every compacted model to compare."""
+        n_features = X_train.shape[1]
+        yield ("compiled-compact", CompiledForest.from_sklearn(forest).compact(),
+               {"n_trees": len(forest.estimators_), "max_depth": forest.max_depth, "n_features": n_features})
+
+        subsets = self.feature_subsets(forest)
+        for coverage, max_depth, n_trees in itertools.product(
+                self.cfg.importance_coverage, self.cfg.max_depth, self.cfg.n_estimators):
+            features = subsets[coverage]
+            small = RandomForestClassifier(
+                n_estimators=n_trees, max_depth=max_depth, max_features=forest.max_features,
+                n_jobs=self.cfg.n_jobs, random_state=self.cfg.random_state
+            ).fit(X_train[:, features], y_train)
+            compiled = CompiledForest.from_sklearn(small, features_map=features, n_features_in=n_features).compact()
+            yield (f"forest-t{n_trees}-d{max_depth or 'full'}-f{len(features)}", compiled,
+                   {"n_trees": n_trees, "max_depth": max_depth, "n_features": len(features),
+                    "importance_coverage": coverage, "n_nodes": compiled.n_nodes})
+
+        if self.cfg.distill:
+            # Student learns the forest's decisions, so it can be trained on any rows the forest has seen
+            student = HistGradientBoostingClassifier(
+                max_iter=self.cfg.distill_iterations, max_depth=self.cfg.distill_max_depth,
+                early_stopping=False, random_state=self.cfg.random_state
+            ).fit(X_train, forest.predict(X_train))
+            yield (f"distilled-gbm-i{self.cfg.distill_iterations}", student,
+                   {"n_iterations": self.cfg.distill_iterations, "max_depth": self.cfg.distill_max_depth,
+                    "n_features": n_features})
+
+    def select(self, baseline: Dict, results: List[Dict]) -> Tuple[Dict, str]:
+        """Fastest single-window candidate within the accuracy budget (and the latency budget, if any)."""
+        accurate = [r for r in results if r["test_accuracy"] >= baseline["test_accuracy"] - self.cfg.max_accuracy_drop]
+        if not accurate:
+            return None, f"no candidate within {self.cfg.max_accuracy_drop} accuracy of the trained forest"
+        fast = [r for r in accurate if not self.cfg.latency_budget_ms or r["latency_ms_single"] <= self.cfg.latency_budget_ms]
+        chosen = min(fast or accurate, key=lambda r: (r["latency_ms_single"], r["size_bytes"]))
+        if not fast:
+            return chosen, f"no accurate candidate meets {self.cfg.latency_budget_ms} ms; chose the fastest accurate one"
+        return chosen, f"fastest candidate within {self.cfg.max_accuracy_drop} accuracy of the trained forest"
+
+    def compact(self, X: np.ndarray, y: np.ndarray) -> Dict:
+        forest = joblib.load(self.cfg.model_path)
+        X_train, X_test, y_train, y_test = self.split(X, y)
+
+        baseline_accuracy = float(np.mean(forest.predict(X_test) == y_test))
+        baseline = self._score("trained-forest", forest, X_test, y_test, baseline_accuracy,
+                               n_trees=len(forest.estimators_), max_depth=forest.max_depth, n_features=X.shape[1])
+        baseline["pickle_bytes"] = Path(self.cfg.model_path).stat().st_size
+
+        results, models = [], {}
+        for name, model, details in self.candidates(forest, X_train, y_train):
+            results.append(self._score(name, model, X_test, y_test, baseline_accuracy, **details))
+            models[name] = model
+
+        chosen, reason = self.select(baseline, results)
+        if chosen is None:
+            # Keep serving semantics identical: the compact artifact is the trained forest itself
+            chosen_name, chosen_model = "trained-forest", forest
+        else:
+            chosen_name, chosen_model = chosen["name"], models[chosen["name"]]
+        dump_atomic(chosen_model, self.cfg.compact_model_path, compress=self.cfg.compress)
+        logger.info(f"Selected {chosen_name} ({reason}); saved to {self.cfg.compact_model_path}")
+
+        summary = {
+            "selected": chosen_name,
+            "reason": reason,
+            "compact_model_path": str(self.cfg.compact_model_path),
+            "max_accuracy_drop": self.cfg.max_accuracy_drop,
+            "latency_budget_ms": self.cfg.latency_budget_ms,
+            "baseline": baseline,
+            "candidates": results,
+        }
+        self._record(summary)
+        return summary
+
+    def _record(self, summary: Dict):
+        metrics_path = Path(self.cfg.metrics_path)
+        metrics = load_json(metrics_path).to_dict() if metrics_path.exists() else {}
+        metrics["compaction"] = summary
+        save_json(metrics_path, metrics)
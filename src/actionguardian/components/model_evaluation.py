@@ -1,6 +1,5 @@
 import os
 import numpy as np
-import joblib
 import mlflow
 import mlflow.sklearn
 import matplotlib.pyplot as plt
@@ -8,6 +7,8 @@ import seaborn as sns
 from urllib.parse import urlparse
 from sklearn.metrics import confusion_matrix, accuracy_score, precision_score, recall_score, f1_score
 from src.actionguardian.utils.common import save_json
+from src.actionguardian.utils.model_registry import registry
+from src.actionguardian.utils.run_metrics import stage_metrics_for_mlflow
 from src.actionguardian import logger
 from dotenv import load_dotenv
 from dvc.api import DVCFileSystem
@@ -62,8 +63,8 @@ class ModelEvaluation:
         logger.info(f"Loaded test arrays: {self.cfg.test_features_path}, {self.cfg.test_labels_path}")
 
         # Load model and label encoder
-        model = joblib.load(self.cfg.model_path)
-        le = joblib.load(self.cfg.model_path.parent / 'label_encoder.pkl')
+        model = registry.get(self.cfg.model_path)
+        le = registry.get(self.cfg.model_path.parent / 'label_encoder.pkl')
         class_names = list(le.classes_)
 
         # Prediction and metrics calculation
@@ -84,6 +85,10 @@ class ModelEvaluation:
             # Log metrics
             for k, v in metrics.items():
                 mlflow.log_metric(k, v)
+            # Log timings of the pipeline stages that ran before evaluation
+            if self.cfg.log_run_metrics:
+                for k, v in stage_metrics_for_mlflow(self.cfg.run_metrics_file).items():
+                    mlflow.log_metric(k, v)
             # Log model
             if scheme != 'file':
                 mlflow.sklearn.log_model(model, 'model', registered_model_name='ActivityRF')
@@ -5,14 +5,25 @@ import json
 from sklearn.preprocessing import StandardScaler, LabelEncoder
 from sklearn.model_selection import train_test_split
 from sklearn.ensemble import RandomForestClassifier
+from sklearn.pipeline import Pipeline
 from src.actionguardian import logger
 from src.actionguardian.utils.common import save_json
+from src.actionguardian.utils.compiled_forest import CompiledForest
+from src.actionguardian.utils.onnx_model import OnnxClassifier, to_onnx, parity
 
 import pandas as pd
 
 
 from src.actionguardian.entity.config_entity import ModelTrainerConfig
 
+
+def dump_atomic(obj, path, compress=0):
+    """Write a joblib artifact via a temp file + os.replace so serving never reads a partial file."""
+    tmp_path = f"{path}.tmp"
+    joblib.dump(obj, tmp_path, compress=compress)
+    os.replace(tmp_path, path)
+
+
 class ModelTrainer:
     def __init__(self, config: ModelTrainerConfig):
         self.cfg = config
@@ -27,8 +38,9 @@ class ModelTrainer:
     def scale_features(self, X: np.ndarray):
         scaler = StandardScaler()
         X_scaled = scaler.fit_transform(X)
+        self.scaler = scaler
         path = self.cfg.root_dir / self.cfg.scaler_filename
-        joblib.dump(scaler, path)
+        dump_atomic(scaler, path)
         logger.info(f"Saved scaler to {path}")
         return X_scaled
 
@@ -36,7 +48,7 @@ class ModelTrainer:
         encoder = LabelEncoder()
         y_enc = encoder.fit_transform(y)
         path = self.cfg.root_dir / self.cfg.label_encoder_filename
-        joblib.dump(encoder, path)
+        dump_atomic(encoder, path)
         logger.info(f"Saved label encoder to {path}")
         return y_enc
     
@@ -60,17 +72,67 @@ class ModelTrainer:
 
         clf = RandomForestClassifier(
             n_estimators=self.cfg.n_estimators,
+            max_depth=self.cfg.max_depth,
+            max_features=self.cfg.max_features,
+            n_jobs=self.cfg.n_jobs,
             random_state=self.cfg.random_state
         )
         clf.fit(X_train, y_train)
+        self.model = clf
         acc = clf.score(X_test, y_test)
         # save model
         model_path = self.cfg.root_dir / self.cfg.model_filename
-        joblib.dump(clf, model_path)
+        dump_atomic(clf, model_path)
         logger.info(f"Saved model to {model_path}")
+        # Flat-array export for low-latency serving; predictions are identical to clf's
+        compiled = CompiledForest.from_sklearn(clf)
+        compiled_path = self.cfg.root_dir / self.cfg.compiled_model_filename
+        dump_atomic(compiled, compiled_path)
+        logger.info(f"Saved compiled forest ({compiled.n_trees} trees, {compiled.n_nodes} nodes) to {compiled_path}")
         # save metrics
         metrics = {"test_accuracy": acc}
         metrics_path = self.cfg.root_dir / self.cfg.metrics_filename
         save_json(metrics_path, metrics)
         logger.info(f"Saved metrics to {metrics_path}")
-        return acc
\ No newline at end of file
+        return acc
+
+    def export_onnx(self, X: np.ndarray, parity_rows: int = 5000):
+        """
+        Export the fitted scaler + forest as one ONNX graph and check it against sklearn.
+
+        The graph runs in float32 end to end (sklearn scales in float64), so
+        a few rows right on a split threshold may land on the other side.
+        The share of rows (up to ``parity_rows`` of the unscaled ``X``) where
+        both agree on the class is recorded in ``metrics.json``; the graph is
+        only written if that share reaches ``onnx_min_agreement``. Otherwise
+        the graph of any earlier run is deleted too, so ``backend: onnx``
+        falls back to the new sklearn model instead of serving a stale one.
+        """
+        path = self.cfg.root_dir / self.cfg.onnx_model_filename
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(to_onnx(Pipeline([("scaler", self.scaler), ("forest", self.model)]), X.shape[1]))
+
+        sample = X[:parity_rows]
+        agreement, max_proba_diff = parity(self.model, OnnxClassifier(tmp_path), sample, self.scaler.transform(sample))
+        passed = agreement >= self.cfg.onnx_min_agreement
+        if passed:
+            os.replace(tmp_path, path)
+            logger.info(f"Saved ONNX model to {path} (class agreement {agreement:.4%}, max |dp| {max_proba_diff:.2e})")
+        else:
+            os.remove(tmp_path)
+            path.unlink(missing_ok=True)
+            logger.error(f"ONNX export discarded: class agreement {agreement:.4%} < {self.cfg.onnx_min_agreement:.4%}")
+
+        metrics_path = self.cfg.root_dir / self.cfg.metrics_filename
+        with open(metrics_path, 'r') as f:
+            metrics = json.load(f)
+        metrics["onnx"] = {
+            "exported": passed,
+            "path": str(path),
+            "parity_rows": len(sample),
+            "class_agreement": agreement,
+            "max_proba_diff": max_proba_diff,
+        }
+        save_json(metrics_path, metrics)
+        return passed
@@ -0,0 +1,145 @@
+import os
+import math
+import time
+import itertools
+import numpy as np
+from pathlib import Path
+from typing import Dict, List, Tuple
+from joblib import Parallel, delayed, effective_n_jobs
+from sklearn.model_selection import train_test_split
+from sklearn.ensemble import RandomForestClassifier
+from src.actionguardian import logger
+from src.actionguardian.utils.common import read_yaml, save_yaml, save_json
+
+from src.actionguardian.entity.config_entity import ModelTuningConfig
+
+
+class ModelTuner:
+    """
+    Successive-halving search over RandomForestClassifier settings.
+
+    Every point of the search space starts as a forest with the first tree
+    count of ``n_estimators``. After each rung, the best ``1/halving_factor``
+    of the forests are grown to the next tree count with ``warm_start``, so
+    the trees they already have are kept rather than refitted. Forests
+    within a rung are fitted concurrently on threads; the tree builder
+    releases the GIL, so a rung takes about ``points / cores`` fits of wall
+    time.
+
+    Only the searched settings are written back to ``params.yaml``; the tree
+    count stays whatever the user set there.
+    """
+
+    def __init__(self, config: ModelTuningConfig):
+        self.cfg = config
+        os.makedirs(self.cfg.root_dir, exist_ok=True)
+        if list(self.cfg.n_estimators) != sorted(set(self.cfg.n_estimators)):
+            raise ValueError(f"model_tuning.n_estimators must be strictly increasing, got {self.cfg.n_estimators}")
+
+    def load_data(self) -> Tuple[np.ndarray, np.ndarray]:
+        X = np.load(self.cfg.features_path)
+        y = np.load(self.cfg.labels_path)
+        logger.info(f"Loaded features {self.cfg.features_path} and labels {self.cfg.labels_path} for tuning")
+        return X, y
+
+    def candidates(self) -> List[Dict]:
+        """Every combination of the search space, or ``n_candidates`` of them sampled at random."""
+        names = list(self.cfg.search_space)
+        grid = [dict(zip(names, values)) for values in itertools.product(*self.cfg.search_space.values())]
+        if 0 < self.cfg.n_candidates < len(grid):
+            rng = np.random.default_rng(self.cfg.random_state)
+            grid = [grid[i] for i in sorted(rng.choice(len(grid), self.cfg.n_candidates, replace=False))]
+        return grid
+
+    def split(self, X: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Fit/validation split carved out of the trainer's training portion.
+
+        The trainer's held-out test rows (same ``test_size`` and
+        ``random_state``) are left out, so evaluation never scores a model
+        on data the search has seen.
+        """
+        X_train, _, y_train, _ = train_test_split(
+            X, y, test_size=self.cfg.test_size, random_state=self.cfg.random_state
+        )
+        return train_test_split(
+            X_train, y_train, test_size=self.cfg.validation_size, random_state=self.cfg.random_state, stratify=y_train
+        )
+
+    @staticmethod
+    def _grow(forest: RandomForestClassifier, X_fit, y_fit, X_val, y_val) -> Tuple[float, float]:
+        start = time.perf_counter()
+        forest.fit(X_fit, y_fit)
+        return forest.score(X_val, y_val), time.perf_counter() - start
+
+    def tune(self, X: np.ndarray, y: np.ndarray) -> Dict:
+        X_fit, X_val, y_fit, y_val = self.split(X, y)
+        candidates = self.candidates()
+        n_jobs = effective_n_jobs(self.cfg.n_jobs)
+        forests = {
+            i: RandomForestClassifier(warm_start=True, random_state=self.cfg.random_state, **params)
+            for i, params in enumerate(candidates)
+        }
+        logger.info(f"Tuning {len(candidates)} candidates over {len(X_fit)} windows "
+                    f"(tree rungs {list(self.cfg.n_estimators)}, {n_jobs} jobs)")
+
+        rungs = []
+        scores = {}
+        for rung, n_trees in enumerate(self.cfg.n_estimators):
+            alive = list(forests)
+            # Fewer survivors than cores: give each forest the spare cores for its own trees
+            for i in alive:
+                forests[i].set_params(n_estimators=n_trees, n_jobs=max(1, n_jobs // len(alive)))
+            start = time.perf_counter()
+            results = Parallel(n_jobs=min(n_jobs, len(alive)), prefer="threads")(
+                delayed(self._grow)(forests[i], X_fit, y_fit, X_val, y_val) for i in alive
+            )
+            scores = {i: score for i, (score, _) in zip(alive, results)}
+            rungs.append({
+                "n_estimators": n_trees,
+                "wall_s": time.perf_counter() - start,
+                "results": [{"candidate": i, "params": candidates[i], "val_accuracy": score, "fit_s": fit_s}
+                            for i, (score, fit_s) in zip(alive, results)],
+            })
+            logger.info(f"Rung {rung}: {len(alive)} forests at {n_trees} trees in {rungs[-1]['wall_s']:.1f}s, "
+                        f"best val accuracy {max(scores.values()):.4f}")
+
+            if rung < len(self.cfg.n_estimators) - 1:
+                keep = max(1, math.ceil(len(alive) / self.cfg.halving_factor))
+                survivors = sorted(alive, key=lambda i: -scores[i])[:keep]
+                # Drop the losers right away; only survivors are worth their memory
+                forests = {i: forests[i] for i in survivors}
+
+        best = max(forests, key=lambda i: scores[i])
+        return {
+            "best_params": candidates[best],
+            # Scored at the last rung; the tree count itself is left to params.yaml
+            "n_estimators": self.cfg.n_estimators[-1],
+            "best_val_accuracy": scores[best],
+            "n_candidates": len(candidates),
+            "n_jobs": n_jobs,
+            "rungs": rungs,
+        }
+
+    def save_results(self, summary: Dict):
+        save_json(Path(self.cfg.results_file), summary)
+
+    def update_params(self, best_params: Dict):
+        """
+        Write the winning settings into ``params.yaml`` for the training stage.
+
+        Only the keys of ``search_space`` are written; everything else in the
+        section (``n_estimators``, ``random_state``, ...) stays as the user set it.
+        """
+        searched = {k: v for k, v in best_params.items() if k in self.cfg.search_space}
+        params = read_yaml(Path(self.cfg.params_file)).to_dict()
+        section = params.setdefault(self.cfg.params_section, {})
+        for key, value in searched.items():
+            if key in section and section[key] != value:
+                logger.info(f"{self.cfg.params_file} [{self.cfg.params_section}] {key}: {section[key]!r} -> {value!r}")
+        if all(section.get(k, object()) == v for k, v in searched.items()):
+            logger.info(f"{self.cfg.params_file} [{self.cfg.params_section}] already holds {searched}")
+            return
+        section.update(searched)
+        save_yaml(Path(self.cfg.params_file), params)
+        logger.info(f"Updated {self.cfg.params_file} [{self.cfg.params_section}] with {searched}")
@@ -7,7 +7,10 @@ from src.actionguardian.entity.config_entity import (
     DataTransformationConfig,
     DataPreprocessingConfig,
     ModelTrainerConfig,
-    ModelEvaluationConfig
+    ModelCompactionConfig,
+    ModelTuningConfig,
+    ModelEvaluationConfig,
+    ServingConfig
    # SuggestionGeneratorConfig,
     #PredictionPipelineConfig,
 )
@@ -32,11 +35,24 @@ class ConfigurationManager:
             root_dir=config.root_dir,
             source_URL=config.source_URL,
             local_data_file=config.local_data_file,
-            unzip_dir=config.unzip_dir
+            unzip_dir=config.unzip_dir,
+            mode=config.mode,
+            n_workers=config.n_workers,
+            sha256=config.sha256,
+            chunk_size_mb=config.chunk_size_mb,
+            download_workers=config.download_workers,
+            max_retries=config.max_retries
 
         )
         return data_ingestion_config
 
+    def _source_zip(self):
+        """Archive to read sensor CSVs from when ingestion runs in stream mode."""
+        ingestion = self.config.data_ingestion
+        if ingestion.mode == "stream":
+            return Path(ingestion.local_data_file)
+        return None
+
     def get_data_validation_config(self) -> DataValidationConfig:
         config = self.config.data_validation
         schema = self.schema  # Whole schema including ACCELEROMETER_COLUMNS, etc.
@@ -47,7 +63,16 @@ class ConfigurationManager:
             root_dir=Path(config.root_dir),
             STATUS_FILE=Path(config.STATUS_FILE),
             unzip_data_dir=Path(config.unzip_data_dir),
-            all_schema=schema
+            all_schema=schema,
+            cache_file=Path(config.cache_file),
+            sample_rows=config.sample_rows,
+            full_check=config.full_check,
+            chunk_rows=config.chunk_rows,
+            sampling_rate=config.sampling_rate,
+            max_rate_drift=config.max_rate_drift,
+            n_workers=config.n_workers,
+            source_zip=self._source_zip(),
+            source_root=Path(self.config.data_ingestion.unzip_dir)
         )
 
     def get_data_transformation_config(self) -> DataTransformationConfig:
@@ -58,7 +83,11 @@ class ConfigurationManager:
         return DataTransformationConfig(
             root_dir=Path(config.root_dir),
             base_data_dir=Path(config.base_data_dir),
-            output_data_dir=Path(config.output_data_dir)
+            output_data_dir=Path(config.output_data_dir),
+            n_workers=config.n_workers,
+            sampling_rate=config.sampling_rate,
+            source_zip=self._source_zip(),
+            source_root=Path(self.config.data_ingestion.unzip_dir)
         )
 
     def get_data_preprocessing_config(self) -> DataPreprocessingConfig:
@@ -74,7 +103,10 @@ class ConfigurationManager:
             data_path=Path(cfg.data_path),
             window_size=cfg.window_size,
             step_size=cfg.step_size,
-            sampling_rate=cfg.sampling_rate
+            sampling_rate=cfg.sampling_rate,
+            feature_store_dir=Path(cfg.feature_store_dir),
+            mode=cfg.mode,
+            chunk_rows=cfg.chunk_rows
         )
 
     def get_model_trainer_config(self) -> ModelTrainerConfig:
@@ -88,15 +120,67 @@ class ConfigurationManager:
             scaler_filename = cfg.scaler_filename,
             label_encoder_filename = cfg.label_encoder_filename,
             model_filename = cfg.model_filename,
+            compiled_model_filename = cfg.compiled_model_filename,
             metrics_filename = cfg.metrics_filename,
             test_size = cfg.test_size,
             random_state = params.random_state,
             n_estimators = params.n_estimators,
-            # max_depth   = params.max_depth,      # optional
+            max_depth = params.get("max_depth"),
+            max_features = params.get("max_features", "sqrt"),
+            n_jobs = cfg.n_jobs,
+            onnx_model_filename = cfg.onnx_model_filename or "",
+            onnx_min_agreement = float(cfg.onnx_min_agreement),
             features_path = Path(cfg.features_path),
             labels_path   = Path(cfg.labels_path),
         )
 
+    def get_model_compaction_config(self) -> ModelCompactionConfig:
+        cfg = self.config.model_compaction
+        trainer = self.config.model_trainer
+        params = self.params.RandomForestClassifier
+
+        return ModelCompactionConfig(
+            enabled=cfg.enabled,
+            model_path=Path(trainer.root_dir) / trainer.model_filename,
+            compact_model_path=Path(trainer.root_dir) / cfg.compact_model_filename,
+            metrics_path=Path(trainer.root_dir) / trainer.metrics_filename,
+            test_size=trainer.test_size,
+            random_state=params.random_state,
+            importance_coverage=list(cfg.importance_coverage),
+            max_depth=list(cfg.max_depth),
+            n_estimators=list(cfg.n_estimators),
+            distill=cfg.distill,
+            distill_iterations=cfg.distill_iterations,
+            distill_max_depth=cfg.distill_max_depth,
+            max_accuracy_drop=float(cfg.max_accuracy_drop),
+            latency_budget_ms=float(cfg.latency_budget_ms),
+            compress=cfg.compress,
+            n_jobs=trainer.n_jobs
+        )
+
+    def get_model_tuning_config(self) -> ModelTuningConfig:
+        cfg = self.config.model_tuning
+        trainer = self.config.model_trainer
+
+        create_directories([cfg.root_dir])
+
+        return ModelTuningConfig(
+            root_dir=Path(cfg.root_dir),
+            features_path=Path(trainer.features_path),
+            labels_path=Path(trainer.labels_path),
+            results_file=Path(cfg.results_file),
+            params_file=PARAMS_FILE_PATH,
+            params_section=cfg.params_section,
+            search_space={name: list(values) for name, values in cfg.search_space.items()},
+            n_estimators=list(cfg.n_estimators),
+            halving_factor=cfg.halving_factor,
+            n_candidates=cfg.n_candidates,
+            validation_size=cfg.validation_size,
+            test_size=trainer.test_size,
+            random_state=self.params[cfg.params_section].random_state,
+            n_jobs=cfg.n_jobs
+        )
+
     def get_model_evaluation_config(self) -> ModelEvaluationConfig:
         cfg = self.config.model_evaluation
         # ensure output directory exists
@@ -109,5 +193,39 @@ class ConfigurationManager:
             model_path=Path(cfg.model_path),
             params_section=cfg.params_section,
             metric_file_name=Path(cfg.metric_file_name),
-            mlflow_uri=cfg.mlflow_uri
+            mlflow_uri=cfg.mlflow_uri,
+            run_metrics_file=Path(self.config.run_metrics_file),
+            log_run_metrics=cfg.log_run_metrics
+        )
+
+    def get_serving_config(self) -> ServingConfig:
+        cfg = self.config.serving
+        windowing = self.config.data_preprocessing
+
+        return ServingConfig(
+            model_path=Path(cfg.model_path),
+            backend=cfg.backend,
+            compiled_model_path=Path(cfg.compiled_model_path),
+            compact_model_path=Path(cfg.compact_model_path),
+            onnx_model_path=Path(cfg.onnx_model_path),
+            onnx_intra_op_threads=cfg.onnx_intra_op_threads,
+            scaler_path=Path(cfg.scaler_path),
+            label_encoder_path=Path(cfg.label_encoder_path),
+            window_size=windowing.window_size,
+            step_size=windowing.step_size,
+            sampling_rate=windowing.sampling_rate,
+            warmup_seconds=float(cfg.warmup_seconds),
+            stream_max_lead_seconds=float(cfg.stream_max_lead_seconds),
+            batch_max_delay_ms=float(cfg.batch_max_delay_ms),
+            batch_max_rows=cfg.batch_max_rows,
+            predict_threads=cfg.predict_threads,
+            preprocess_workers=cfg.preprocess_workers,
+            preprocess_max_pending=cfg.preprocess_max_pending,
+            retry_after_seconds=cfg.retry_after_seconds,
+            smoothing=cfg.smoothing,
+            smoothing_window=cfg.smoothing_window,
+            result_cache_entries=cfg.result_cache_entries,
+            result_cache_mb=float(cfg.result_cache_mb),
+            result_cache_db=Path(cfg.result_cache_db) if cfg.result_cache_db else None,
+            result_cache_db_entries=cfg.result_cache_db_entries
         )
@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict
+from typing import Dict, List, Optional, Union
 
 # -----------------------------
 # ✅ Data Ingestion Config
@@ -11,6 +11,12 @@ class DataIngestionConfig:
     source_URL : str
     local_data_file : Path
     unzip_dir : Path
+    mode : str = "extract"    # "extract" or "stream" (read members straight from the zip)
+    n_workers : int = 4
+    sha256 : str = ""         # expected archive checksum; empty disables verification
+    chunk_size_mb : float = 8
+    download_workers : int = 4
+    max_retries : int = 3
 
 # -----------------------------
 # ✅ Data Validation Config
@@ -21,6 +27,15 @@ class DataValidationConfig:
     STATUS_FILE: str
     unzip_data_dir: Path
     all_schema: Dict
+    cache_file: Path = None        # per-file result cache; None disables caching
+    sample_rows: int = 100         # rows read for the dtype check
+    full_check: bool = False       # stream whole files for monotonic/NaN/rate checks
+    chunk_rows: int = 200000
+    sampling_rate: int = 50
+    max_rate_drift: float = 0.1
+    n_workers: int = 8
+    source_zip: Path = None        # read files from this archive instead of unzip_data_dir
+    source_root: Path = None       # extraction dir the archive's member paths are relative to
 
 # -----------------------------
 # ✅ Data Transformation Config
@@ -30,6 +45,10 @@ class DataTransformationConfig:
     root_dir: Path
     base_data_dir: Path
     output_data_dir: Path
+    n_workers: int            # parallel recording loaders (0 = all cores, 1 = sequential)
+    sampling_rate: int = 50   # rate of the common grid both sensors are resampled onto
+    source_zip: Path = None   # read recordings from this archive instead of base_data_dir
+    source_root: Path = None
 
 
 
@@ -39,10 +58,13 @@ class DataTransformationConfig:
 @dataclass(frozen=True)
 class DataPreprocessingConfig:
     root_dir: Path            # artifacts root for preprocessed outputs
-    data_path: Path           # path to merged CSV (data.csv)
+    data_path: Path           # path to merged dataset (data.parquet, or a legacy data.csv)
     window_size: int          # sliding window length (samples)
     step_size: int            # sliding window step (samples)
     sampling_rate: int        # for jerk calculation and FFT
+    feature_store_dir: Path   # cached per-recording features (FeatureStore)
+    mode: str = "memory"      # memory | stream (chunked, constant memory)
+    chunk_rows: int = 500000  # rows per chunk in stream mode
 
 
 # -----------------------------
@@ -54,12 +76,60 @@ class ModelTrainerConfig:
     scaler_filename: str
     label_encoder_filename: str
     model_filename: str
+    compiled_model_filename: str
     metrics_filename: str
     test_size: float
     random_state: int
     n_estimators: int
     features_path: Path  # Path to precomputed features (.npy)
     labels_path: Path    # Path to precomputed labels (.npy)
+    max_depth: Optional[int] = None
+    max_features: Union[str, float, None] = "sqrt"
+    n_jobs: int = -1     # cores used to fit the forest (-1 = all)
+    onnx_model_filename: str = ""    # scaler + forest as one ONNX graph; empty disables the export
+    onnx_min_agreement: float = 0.999  # share of rows the ONNX graph must classify like sklearn
+
+# -----------------------------
+# ✅ Model Compaction Config
+# -----------------------------
+@dataclass(frozen=True)
+class ModelCompactionConfig:
+    enabled: bool
+    model_path: Path             # trained forest to compact
+    compact_model_path: Path     # selected model (compressed joblib)
+    metrics_path: Path           # trainer's metrics.json; the decision is added under "compaction"
+    test_size: float             # trainer's split, reproduced to score candidates
+    random_state: int
+    importance_coverage: List[float]     # share of feature importance each feature subset keeps
+    max_depth: List[Optional[int]]       # depth caps to try
+    n_estimators: List[int]              # tree counts to try
+    distill: bool                # also try a gradient-boosted model distilled from the forest
+    distill_iterations: int
+    distill_max_depth: Optional[int]
+    max_accuracy_drop: float     # tolerated test accuracy loss vs. the trained forest
+    latency_budget_ms: float     # single-window latency target; 0 = none
+    compress: int                # joblib compression level of the selected artifact
+    n_jobs: int = -1
+
+# -----------------------------
+# ✅ Model Tuning Config
+# -----------------------------
+@dataclass(frozen=True)
+class ModelTuningConfig:
+    root_dir: Path
+    features_path: Path
+    labels_path: Path
+    results_file: Path           # every rung's scores and the winner (JSON)
+    params_file: Path            # params.yaml, updated with the winner
+    params_section: str          # section of params_file the trainer reads
+    search_space: Dict[str, list]    # RandomForestClassifier argument -> values to try
+    n_estimators: List[int]      # tree count at each successive-halving rung
+    halving_factor: int          # keep the best 1/halving_factor after each rung
+    n_candidates: int            # sample this many points of search_space (0 = all)
+    validation_size: float       # share of the training portion used to score candidates
+    test_size: float             # trainer's held-out share, excluded from tuning
+    random_state: int
+    n_jobs: int = -1
 
 # -----------------------------
 # ✅ Model Evaluation Config
@@ -73,8 +143,42 @@ class ModelEvaluationConfig:
     params_section: str
     metric_file_name: Path
     mlflow_uri: str
+    run_metrics_file: Path = Path("artifacts/run_metrics.json")
+    log_run_metrics: bool = False
+
+
 
 
+# -----------------------------
+# ✅ Serving Config
+# -----------------------------
+@dataclass(frozen=True)
+class ServingConfig:
+    model_path: Path
+    backend: str              # sklearn | compiled | compact | onnx
+    compiled_model_path: Path
+    compact_model_path: Path  # model selected by ModelCompactor
+    onnx_model_path: Path     # scaler + forest graph for backend: onnx
+    onnx_intra_op_threads: int
+    scaler_path: Path
+    label_encoder_path: Path
+    window_size: int          # taken from data_preprocessing so serving matches training
+    step_size: int
+    sampling_rate: int
+    warmup_seconds: float     # initial seconds dropped before windowing
+    stream_max_lead_seconds: float  # how far one sensor may run ahead of the other in /stream/
+    batch_max_delay_ms: float
+    batch_max_rows: int
+    predict_threads: int
+    preprocess_workers: int
+    preprocess_max_pending: int
+    retry_after_seconds: int
+    smoothing: str            # none | mean | median
+    smoothing_window: int
+    result_cache_entries: int
+    result_cache_mb: float
+    result_cache_db: Optional[Path]   # None disables the SQLite tier
+    result_cache_db_entries: int
 
 
 # -----------------------------
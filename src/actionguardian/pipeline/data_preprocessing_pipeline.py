@@ -13,10 +13,12 @@ class DataPreprocessingTrainingPipeline:
         config = ConfigurationManager()
         data_preprocessing_config = config.get_data_preprocessing_config()
         data_preprocessor = DataPreprocessor(config=data_preprocessing_config)
+        if data_preprocessing_config.mode == "stream":
+            data_preprocessor.stream_features()
+            return
         df = data_preprocessor.load_data()
-        X, y = data_preprocessor.create_sliding_windows(df)
-        features = data_preprocessor.extract_features(X)
-        data_preprocessor.save_numpy(X=features, y=y)
+        parts = data_preprocessor.build_features(df)
+        data_preprocessor.save_features(parts)
 
 
 if __name__ == '__main__':
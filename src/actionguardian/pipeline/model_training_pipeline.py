@@ -1,5 +1,6 @@
 from src.actionguardian.config.configuration import ConfigurationManager
 from src.actionguardian.components.model_trainer import ModelTrainer
+from src.actionguardian.components.model_compactor import ModelCompactor
 from src.actionguardian import logger
 
 STAGE_NAME = "Model Training Stage"
@@ -16,6 +17,13 @@ class ModelTrainingTrainingPipeline:
         y_enc = model_trainer.encode_labels(y)
         accuracy = model_trainer.train_and_evaluate(X_scaled, y_enc)
         print(f"Model training completed. Test Accuracy: {accuracy:.4f}")
+        if model_trainer_config.onnx_model_filename:
+            model_trainer.export_onnx(X)
+
+        model_compaction_config = config.get_model_compaction_config()
+        if model_compaction_config.enabled:
+            summary = ModelCompactor(config=model_compaction_config).compact(X_scaled, y_enc)
+            print(f"Model compaction completed. Selected {summary['selected']}: {summary['reason']}")
 
 
 
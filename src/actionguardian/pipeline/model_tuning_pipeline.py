@@ -0,0 +1,30 @@
+from src.actionguardian.config.configuration import ConfigurationManager
+from src.actionguardian.components.model_tuner import ModelTuner
+from src.actionguardian import logger
+
+STAGE_NAME = "Model Tuning Stage"
+
+class ModelTuningTrainingPipeline:
+    def __init__(self):
+        pass
+    def initiate_model_tuning(self):
+        config = ConfigurationManager()
+        model_tuning_config = config.get_model_tuning_config()
+        model_tuner = ModelTuner(config=model_tuning_config)
+        X, y = model_tuner.load_data()
+        summary = model_tuner.tune(X, y)
+        model_tuner.save_results(summary)
+        model_tuner.update_params(summary["best_params"])
+        print(f"Model tuning completed. Best validation accuracy: {summary['best_val_accuracy']:.4f} "
+              f"with {summary['best_params']}")
+
+
+if __name__ == '__main__':
+    try:
+        logger.info(f">>>>>> stage {STAGE_NAME} started <<<<<<")
+        obj = ModelTuningTrainingPipeline()
+        obj.initiate_model_tuning()
+        logger.info(f">>>>>> stage {STAGE_NAME} completed <<<<<<\n\nx==========x")
+    except Exception as e:
+        logger.exception(e)
+        raise e
@@ -1,147 +1,273 @@
-import joblib 
+import io
+import time
+from functools import partial
 import numpy as np
 import pandas as pd
 from pathlib import Path
-from scipy.fft import fft
 from collections import Counter
+from contextlib import contextmanager
+from typing import Optional, Sequence
+
+from src.actionguardian import logger
+from src.actionguardian.config.configuration import ConfigurationManager
+from src.actionguardian.utils.features import extract_window_features
+from src.actionguardian.utils.windowing import sliding_windows, window_starts
+from src.actionguardian.utils.alignment import align_sensors
+from src.actionguardian.utils.model_registry import registry
+from src.actionguardian.utils.onnx_model import OnnxClassifier
+from src.actionguardian.utils.timeline import smooth_probabilities, activity_segments, activity_durations
 
 # ---------------------- Helper Functions ----------------------
 
-def zero_crossing_rate(signal):
-    return ((signal[:-1] * signal[1:]) < 0).sum()
+@contextmanager
+def span(timings: Optional[dict], name: str):
+    """Add the block's duration in seconds to ``timings[name]`` (no-op if ``timings`` is None)."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if timings is not None:
+            timings[name] = timings.get(name, 0.0) + time.perf_counter() - start
 
 def extract_features_from_windows(X_windows, sampling_rate=50):
     try:
-        feature_list = []
-        for window in X_windows:
-            stats = []
-            for i in range(window.shape[1]):
-                col = window[:, i]
-                stats.extend([
-                    np.mean(col), np.std(col), np.min(col), np.max(col),
-                    np.median(col), np.sum(col ** 2)
-                ])
-                jerk = np.diff(col) * sampling_rate
-                stats.extend([
-                    np.mean(jerk), np.std(jerk), np.sum(jerk ** 2)
-                ])
-                stats.append(zero_crossing_rate(col))
-                fft_vals = np.abs(fft(col))
-                stats.extend([
-                    np.mean(fft_vals), np.max(fft_vals), np.std(fft_vals)
-                ])
-            feature_list.append(stats)
-        features = np.array(feature_list)
-        if features.size == 0:
-            raise ValueError("No features extracted. Possibly not enough data.")
-        return features
+        return extract_window_features(np.asarray(X_windows), sampling_rate=sampling_rate)
     except Exception as e:
         print(f"Error in extract_features_from_windows: {e}")
         return np.empty((0,))
 
 def create_sliding_windows(df, window_size=250, step_size=250):
     try:
-        X = []
-        timestamps = []
         df = df.drop(columns=['timestamp'], errors='ignore')
-        feature_data = df.values
-        all_timestamps = df.index.to_numpy()
-
-        for start in range(0, len(df) - window_size + 1, step_size):
-            end = start + window_size
-            window = feature_data[start:end]
-            ts_window = all_timestamps[start:end]
-            if len(window) == window_size:
-                X.append(window)
-                timestamps.append(ts_window[0])
-        if len(X) == 0:
-            raise ValueError("No sliding windows could be created. Not enough data.")
-        return np.array(X), np.array(timestamps)
+        X = sliding_windows(df.to_numpy(), window_size, step_size)
+        timestamps = df.index.to_numpy()[window_starts(len(df), window_size, step_size)]
+        return X, timestamps
     except Exception as e:
         print(f"Error in create_sliding_windows: {e}")
         return np.empty((0, 0, 0)), np.array([])
 
-# ✅ Updated to enforce clean column names and correct order
-def load_and_merge_sensor_data(acc_path, gyro_path):
-    try:
-        acc_df = pd.read_csv(acc_path)
-        gyro_df = pd.read_csv(gyro_path)
-        
-        # 2) If your CSVs call the time-column something else, rename it:
-        if "seconds_elapsed" in acc_df.columns:
-            acc_df = acc_df.rename(columns={"seconds_elapsed": "timestamp"})
-        if "seconds_elapsed" in gyro_df.columns:
-            gyro_df = gyro_df.rename(columns={"seconds_elapsed": "timestamp"})
-
-        merged = pd.merge_asof(
-            acc_df.sort_values('timestamp'),
-            gyro_df.sort_values('timestamp'),
-            on='timestamp',
-            direction='nearest'
-        )
-
-        merged = merged.dropna()
-        merged = merged[merged['timestamp'] > merged['timestamp'].min() + 5.0]
-        merged = merged.reset_index(drop=True)
+# Only the time column and the three axes are parsed; timestamps keep float64
+# precision for long recordings, the axes are read straight into float32.
+SENSOR_CSV_DTYPES = {
+    "seconds_elapsed": "float64", "timestamp": "float64",
+    "z": "float32", "y": "float32", "x": "float32",
+}
 
-        if merged.empty:
-            raise ValueError("Merged dataframe is empty after cleaning.")
+def read_sensor_csv(source):
+    """
+    Parse one sensor CSV from a path, a file-like object or raw bytes.
 
-        # Rename columns for clarity
-        merged = merged.rename(columns={
-            'x_x': 'acc_x', 'y_x': 'acc_y', 'z_x': 'acc_z',
-            'x_y': 'gyro_x', 'y_y': 'gyro_y', 'z_y': 'gyro_z'
-        })
+    Uploads can be parsed straight from their in-memory/spooled buffer
+    without being written to disk first.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = io.BytesIO(source)
+    df = pd.read_csv(
+        source,
+        usecols=lambda c: c in SENSOR_CSV_DTYPES,
+        dtype=SENSOR_CSV_DTYPES,
+        engine="c"
+    )
+    # If your CSVs call the time-column seconds_elapsed, rename it:
+    if "seconds_elapsed" in df.columns:
+        df = df.drop(columns=["timestamp"], errors="ignore").rename(columns={"seconds_elapsed": "timestamp"})
+    return df
 
-        # Keep only the necessary 6 columns in your required order
-        final_columns = ['acc_z', 'acc_y', 'acc_x', 'gyro_z', 'gyro_y', 'gyro_x']
-        merged = merged[final_columns]
+# Column order of the merged frame: acc z,y,x then gyro z,y,x
+MERGED_COLUMNS = ['acc_z', 'acc_y', 'acc_x', 'gyro_z', 'gyro_y', 'gyro_x']
 
-        print(f"Merged shape: {merged.shape}")
-        print(f"Columns used: {list(merged.columns)}")
-        print(f"Sample:\n{merged.head()}")
+def load_and_merge_sensor_data(acc_source, gyro_source, timings=None, sampling_rate=50, warmup_seconds=5.0):
+    """
+    Parse both sensor CSVs and resample them onto one ``sampling_rate`` grid.
 
+    Uses the same ``align_sensors`` interpolation as DataTransformation, so
+    uploads are aligned exactly like the training data. The first
+    ``warmup_seconds`` of the common stretch are dropped; row ``i`` of the
+    result lies ``i / sampling_rate`` seconds after that.
+    """
+    try:
+        with span(timings, "csv_parse"):
+            acc_df = read_sensor_csv(acc_source)
+            gyro_df = read_sensor_csv(gyro_source)
+
+        with span(timings, "merge"):
+            acc = acc_df[['timestamp', 'z', 'y', 'x']].to_numpy(np.float64)
+            gyro = gyro_df[['timestamp', 'z', 'y', 'x']].to_numpy(np.float64)
+            start = max(acc[:, 0].min(), gyro[:, 0].min()) + warmup_seconds if len(acc) and len(gyro) else None
+            _, values = align_sensors(acc, gyro, sampling_rate, start=start)
+            merged = pd.DataFrame(values, columns=MERGED_COLUMNS, copy=False)
+
+        if merged.empty:
+            raise ValueError("Merged dataframe is empty after cleaning.")
+
+        logger.debug("Merged %d rows of %s", len(merged), list(merged.columns))
         return merged
     except Exception as e:
         print(f"Error in load_and_merge_sensor_data: {e}")
         return pd.DataFrame()
 
+def build_window_features(acc_source, gyro_source, window_size=250, step_size=250, sampling_rate=50,
+                          warmup_seconds=5.0):
+    """
+    Run the CPU-bound part of serving (parse, merge, window, featurize) for one upload pair.
+
+    ``acc_source``/``gyro_source`` may be paths, file-like objects or raw bytes.
+
+    Kept at module level so it can be shipped to a worker process.
+
+    Raises:
+        ValueError: With a user-facing message if any step yields no data.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, dict]: Features, window start rows and
+        stats for the request: seconds per step (``spans``: csv_parse, merge,
+        windowing, features) plus the merged ``rows`` and ``windows`` counts.
+    """
+    timings = {}
+    df = load_and_merge_sensor_data(acc_source, gyro_source, timings, sampling_rate, warmup_seconds)
+    if df.empty:
+        raise ValueError("Sensor data merge returned no rows. Check your timestamps/ranges.")
+
+    with span(timings, "windowing"):
+        X_windows, timestamps = create_sliding_windows(df, window_size, step_size)
+    if X_windows.size == 0:
+        raise ValueError("Not enough rows to form any window. Try more data or smaller window_size.")
+
+    with span(timings, "features"):
+        features = extract_features_from_windows(X_windows, sampling_rate)
+    if features.ndim != 2 or features.shape[0] == 0:
+        raise ValueError("Feature extraction yielded no valid features.")
+    return features, timestamps, {"spans": timings, "rows": len(df), "windows": len(X_windows)}
+
 def summarize_activity_predictions(predictions, timestamps, window_duration=5):
     activity_counts = Counter(predictions)
     summary = {activity: count * window_duration for activity, count in activity_counts.items()}
     return summary
 
+def _optional_artifact(path):
+    return registry.get(path) if path and Path(path).exists() else None
+
+def load_serving_artifacts(serving_config):
+    """
+    Fetch the classifier and, when present, the scaler and label encoder saved with it.
+
+    Artifacts come from the shared registry, so a retrained set is picked up
+    without a restart. A missing scaler/encoder file yields None so models
+    trained without them still serve. With ``backend: compiled`` the flat-array
+    forest exported by the trainer is used, falling back to the sklearn model
+    if it hasn't been exported yet; ``backend: compact`` prefers the model
+    selected by ModelCompactor and falls back the same way. ``backend: onnx``
+    runs the exported scaler + forest graph through onnxruntime; since the
+    graph scales internally, no scaler is returned with it.
+    """
+    encoder = _optional_artifact(serving_config.label_encoder_path)
+    if serving_config.backend == "onnx" and serving_config.onnx_model_path.exists():
+        loader = partial(OnnxClassifier, intra_op_threads=serving_config.onnx_intra_op_threads)
+        return registry.get(serving_config.onnx_model_path, loader=loader), None, encoder
+
+    model = None
+    if serving_config.backend == "compact":
+        model = _optional_artifact(serving_config.compact_model_path)
+    if model is None and serving_config.backend in ("compiled", "compact"):
+        model = _optional_artifact(serving_config.compiled_model_path)
+    if model is None:
+        model = registry.get(serving_config.model_path)
+    scaler = _optional_artifact(serving_config.scaler_path)
+    return model, scaler, encoder
+
+def predict_window_proba(features, model, scaler=None):
+    """Class probabilities for every window, scaled the way the model was trained."""
+    X = scaler.transform(features) if scaler is not None else features
+    return model.predict_proba(X)
+
+def class_names(model, label_encoder=None):
+    """Activity name for each ``predict_proba`` column, decoded if the model was trained on encoded labels."""
+    classes = np.asarray(model.classes_)
+    if label_encoder is not None:
+        classes = label_encoder.inverse_transform(classes.astype(int))
+    return [str(c) for c in classes]
+
+def build_activity_timeline(proba, start_seconds, classes: Sequence[str], hop_seconds: float,
+                            smoothing: str = "median", smoothing_window: int = 5):
+    """
+    Turn per-window probabilities into a smoothed timeline and activity durations.
+
+    Args:
+        proba (np.ndarray): ``(n_windows, n_classes)`` output of ``predict_proba``.
+        start_seconds (np.ndarray): Start time of each window in seconds.
+        classes (Sequence[str]): Activity name for each probability column.
+        hop_seconds (float): ``step_size / sampling_rate``; the time each window accounts for.
+        smoothing (str): ``none``, ``mean`` or ``median`` (see ``smooth_probabilities``).
+        smoothing_window (int): Number of consecutive windows the filter spans.
+
+    Raises:
+        ValueError: If the probability columns don't match ``classes``.
+
+    Returns:
+        dict: ``activity_summary_seconds``, ``segments`` and the per-window ``timeline``.
+    """
+    proba = np.asarray(proba)
+    if proba.ndim != 2 or proba.shape[1] != len(classes):
+        raise ValueError(f"Probabilities of shape {proba.shape} don't match {len(classes)} classes")
+
+    smoothed = smooth_probabilities(proba, smoothing, smoothing_window)
+    labels = smoothed.argmax(axis=1)
+    confidence = smoothed[np.arange(len(labels)), labels]
+    start_seconds = np.asarray(start_seconds, dtype=np.float64)
+
+    segments = activity_segments(labels, start_seconds, hop_seconds)
+    for seg in segments:
+        seg["activity"] = classes[seg.pop("label")]
+
+    return {
+        "activity_summary_seconds": activity_durations(labels, classes, hop_seconds),
+        "segments": segments,
+        "timeline": [
+            {"start": float(t), "activity": classes[k], "confidence": round(float(c), 4)}
+            for t, k, c in zip(start_seconds, labels, confidence)
+        ],
+    }
+
 # ---------------------- Main Pipeline ----------------------
 
 def main():
     acc_path = 'test/Accelerometer.csv'
     gyro_path = 'test/Gyroscope.csv'
-    model_path = 'artifacts/model_trainer/activity_model.pkl'
+    serving_config = ConfigurationManager().get_serving_config()
 
 
-    df = load_and_merge_sensor_data(acc_path, gyro_path)
+    df = load_and_merge_sensor_data(acc_path, gyro_path, sampling_rate=serving_config.sampling_rate,
+                                    warmup_seconds=serving_config.warmup_seconds)
     if df.empty:
         print("Stopping: Sensor data couldn't be loaded properly.")
         return
 
-    X_windows, timestamps = create_sliding_windows(df)
+    X_windows, timestamps = create_sliding_windows(df, serving_config.window_size, serving_config.step_size)
     if X_windows.size == 0:
         print("Stopping: No windows created from data.")
         return
 
-    features = extract_features_from_windows(X_windows)
+    features = extract_features_from_windows(X_windows, serving_config.sampling_rate)
     if features.size == 0:
         print("Stopping: Feature extraction failed.")
         return
 
     try:
-        model = joblib.load(model_path)
-        predictions = model.predict(features)
+        model, scaler, encoder = load_serving_artifacts(serving_config)
+        proba = predict_window_proba(features, model, scaler)
     except Exception as e:
         print(f"Error loading or predicting with model: {e}")
         return
 
-    summary = summarize_activity_predictions(predictions, timestamps)
+    result = build_activity_timeline(
+        proba,
+        start_seconds=timestamps / serving_config.sampling_rate,
+        classes=class_names(model, encoder),
+        hop_seconds=serving_config.step_size / serving_config.sampling_rate,
+        smoothing=serving_config.smoothing,
+        smoothing_window=serving_config.smoothing_window
+    )
+    summary = result["activity_summary_seconds"]
     print("\n Activity Summary (Duration in Seconds):")
     for activity, duration in summary.items():
         print(f"{activity}: {duration} sec")
@@ -0,0 +1,142 @@
+import numpy as np
+from typing import Optional, Tuple
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the searchsorted path is used instead
+    njit = None
+
+
+def grid_count(start: float, stop: float, sampling_rate: int) -> int:
+    """
+    Number of grid times ``time_grid(start, stop, sampling_rate)`` returns, without building them.
+    """
+    # The small slack keeps a stop that lies exactly on the grid despite float rounding
+    return max(int(np.floor((stop - start) * sampling_rate + 1e-6)) + 1, 0)
+
+
+def time_grid(start: float, stop: float, sampling_rate: int) -> np.ndarray:
+    """
+    Sample times ``start + k / sampling_rate`` up to and including ``stop``.
+
+    Args:
+        start (float): First grid time in seconds.
+        stop (float): Last time the grid may reach in seconds.
+        sampling_rate (int): Grid rate in Hz.
+
+    Returns:
+        np.ndarray: Grid times (possibly empty).
+    """
+    return start + np.arange(grid_count(start, stop, sampling_rate)) / sampling_rate
+
+
+def _interpolate_sorted(times, values, grid, out):
+    # Both inputs are sorted, so one forward pass over the samples finds every bracket
+    last = len(times) - 1
+    lo = 0
+    for i in range(len(grid)):
+        g = grid[i]
+        while lo < last and times[lo + 1] <= g:
+            lo += 1
+        hi = min(lo + 1, last)
+        span = times[hi] - times[lo]
+        weight = np.float32(0.0)
+        if span > 0:
+            weight = np.float32(min(max((g - times[lo]) / span, 0.0), 1.0))
+        for k in range(values.shape[1]):
+            lower = np.float32(values[lo, k])
+            out[i, k] = lower + weight * (np.float32(values[hi, k]) - lower)
+
+
+_interpolate_sorted_jit = njit(cache=True, nogil=True)(_interpolate_sorted) if njit is not None else None
+
+
+def interpolate_samples(times: np.ndarray, values: np.ndarray, grid: np.ndarray,
+                        out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Linearly interpolate a sensor stream at the given grid times.
+
+    Each grid time takes the last sample at or before it and the one after;
+    grid times outside the samples take the nearest edge value and repeated
+    timestamps get weight 0. With numba installed this is a single merge
+    pass over both sorted arrays; otherwise the brackets come from one
+    ``np.searchsorted`` call. Both produce the same float32 values.
+
+    Args:
+        times (np.ndarray): Sample times of shape ``(n,)``, ascending.
+        values (np.ndarray): Samples of shape ``(n, n_axes)``.
+        grid (np.ndarray): Times to interpolate at, shape ``(m,)``, ascending.
+        out (np.ndarray, optional): float32 ``(m, n_axes)`` array (or view) to write into.
+
+    Returns:
+        np.ndarray: float32 array of shape ``(m, n_axes)`` (``out`` if given).
+    """
+    if out is None:
+        out = np.empty((len(grid), values.shape[1]), dtype=np.float32)
+    if _interpolate_sorted_jit is not None:
+        # Column views of the raw sample rows are read in place, without copies
+        _interpolate_sorted_jit(times, values, grid, out)
+        return out
+
+    values = np.asarray(values, dtype=np.float32)
+    last = len(times) - 1
+    # lo is the last sample at or before each grid time, so a grid time on a sample takes it exactly
+    lo = np.clip(np.searchsorted(times, grid, side="right") - 1, 0, last)
+    hi = np.minimum(lo + 1, last)
+    span = times[hi] - times[lo]
+    weight = np.divide(grid - times[lo], span, out=np.zeros_like(grid, dtype=np.float64), where=span > 0)
+    weight = np.clip(weight, 0.0, 1.0).astype(np.float32)[:, None]
+    # take() gathers whole rows much faster than fancy indexing on large inputs
+    lower = values.take(lo, axis=0)
+    upper = values.take(hi, axis=0)
+    upper -= lower
+    upper *= weight
+    upper += lower
+    out[:] = upper
+    return out
+
+
+def _sorted_by_time(samples: np.ndarray) -> np.ndarray:
+    t = samples[:, 0]
+    if len(t) > 1 and np.any(t[1:] < t[:-1]):
+        return samples[np.argsort(t, kind="stable")]
+    return samples
+
+
+def align_sensors(acc: np.ndarray, gyro: np.ndarray, sampling_rate: int = 50,
+                  start: Optional[float] = None, stop: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Resample accelerometer and gyroscope streams onto one common time grid.
+
+    This is the single alignment used for training (DataTransformation),
+    upload serving and live streams. Both sensors are interpolated at the
+    same ``sampling_rate`` grid, so clocks that are out of phase, jittered
+    or running at a different rate still produce one row per grid time
+    over the whole stretch both sensors cover.
+
+    Args:
+        acc (np.ndarray): Accelerometer rows of ``seconds_elapsed, z, y, x``.
+        gyro (np.ndarray): Gyroscope rows of ``seconds_elapsed, z, y, x``.
+        sampling_rate (int): Grid rate in Hz.
+        start (float, optional): First grid time; defaults to where both sensors have started.
+        stop (float, optional): Last allowed grid time; defaults to where the first sensor ends.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Grid times and float32 rows of
+        acc z, y, x followed by gyro z, y, x (shape ``(n, 6)``).
+    """
+    if not len(acc) or not len(gyro):
+        return np.empty(0), np.empty((0, 6), dtype=np.float32)
+    acc = _sorted_by_time(np.asarray(acc, dtype=np.float64))
+    gyro = _sorted_by_time(np.asarray(gyro, dtype=np.float64))
+
+    first = max(acc[0, 0], gyro[0, 0])
+    last = min(acc[-1, 0], gyro[-1, 0])
+    start = first if start is None else max(start, first)
+    stop = last if stop is None else min(stop, last)
+    grid = time_grid(start, stop, sampling_rate)
+
+    aligned = np.empty((len(grid), 6), dtype=np.float32)
+    interpolate_samples(acc[:, 0], acc[:, 1:], grid, out=aligned[:, :3])
+    interpolate_samples(gyro[:, 0], gyro[:, 1:], grid, out=aligned[:, 3:])
+    return grid, aligned
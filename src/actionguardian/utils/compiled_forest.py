@@ -0,0 +1,171 @@
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the NumPy evaluator is used instead
+    njit = None
+
+
+def _accumulate_trees(X, roots, feature, threshold, left, right, value, out):
+    # Same per-sample summation order as sklearn: tree 0, tree 1, ...
+    for i in range(X.shape[0]):
+        for t in range(roots.shape[0]):
+            node = roots[t]
+            while left[node] != node:
+                if X[i, feature[node]] <= threshold[node]:
+                    node = left[node]
+                else:
+                    node = right[node]
+            for c in range(out.shape[1]):
+                out[i, c] += value[node, c]
+
+
+_accumulate_trees_jit = njit(cache=True, nogil=True)(_accumulate_trees) if njit is not None else None
+
+
+class CompiledForest:
+    """
+    Flat-array copy of a fitted sklearn tree ensemble for low-latency inference.
+
+    The nodes of all trees are packed into contiguous buffers (split feature,
+    threshold, left/right child and normalized leaf distribution) with each
+    tree's root at ``roots[t]``. Leaves are encoded as nodes whose children
+    point back to themselves, so a traversal step never branches on node type.
+
+    ``predict_proba`` reproduces ``RandomForestClassifier.predict_proba``
+    bit for bit: inputs are cast to float32 like sklearn does, splits compare
+    against the same float64 thresholds, leaf distributions are normalized
+    identically, and tree outputs are summed in tree order before dividing
+    by the number of trees. With numba installed the traversal is jitted;
+    otherwise all samples and trees advance one level per vectorized step.
+    """
+
+    def __init__(self, classes, roots, feature, threshold, left, right, value, max_depth: int, n_features_in: int):
+        self.classes_ = np.asarray(classes)
+        self.roots = roots
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.max_depth = max_depth
+        self.n_features_in_ = n_features_in
+
+    @classmethod
+    def from_sklearn(cls, forest, features_map=None, n_features_in: int = None) -> "CompiledForest":
+        """
+        Pack a fitted single-output forest classifier (e.g. ``RandomForestClassifier``).
+
+        Args:
+            forest: The fitted forest.
+            features_map (array-like, optional): For a forest fitted on a subset of
+                columns, the original column index of each of its features;
+                the compiled forest then takes the full ``n_features_in`` columns.
+            n_features_in (int, optional): Width of the full input when ``features_map`` is given.
+
+        Raises:
+            ValueError: If the forest predicts more than one output.
+        """
+        if getattr(forest, "n_outputs_", 1) != 1:
+            raise ValueError("Only single-output forests can be compiled")
+
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        offset = 0
+        for est in forest.estimators_:
+            tree = est.tree_
+            n = tree.node_count
+            own = np.arange(n)
+            is_leaf = tree.children_left == -1
+
+            roots.append(offset)
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(tree.threshold)
+            lefts.append(np.where(is_leaf, own, tree.children_left) + offset)
+            rights.append(np.where(is_leaf, own, tree.children_right) + offset)
+
+            # Exactly DecisionTreeClassifier.predict_proba's normalization
+            proba = tree.value[:, 0, :forest.n_classes_].astype(np.float64)
+            normalizer = proba.sum(axis=1)[:, np.newaxis]
+            normalizer[normalizer == 0.0] = 1.0
+            values.append(proba / normalizer)
+            offset += n
+
+        feature = np.concatenate(features)
+        if features_map is not None:
+            feature = np.asarray(features_map, dtype=np.intp)[feature]
+        return cls(
+            classes=forest.classes_,
+            roots=np.asarray(roots, dtype=np.intp),
+            feature=np.ascontiguousarray(feature, dtype=np.intp),
+            threshold=np.ascontiguousarray(np.concatenate(thresholds), dtype=np.float64),
+            left=np.ascontiguousarray(np.concatenate(lefts), dtype=np.intp),
+            right=np.ascontiguousarray(np.concatenate(rights), dtype=np.intp),
+            value=np.ascontiguousarray(np.concatenate(values)),
+            max_depth=max(est.tree_.max_depth for est in forest.estimators_),
+            n_features_in=forest.n_features_in_ if features_map is None else n_features_in
+        )
+
+    def compact(self) -> "CompiledForest":
+        """
+        Copy with the node arrays stored in the narrowest types that fit.
+
+        Thresholds are rounded *down* to float32, which keeps every split
+        decision identical for the float32 inputs the forest sees; indices
+        shrink to int16/int32 and leaf distributions to float32, so the
+        probabilities may differ from the float64 forest in the last bits.
+        Roughly halves the in-memory and pickled size.
+        """
+        threshold = self.threshold.astype(np.float32)
+        above = threshold.astype(np.float64) > self.threshold
+        threshold[above] = np.nextafter(threshold[above], np.float32(-np.inf))
+        index_dtype = np.int32 if self.n_nodes < np.iinfo(np.int32).max else np.intp
+        feature_dtype = np.int16 if self.n_features_in_ <= np.iinfo(np.int16).max else np.int32
+        return type(self)(
+            classes=self.classes_,
+            roots=self.roots.astype(index_dtype),
+            feature=self.feature.astype(feature_dtype),
+            threshold=threshold,
+            left=self.left.astype(index_dtype),
+            right=self.right.astype(index_dtype),
+            value=self.value.astype(np.float32),
+            max_depth=self.max_depth,
+            n_features_in=self.n_features_in_
+        )
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    @property
+    def n_nodes(self) -> int:
+        return len(self.feature)
+
+    def _validate(self, X) -> np.ndarray:
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise ValueError(f"Expected input of shape (n, {self.n_features_in_}), got {X.shape}")
+        return X
+
+    def _sum_numpy(self, X: np.ndarray) -> np.ndarray:
+        rows = np.arange(len(X))[:, None]
+        node = np.broadcast_to(self.roots, (len(X), self.n_trees))
+        for _ in range(self.max_depth):
+            go_left = X[rows, self.feature[node]] <= self.threshold[node]
+            node = np.where(go_left, self.left[node], self.right[node])
+        # cumsum adds strictly left to right, matching sklearn's tree-by-tree accumulation
+        return np.cumsum(self.value[node], axis=1, dtype=np.float64)[:, -1]
+
+    def predict_proba(self, X) -> np.ndarray:
+        X = self._validate(X)
+        if len(X) == 0:
+            return np.zeros((0, len(self.classes_)))
+        if _accumulate_trees_jit is not None:
+            proba = np.zeros((len(X), len(self.classes_)))
+            _accumulate_trees_jit(X, self.roots, self.feature, self.threshold, self.left, self.right, self.value, proba)
+        else:
+            proba = self._sum_numpy(X)
+        proba /= self.n_trees
+        return proba
+
+    def predict(self, X) -> np.ndarray:
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1), axis=0)
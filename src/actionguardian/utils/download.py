@@ -0,0 +1,179 @@
+import os
+import re
+import json
+import time
+import hashlib
+import threading
+import urllib.request as request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, Tuple
+from src.actionguardian import logger
+
+BLOCK_SIZE = 1 << 20
+LOG_INTERVAL_SECONDS = 5.0
+
+
+def sha256_file(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(BLOCK_SIZE), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def probe_range_support(url: str, timeout: float = 30.0) -> Tuple[str, Optional[int], bool]:
+    """
+    Ask for the first byte only to learn the size and whether ranges are honoured.
+
+    Returns:
+        Tuple[str, Optional[int], bool]: Final URL after redirects, total size
+        (None if unknown) and whether the server answered with 206.
+    """
+    req = request.Request(url, headers={"Range": "bytes=0-0"})
+    with request.urlopen(req, timeout=timeout) as resp:
+        final_url = resp.geturl()
+        if resp.status == 206:
+            match = re.match(r"bytes \d+-\d+/(\d+)", resp.headers.get("Content-Range", ""))
+            return final_url, int(match.group(1)) if match else None, match is not None
+        length = resp.headers.get("Content-Length")
+        return final_url, int(length) if length else None, False
+
+
+class _Progress:
+    def __init__(self, total: Optional[int], already: int = 0):
+        self.total = total
+        self.done = already
+        self.fetched = 0
+        self.start = time.monotonic()
+        self._last_log = self.start
+        self._lock = threading.Lock()
+
+    def add(self, n: int):
+        with self._lock:
+            self.done += n
+            self.fetched += n
+            now = time.monotonic()
+            if now - self._last_log >= LOG_INTERVAL_SECONDS:
+                self._last_log = now
+                self.log("Downloading")
+
+    def log(self, prefix: str):
+        elapsed = max(time.monotonic() - self.start, 1e-9)
+        total = f"/{self.total / 1e6:.1f}" if self.total else ""
+        logger.info(f"{prefix}: {self.done / 1e6:.1f}{total} MB, {self.fetched / 1e6 / elapsed:.2f} MB/s")
+
+
+class ResumableDownloader:
+    """
+    HTTP downloader that survives interruptions and verifies what it fetched.
+
+    Data goes to ``<dest>.part``; the final name only appears once every byte
+    has arrived and, if a SHA-256 is given, the digest matches. When the
+    server honours ``Range`` requests the file is fetched as fixed-size chunks
+    by several threads and completed chunks are recorded in
+    ``<dest>.part.json``, so a restart only fetches the missing chunks.
+    Servers without range support fall back to one sequential stream.
+    """
+
+    def __init__(self, chunk_size: int = 8 * BLOCK_SIZE, n_workers: int = 4,
+                 max_retries: int = 3, timeout: float = 60.0):
+        self.chunk_size = chunk_size
+        self.n_workers = n_workers
+        self.max_retries = max_retries
+        self.timeout = timeout
+
+    def download(self, url: str, dest: Path, sha256: Optional[str] = None) -> Path:
+        dest = Path(dest)
+        part = Path(f"{dest}.part")
+        state_path = Path(f"{dest}.part.json")
+        dest.parent.mkdir(parents=True, exist_ok=True)
+
+        final_url, size, ranged = probe_range_support(url, self.timeout)
+        if ranged and size:
+            self._download_chunks(final_url, size, part, state_path)
+        else:
+            logger.info("Server does not support range requests; downloading in a single stream")
+            self._download_stream(final_url, size, part)
+
+        if sha256:
+            digest = sha256_file(part)
+            if digest != sha256.lower():
+                part.unlink()
+                state_path.unlink(missing_ok=True)
+                raise ValueError(f"Checksum mismatch for {url}: expected {sha256}, got {digest}")
+            logger.info(f"SHA-256 verified for {dest}")
+        else:
+            logger.warning(f"No SHA-256 configured for {dest}, so the download is not verified; "
+                           f"it hashes to {sha256_file(part)}")
+
+        os.replace(part, dest)
+        state_path.unlink(missing_ok=True)
+        return dest
+
+    def _with_retries(self, fn, *args):
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                return fn(*args)
+            except OSError as e:
+                if attempt == self.max_retries:
+                    raise
+                logger.warning(f"Download attempt {attempt} failed ({e}); retrying")
+                time.sleep(2 ** (attempt - 1))
+
+    def _download_chunks(self, url: str, size: int, part: Path, state_path: Path):
+        n_chunks = (size + self.chunk_size - 1) // self.chunk_size
+        state = {"url": url, "size": size, "chunk_size": self.chunk_size, "done": []}
+        if state_path.exists() and part.exists():
+            with open(state_path, 'r') as f:
+                saved = json.load(f)
+            if saved.get("size") == size and saved.get("chunk_size") == self.chunk_size:
+                state["done"] = saved["done"]
+        if not state["done"] or not part.exists():
+            with open(part, 'wb') as f:
+                f.truncate(size)
+
+        done = set(state["done"])
+        todo = [i for i in range(n_chunks) if i not in done]
+        already = sum(min(self.chunk_size, size - i * self.chunk_size) for i in done)
+        if done:
+            logger.info(f"Resuming download: {len(done)}/{n_chunks} chunks already present")
+        progress = _Progress(size, already)
+        lock = threading.Lock()
+
+        def fetch(index: int):
+            start = index * self.chunk_size
+            end = min(start + self.chunk_size, size) - 1
+            req = request.Request(url, headers={"Range": f"bytes={start}-{end}"})
+            with request.urlopen(req, timeout=self.timeout) as resp, open(part, 'r+b') as f:
+                if resp.status != 206:
+                    raise OSError(f"Expected 206 for chunk {index}, got {resp.status}")
+                f.seek(start)
+                received = 0
+                for block in iter(lambda: resp.read(BLOCK_SIZE), b''):
+                    f.write(block)
+                    received += len(block)
+                    progress.add(len(block))
+            if received != end - start + 1:
+                raise OSError(f"Chunk {index} truncated: {received} of {end - start + 1} bytes")
+            with lock:
+                done.add(index)
+                state["done"] = sorted(done)
+                with open(state_path, 'w') as sf:
+                    json.dump(state, sf)
+
+        with ThreadPoolExecutor(max_workers=self.n_workers) as executor:
+            list(executor.map(lambda i: self._with_retries(fetch, i), todo))
+        progress.log("Download complete")
+
+    def _download_stream(self, url: str, size: Optional[int], part: Path):
+        progress = _Progress(size)
+
+        def fetch():
+            with request.urlopen(url, timeout=self.timeout) as resp, open(part, 'wb') as f:
+                for block in iter(lambda: resp.read(BLOCK_SIZE), b''):
+                    f.write(block)
+                    progress.add(len(block))
+
+        self._with_retries(fetch)
+        progress.log("Download complete")
@@ -0,0 +1,110 @@
+import os
+import hashlib
+import numpy as np
+from pathlib import Path
+from typing import Callable, Optional, Sequence, Tuple
+from src.actionguardian import logger
+from src.actionguardian.utils.features import FEATURE_NAMES, FEATURE_SET_VERSION
+
+
+def recording_hash(values: np.ndarray, labels: np.ndarray) -> str:
+    """
+    Content hash of one recording's sensor samples and per-sample labels.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    values = np.ascontiguousarray(values)
+    h.update(str((values.dtype.str, values.shape)).encode())
+    h.update(values.data)
+    h.update(np.asarray(labels).astype(str).tobytes())
+    return h.hexdigest()
+
+
+def _save_atomic(path: Path, array: np.ndarray):
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'wb') as f:
+        np.save(f, array)
+    os.replace(tmp_path, path)
+
+
+class FeatureStore:
+    """
+    On-disk cache of window features, one entry per recording and windowing.
+
+    Entries live under ``<root>/v<FEATURE_SET_VERSION>-<names hash>/w<window>_s<step>_r<rate>/``
+    as ``<recording hash>.X.npy`` (features) and ``.y.npy`` (window labels,
+    fixed-width strings), so they load with ``np.load(mmap_mode='r')``
+    without unpickling or copying. Changing the windowing only computes the
+    combinations not seen before; changing the feature code (and bumping
+    ``FEATURE_SET_VERSION``) starts a fresh namespace.
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        # Feature names are part of the namespace too, so a reordering can't reuse stale entries
+        names = hashlib.blake2b(",".join(FEATURE_NAMES).encode(), digest_size=4).hexdigest()
+        self.version_dir = self.root / f"v{FEATURE_SET_VERSION}-{names}"
+        self.hits = 0
+        self.misses = 0
+
+    def _paths(self, rec_hash: str, window_size: int, step_size: int, sampling_rate: int) -> Tuple[Path, Path]:
+        directory = self.version_dir / f"w{window_size}_s{step_size}_r{sampling_rate}"
+        return directory / f"{rec_hash}.X.npy", directory / f"{rec_hash}.y.npy"
+
+    def load(self, rec_hash: str, window_size: int, step_size: int,
+             sampling_rate: int) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Memory-mapped ``(features, labels)`` for a recording, or None if not stored yet.
+        """
+        x_path, y_path = self._paths(rec_hash, window_size, step_size, sampling_rate)
+        if not (x_path.exists() and y_path.exists()):
+            return None
+        return np.load(x_path, mmap_mode='r'), np.load(y_path, mmap_mode='r')
+
+    def save(self, rec_hash: str, window_size: int, step_size: int, sampling_rate: int,
+             X: np.ndarray, y: np.ndarray):
+        x_path, y_path = self._paths(rec_hash, window_size, step_size, sampling_rate)
+        x_path.parent.mkdir(parents=True, exist_ok=True)
+        # Labels first: an entry only counts as present once its features exist
+        _save_atomic(y_path, np.asarray(y).astype(str))
+        _save_atomic(x_path, np.asarray(X))
+
+    def get_or_compute(self, rec_hash: str, window_size: int, step_size: int, sampling_rate: int,
+                       compute: Callable[[], Tuple[np.ndarray, np.ndarray]]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Stored features for the recording, computing and storing them with ``compute`` on a miss.
+        """
+        cached = self.load(rec_hash, window_size, step_size, sampling_rate)
+        if cached is not None:
+            self.hits += 1
+            return cached
+        self.misses += 1
+        X, y = compute()
+        self.save(rec_hash, window_size, step_size, sampling_rate, X, y)
+        return self.load(rec_hash, window_size, step_size, sampling_rate)
+
+    @staticmethod
+    def assemble(parts: Sequence[Tuple[np.ndarray, np.ndarray]], X_path: Path, y_path: Path):
+        """
+        Concatenate per-recording entries into one ``.npy`` pair, streaming
+        each part into a preallocated file instead of building the whole
+        matrix in memory.
+        """
+        parts = [(X, y) for X, y in parts if len(X)]
+        if not parts:
+            raise ValueError("No features to assemble: every recording is shorter than one window")
+        n_rows = sum(len(X) for X, _ in parts)
+        n_features = parts[0][0].shape[1]
+        label_dtype = max((y.dtype for _, y in parts), key=lambda d: d.itemsize)
+
+        for path, shape, dtype, index in ((X_path, (n_rows, n_features), parts[0][0].dtype, 0),
+                                          (y_path, (n_rows,), label_dtype, 1)):
+            tmp_path = Path(path).with_name(Path(path).name + ".tmp")
+            out = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=dtype, shape=shape)
+            offset = 0
+            for part in parts:
+                out[offset:offset + len(part[index])] = part[index]
+                offset += len(part[index])
+            out.flush()
+            del out
+            os.replace(tmp_path, path)
+        logger.info(f"Assembled {n_rows} windows from {len(parts)} recordings into {X_path} and {y_path}")
@@ -0,0 +1,97 @@
+import numpy as np
+from scipy.fft import rfft
+
+# Per-axis feature layout shared by training (DataPreprocessor) and serving
+# (prediction_pipeline / services). Changing this order invalidates trained models.
+FEATURE_NAMES = [
+    "mean", "std", "min", "max", "median", "energy",
+    "jerk_mean", "jerk_std", "jerk_energy",
+    "zero_crossings",
+    "fft_mean", "fft_max", "fft_std",
+]
+FEATURES_PER_AXIS = len(FEATURE_NAMES)
+# Bump whenever the feature computation changes so cached features (FeatureStore) are recomputed
+FEATURE_SET_VERSION = 1
+
+
+def _spectrum_weights(window_size: int) -> np.ndarray:
+    """
+    Multiplicity of each rfft bin inside the full (two-sided) FFT spectrum.
+
+    The magnitude spectrum of a real signal is symmetric, so every bin except
+    DC (and Nyquist, for even lengths) appears twice in ``np.abs(fft(x))``.
+    Weighting the one-sided bins reproduces the full-spectrum statistics.
+    """
+    weights = np.full(window_size // 2 + 1, 2.0)
+    weights[0] = 1.0
+    if window_size % 2 == 0:
+        weights[-1] = 1.0
+    return weights
+
+
+def _extract_chunk(X: np.ndarray, sampling_rate: int) -> np.ndarray:
+    # (n_windows, window_size, n_axes) -> contiguous (n_windows, n_axes, window_size)
+    # so every reduction below runs over the fastest-varying axis.
+    S = np.ascontiguousarray(np.transpose(X, (0, 2, 1)), dtype=np.float64)
+    n_windows, n_axes, window_size = S.shape
+    out = np.empty((n_windows, n_axes, FEATURES_PER_AXIS), dtype=np.float64)
+
+    # Time-domain
+    out[..., 0] = S.mean(axis=2)
+    out[..., 1] = S.std(axis=2)
+    out[..., 2] = S.min(axis=2)
+    out[..., 3] = S.max(axis=2)
+    out[..., 4] = np.median(S, axis=2)
+    out[..., 5] = np.einsum("ijk,ijk->ij", S, S)
+
+    # Jerk
+    jerk = np.diff(S, axis=2)
+    jerk *= sampling_rate
+    out[..., 6] = jerk.mean(axis=2)
+    out[..., 7] = jerk.std(axis=2)
+    out[..., 8] = np.einsum("ijk,ijk->ij", jerk, jerk)
+    del jerk
+
+    # Zero crossing
+    out[..., 9] = ((S[..., :-1] * S[..., 1:]) < 0).sum(axis=2)
+
+    # Frequency-domain: one batched one-sided transform, weighted back to the
+    # statistics of the full two-sided magnitude spectrum.
+    mag = np.abs(rfft(S, axis=2))
+    weights = _spectrum_weights(window_size)
+    fft_mean = (mag @ weights) / window_size
+    fft_dev = mag - fft_mean[..., None]
+    fft_dev **= 2
+    out[..., 10] = fft_mean
+    out[..., 11] = mag.max(axis=2)
+    out[..., 12] = np.sqrt((fft_dev @ weights) / window_size)
+
+    return out.reshape(n_windows, n_axes * FEATURES_PER_AXIS)
+
+
+def extract_window_features(X: np.ndarray, sampling_rate: int = 50, chunk_size: int = 4096) -> np.ndarray:
+    """
+    Compute the per-axis feature set for a batch of windows in one pass.
+
+    Args:
+        X (np.ndarray): Windows of shape ``(n_windows, window_size, n_axes)``.
+        sampling_rate (int): Sensor sampling rate in Hz, used to scale jerk.
+        chunk_size (int): Windows processed per vectorized batch; bounds the
+            temporary memory used by the reductions.
+
+    Raises:
+        ValueError: If ``X`` is not 3-D or holds no windows.
+
+    Returns:
+        np.ndarray: Feature matrix of shape ``(n_windows, n_axes * 13)``,
+        ordered axis by axis as in ``FEATURE_NAMES``.
+    """
+    if X.ndim != 3 or X.shape[0] == 0:
+        raise ValueError("No features extracted. Possibly not enough data.")
+
+    n_windows = X.shape[0]
+    feats = np.empty((n_windows, X.shape[2] * FEATURES_PER_AXIS), dtype=np.float64)
+    for start in range(0, n_windows, chunk_size):
+        stop = min(start + chunk_size, n_windows)
+        feats[start:stop] = _extract_chunk(X[start:stop], sampling_rate)
+    return feats
@@ -0,0 +1,85 @@
+import os
+import warnings
+import threading
+import joblib
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+from src.actionguardian import logger
+
+
+class ModelRegistry:
+    """
+    Process-wide cache of joblib artifacts keyed by path and file signature.
+
+    ``get`` only costs an ``os.stat`` when the artifact is unchanged. When the
+    file on disk is replaced (new mtime or size) the next ``get`` loads the new
+    version and swaps it in, so long-running servers pick up retrained models
+    without a restart. Writers should replace artifacts atomically
+    (``os.replace``) so readers never observe a half-written file.
+
+    Arrays are loaded with ``mmap_mode`` (read-only by default): numpy buffers
+    that the unpickled objects keep by reference stay backed by the page cache
+    and are shared between worker processes instead of being copied into each.
+    """
+
+    def __init__(self, mmap_mode: Optional[str] = "r"):
+        self.mmap_mode = mmap_mode
+        self._entries: Dict[str, Tuple[Tuple[int, int], Any]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _signature(path: Path) -> Tuple[int, int]:
+        st = os.stat(path)
+        return st.st_mtime_ns, st.st_size
+
+    def version(self, path: Path) -> str:
+        """
+        Identifier of the artifact currently on disk, e.g. for cache keys.
+        """
+        mtime_ns, size = self._signature(path)
+        return f"{mtime_ns:x}-{size:x}"
+
+    def get(self, path: Path, loader: Optional[Callable[[Path], Any]] = None) -> Any:
+        """
+        Return the loaded artifact at ``path``, reloading it if the file changed.
+
+        Args:
+            path (Path): Path to a joblib artifact.
+            loader (Callable, optional): Builds the object from the path instead
+                of ``joblib.load`` (e.g. an onnxruntime session for ``.onnx`` files).
+
+        Raises:
+            FileNotFoundError: If the artifact does not exist.
+
+        Returns:
+            Any: The deserialized object.
+        """
+        key = str(Path(path).resolve())
+        sig = self._signature(path)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == sig:
+            return entry[1]
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == sig:
+                return entry[1]
+            if loader is not None:
+                obj = loader(path)
+            else:
+                with warnings.catch_warnings():
+                    # Compressed artifacts (e.g. the compacted model) are simply loaded into memory
+                    warnings.filterwarnings("ignore", message=".*not compatible with compressed file")
+                    obj = joblib.load(path, mmap_mode=self.mmap_mode)
+            self._entries[key] = (sig, obj)
+            action = "Reloaded" if entry is not None else "Loaded"
+            logger.info(f"{action} artifact into registry: {path}")
+            return obj
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# Shared instance for the serving process and pipeline scripts
+registry = ModelRegistry()
@@ -0,0 +1,74 @@
+import json
+import numpy as np
+from pathlib import Path
+from typing import Tuple
+
+CLASSES_KEY = "classes"
+PROBA_OUTPUT = "probabilities"
+
+
+def to_onnx(pipeline, n_features: int) -> bytes:
+    """
+    Convert a fitted ``Pipeline(scaler, forest)`` into one serialized ONNX graph.
+
+    The graph takes raw float32 feature rows (input ``features``) and returns
+    ``label`` and a dense ``probabilities`` tensor (no ZipMap). The
+    classifier's ``classes_`` are stored in the model metadata so the runtime
+    side can decode columns without the pickle.
+    """
+    from skl2onnx import convert_sklearn   # optional; only needed to export
+    from skl2onnx.common.data_types import FloatTensorType
+
+    classifier = pipeline.steps[-1][1]
+    onx = convert_sklearn(
+        pipeline,
+        initial_types=[("features", FloatTensorType([None, n_features]))],
+        options={id(classifier): {"zipmap": False}},
+    )
+    meta = onx.metadata_props.add()
+    meta.key = CLASSES_KEY
+    meta.value = json.dumps(np.asarray(classifier.classes_).tolist())
+    return onx.SerializeToString()
+
+
+class OnnxClassifier:
+    """
+    ``predict_proba``/``predict`` backed by an onnxruntime CPU session.
+
+    Loads the graph written by ``ModelTrainer.export_onnx``; the scaler is
+    part of the graph, so callers pass raw feature rows. ``run`` is thread
+    safe, so one instance serves every request thread. ``intra_op_threads``
+    bounds the cores a single call may use.
+    """
+
+    def __init__(self, path: Path, intra_op_threads: int = 1):
+        import onnxruntime as ort   # optional; only needed for backend: onnx
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = intra_op_threads
+        options.inter_op_num_threads = 1
+        self.path = Path(path)
+        self.session = ort.InferenceSession(str(path), sess_options=options, providers=["CPUExecutionProvider"])
+        self.input_name = self.session.get_inputs()[0].name
+        self.n_features_in_ = self.session.get_inputs()[0].shape[1]
+        self.classes_ = np.asarray(json.loads(self.session.get_modelmeta().custom_metadata_map[CLASSES_KEY]))
+
+    def predict_proba(self, X) -> np.ndarray:
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if len(X) == 0:
+            return np.zeros((0, len(self.classes_)))
+        return self.session.run([PROBA_OUTPUT], {self.input_name: X})[0].astype(np.float64)
+
+    def predict(self, X) -> np.ndarray:
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1), axis=0)
+
+
+def parity(reference, onnx_model: OnnxClassifier, X_raw: np.ndarray, X_reference: np.ndarray) -> Tuple[float, float]:
+    """
+    Share of rows where the ONNX graph predicts the same class as ``reference``,
+    and the largest absolute probability difference.
+    """
+    expected = reference.predict_proba(X_reference)
+    actual = onnx_model.predict_proba(X_raw)
+    agreement = float(np.mean(expected.argmax(axis=1) == actual.argmax(axis=1))) if len(X_raw) else 1.0
+    return agreement, float(np.abs(expected - actual).max()) if len(X_raw) else 0.0
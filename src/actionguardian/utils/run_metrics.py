@@ -0,0 +1,164 @@
+import io
+import os
+import sys
+import json
+import time
+import pstats
+import cProfile
+import resource
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Optional
+from src.actionguardian import logger
+
+PROFILERS = ("cprofile", "pyinstrument")
+
+
+def peak_rss_mb() -> float:
+    """High-water mark of this process's resident set size."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / 1024   # bytes on macOS, KiB on Linux
+
+
+def _children_cpu_s() -> float:
+    # Worker processes are included once they have exited (e.g. a ProcessPoolExecutor is shut down)
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def artifact_bytes(path: Path) -> int:
+    """Size of a file, or of every file below a directory (0 if missing)."""
+    path = Path(path)
+    if path.is_file():
+        return path.stat().st_size
+    if path.is_dir():
+        return sum(p.stat().st_size for p in path.rglob("*") if p.is_file())
+    return 0
+
+
+class _Profiler:
+    def __init__(self, kind: str, path_stem: Path):
+        if kind not in PROFILERS:
+            raise ValueError(f"Unknown profiler '{kind}', expected one of {PROFILERS}")
+        self.kind = kind
+        self.path_stem = Path(path_stem)
+        if kind == "pyinstrument":
+            from pyinstrument import Profiler   # optional; only needed for --profile pyinstrument
+            self._profiler = Profiler()
+        else:
+            self._profiler = cProfile.Profile()
+
+    def start(self):
+        if self.kind == "pyinstrument":
+            self._profiler.start()
+        else:
+            self._profiler.enable()
+
+    def stop(self) -> Path:
+        os.makedirs(self.path_stem.parent, exist_ok=True)
+        if self.kind == "pyinstrument":
+            self._profiler.stop()
+            out = self.path_stem.with_suffix(".html")
+            out.write_text(self._profiler.output_html())
+            self.path_stem.with_suffix(".txt").write_text(self._profiler.output_text(unicode=True))
+            return out
+
+        self._profiler.disable()
+        out = self.path_stem.with_suffix(".prof")
+        self._profiler.dump_stats(out)
+        summary = io.StringIO()
+        pstats.Stats(self._profiler, stream=summary).sort_stats("cumulative").print_stats(40)
+        self.path_stem.with_suffix(".txt").write_text(summary.getvalue())
+        return out
+
+
+@contextmanager
+def measure_stage(outputs: Iterable[Path] = (), profiler: Optional[str] = None,
+                  profile_path: Optional[Path] = None):
+    """
+    Measure the enclosed block and fill the yielded dict once it finishes.
+
+    Always recorded: wall time, CPU time of this process and of worker
+    processes that exited during the block, the process peak RSS (and how
+    much the block raised it) and the size of every declared output.
+
+    With ``profiler`` set, the block additionally runs under cProfile or
+    pyinstrument (written to ``profile_path`` with a ``.prof``/``.html``
+    and ``.txt`` suffix) and under tracemalloc for its peak Python/NumPy
+    heap, both of which slow the stage down.
+    """
+    metrics = {}
+    prof = _Profiler(profiler, profile_path) if profiler else None
+    rss_before = peak_rss_mb()
+    children_before = _children_cpu_s()
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    if prof:
+        tracemalloc.start()
+        prof.start()
+    try:
+        yield metrics
+    finally:
+        if prof:
+            metrics["profile"] = str(prof.stop())
+            metrics["peak_alloc_mb"] = tracemalloc.get_traced_memory()[1] / (1 << 20)
+            tracemalloc.stop()
+        metrics["wall_s"] = time.perf_counter() - wall_start
+        metrics["cpu_s"] = time.process_time() - cpu_start
+        metrics["children_cpu_s"] = _children_cpu_s() - children_before
+        metrics["peak_rss_mb"] = peak_rss_mb()
+        metrics["rss_growth_mb"] = metrics["peak_rss_mb"] - rss_before
+        metrics["artifact_bytes"] = {str(p): artifact_bytes(p) for p in outputs}
+
+
+class RunMetrics:
+    """
+    Per-stage measurements of one ``main.py`` run, rewritten after every stage.
+
+    Saving incrementally means a failed run still shows how far it got, and
+    later stages (model evaluation) can read the numbers of earlier ones.
+    """
+
+    def __init__(self, path: Path = Path("artifacts/run_metrics.json")):
+        self.path = Path(path)
+        self._started = time.perf_counter()
+        self._data = {"started_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"), "total_wall_s": 0.0, "stages": {}}
+
+    def record(self, stage_id: str, status: str, metrics: Optional[dict] = None):
+        self._data["stages"][stage_id] = {"status": status, **(metrics or {})}
+        self._data["total_wall_s"] = time.perf_counter() - self._started
+        self.save()
+
+    def save(self):
+        os.makedirs(self.path.parent, exist_ok=True)
+        tmp_path = Path(f"{self.path}.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(self._data, f, indent=4)
+        os.replace(tmp_path, self.path)
+
+    def log_summary(self):
+        ran = {k: v for k, v in self._data["stages"].items() if "wall_s" in v}
+        for stage_id, m in sorted(ran.items(), key=lambda kv: -kv[1]["wall_s"]):
+            logger.info(f"{stage_id:>15}: {m['wall_s']:8.2f}s wall, {m['cpu_s'] + m['children_cpu_s']:8.2f}s CPU, "
+                        f"peak RSS {m['peak_rss_mb']:.0f} MB")
+        logger.info(f"Run metrics written to {self.path}")
+
+
+def stage_metrics_for_mlflow(path: Path) -> dict:
+    """
+    Flatten ``run_metrics.json`` into MLflow metric names such as ``stage_training_wall_s``.
+    """
+    path = Path(path)
+    if not path.exists():
+        return {}
+    with open(path, 'r') as f:
+        stages = json.load(f).get("stages", {})
+    flat = {}
+    for stage_id, m in stages.items():
+        for key in ("wall_s", "cpu_s", "children_cpu_s", "peak_rss_mb", "peak_alloc_mb"):
+            if key in m:
+                flat[f"stage_{stage_id}_{key}"] = float(m[key])
+        if "artifact_bytes" in m:
+            flat[f"stage_{stage_id}_artifact_mb"] = sum(m["artifact_bytes"].values()) / (1 << 20)
+    return flat
@@ -0,0 +1,108 @@
+import os
+import zipfile
+import threading
+from glob import glob
+from fnmatch import fnmatch
+from pathlib import Path, PurePosixPath
+from typing import IO, List, Optional, Tuple
+
+
+class DirectorySource:
+    """
+    Sensor dataset laid out on disk (the extracted archive).
+    """
+
+    def glob(self, pattern: str) -> List[str]:
+        return sorted(glob(pattern))
+
+    def find(self, base_dir: str, filename: str) -> List[str]:
+        """Every file called ``filename`` anywhere below ``base_dir``."""
+        return sorted(str(p) for p in Path(base_dir).rglob(filename))
+
+    def exists(self, path: str) -> bool:
+        return os.path.exists(path)
+
+    def open(self, path: str) -> IO[bytes]:
+        return open(path, 'rb')
+
+    def signature(self, path: str) -> Tuple[int, int]:
+        st = os.stat(path)
+        return st.st_size, st.st_mtime_ns
+
+
+class ZipSource:
+    """
+    Sensor dataset read directly from ``Sensor_Data.zip`` without extracting it.
+
+    Paths are the ones the extracted layout would have (``root`` is the
+    extraction directory), so code written against ``DirectorySource`` works
+    unchanged: ``<root>/Sensor_Data/Jogging_1/Accelerometer.csv`` is served
+    from the member ``Sensor_Data/Jogging_1/Accelerometer.csv``.
+    """
+
+    def __init__(self, zip_path: Path, root: Path):
+        self.zip_path = Path(zip_path)
+        self.root = Path(root)
+        self._local = threading.local()
+        self._index = None
+
+    def __getstate__(self):
+        # Zip handles can't cross process boundaries; workers reopen lazily.
+        return {"zip_path": self.zip_path, "root": self.root}
+
+    def __setstate__(self, state):
+        self.__init__(state["zip_path"], state["root"])
+
+    @property
+    def _zip(self) -> zipfile.ZipFile:
+        zf = getattr(self._local, "zf", None)
+        if zf is None:
+            zf = self._local.zf = zipfile.ZipFile(self.zip_path, 'r')
+        return zf
+
+    @property
+    def index(self) -> dict:
+        """Member name -> ZipInfo for every file in the archive (central directory only)."""
+        if self._index is None:
+            self._index = {i.filename: i for i in self._zip.infolist() if not i.is_dir()}
+        return self._index
+
+    def _member(self, path: str) -> str:
+        return Path(path).relative_to(self.root).as_posix()
+
+    def _path(self, member: str) -> str:
+        return str(self.root / PurePosixPath(member))
+
+    def glob(self, pattern: str) -> List[str]:
+        pattern = self._member(pattern)
+        names = set(self.index)
+        # Directories are implied by member paths even when the archive has no explicit entries
+        for name in self.index:
+            names.update(str(parent) for parent in PurePosixPath(name).parents if str(parent) != '.')
+        return sorted(self._path(n) for n in names if fnmatch(n, pattern) and n.count('/') == pattern.count('/'))
+
+    def find(self, base_dir: str, filename: str) -> List[str]:
+        """Every member called ``filename`` anywhere below ``base_dir``."""
+        prefix = self._member(base_dir)
+        prefix = '' if prefix == '.' else prefix + '/'
+        return sorted(self._path(n) for n in self.index
+                      if n.startswith(prefix) and PurePosixPath(n).name == filename)
+
+    def exists(self, path: str) -> bool:
+        return self._member(path) in self.index
+
+    def open(self, path: str) -> IO[bytes]:
+        return self._zip.open(self._member(path))
+
+    def signature(self, path: str) -> Tuple[int, int]:
+        info = self.index[self._member(path)]
+        return info.CRC, info.file_size
+
+
+def get_sensor_source(zip_path: Optional[Path], root: Path):
+    """
+    ``ZipSource`` when the dataset is read from the archive, else ``DirectorySource``.
+    """
+    if zip_path is not None:
+        return ZipSource(zip_path, root)
+    return DirectorySource()
@@ -0,0 +1,93 @@
+import os
+import json
+import hashlib
+from pathlib import Path
+from typing import Any, Dict, Iterable, List
+from src.actionguardian import logger
+
+
+class StageCache:
+    """
+    Content-hash cache deciding whether a pipeline stage can be skipped.
+
+    A stage fingerprint combines its config section, its params, the content
+    of its upstream artifacts and the source files implementing it. When the
+    fingerprint matches the one recorded after the last successful run and
+    every declared output still exists, the stage is up to date.
+
+    File hashes are memoized by (size, mtime) so large unchanged inputs such
+    as the raw dataset are only read once.
+    """
+
+    def __init__(self, path: Path = Path("artifacts/stage_cache.json")):
+        self.path = Path(path)
+        self._state = {"stages": {}, "files": {}}
+        if self.path.exists():
+            with open(self.path, 'r') as f:
+                self._state.update(json.load(f))
+
+    def _save(self):
+        os.makedirs(self.path.parent, exist_ok=True)
+        tmp_path = Path(f"{self.path}.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(self._state, f, indent=4)
+        os.replace(tmp_path, self.path)
+
+    def _hash_file(self, path: Path) -> str:
+        st = path.stat()
+        key = str(path.resolve())
+        sig = [st.st_size, st.st_mtime_ns]
+        memo = self._state["files"].get(key)
+        if memo is not None and memo["sig"] == sig:
+            return memo["sha256"]
+
+        h = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                h.update(block)
+        digest = h.hexdigest()
+        self._state["files"][key] = {"sig": sig, "sha256": digest}
+        return digest
+
+    def hash_path(self, path: Path) -> str:
+        """
+        Content hash of a file, or of every file below a directory.
+        """
+        path = Path(path)
+        if path.is_file():
+            return self._hash_file(path)
+        if path.is_dir():
+            h = hashlib.sha256()
+            for p in sorted(p for p in path.rglob('*') if p.is_file()):
+                h.update(str(p.relative_to(path)).encode())
+                h.update(self._hash_file(p).encode())
+            return h.hexdigest()
+        return "missing"
+
+    def fingerprint(self, config: Dict[str, Any], inputs: Iterable[Path], sources: Iterable[Path]) -> str:
+        """
+        Fingerprint a stage from its settings, upstream artifacts and source code.
+
+        Args:
+            config (Dict[str, Any]): JSON-serializable settings (config sections, params).
+            inputs (Iterable[Path]): Upstream artifact files or directories.
+            sources (Iterable[Path]): Python files implementing the stage.
+
+        Returns:
+            str: Hex digest identifying this exact stage input.
+        """
+        payload = {
+            "config": config,
+            "inputs": {str(p): self.hash_path(p) for p in inputs},
+            "sources": {str(p): self.hash_path(p) for p in sources},
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+    def is_fresh(self, stage: str, fingerprint: str, outputs: List[Path]) -> bool:
+        recorded = self._state["stages"].get(stage)
+        return recorded == fingerprint and all(Path(p).exists() for p in outputs)
+
+    def record(self, stage: str, fingerprint: str):
+        self._state["stages"][stage] = fingerprint
+        self._save()
+        logger.info(f"Stage cache updated for {stage}")
@@ -0,0 +1,92 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Dict, List, Sequence
+
+SMOOTHING_METHODS = ("none", "mean", "median")
+
+
+def smooth_probabilities(proba: np.ndarray, method: str = "median", window: int = 5) -> np.ndarray:
+    """
+    Smooth per-window class probabilities over neighbouring windows.
+
+    Both filters are centred on each window and vectorized over the whole
+    timeline. ``mean`` uses a cumulative sum, so its cost is O(n) regardless
+    of ``window``; the window shrinks at the edges instead of padding.
+    ``median`` takes the per-class median over an edge-padded strided view,
+    which suppresses isolated single-window flips without blurring the
+    boundaries of longer activities. Rows are renormalized to sum to 1.
+
+    Args:
+        proba (np.ndarray): ``(n_windows, n_classes)`` probabilities.
+        method (str): One of ``SMOOTHING_METHODS``.
+        window (int): Number of windows in the filter (odd values keep it centred).
+
+    Raises:
+        ValueError: If ``method`` is unknown or ``window`` < 1.
+
+    Returns:
+        np.ndarray: Smoothed probabilities with the shape of ``proba``.
+    """
+    if method not in SMOOTHING_METHODS:
+        raise ValueError(f"Unknown smoothing method '{method}', expected one of {SMOOTHING_METHODS}")
+    if window < 1:
+        raise ValueError("Smoothing window must be at least 1")
+
+    proba = np.asarray(proba, dtype=np.float64)
+    n = len(proba)
+    if method == "none" or window == 1 or n == 0:
+        return proba
+
+    half = window // 2
+    if method == "mean":
+        csum = np.concatenate([np.zeros((1, proba.shape[1])), np.cumsum(proba, axis=0)])
+        idx = np.arange(n)
+        lo = np.clip(idx - half, 0, n)
+        hi = np.clip(idx - half + window, 0, n)
+        smoothed = (csum[hi] - csum[lo]) / (hi - lo)[:, None]
+    else:
+        padded = np.pad(proba, ((half, window - 1 - half), (0, 0)), mode="edge")
+        smoothed = np.median(sliding_window_view(padded, window, axis=0), axis=-1)
+
+    totals = smoothed.sum(axis=1, keepdims=True)
+    return smoothed / np.where(totals > 0, totals, 1.0)
+
+
+def activity_segments(labels: np.ndarray, start_seconds: np.ndarray, hop_seconds: float) -> List[dict]:
+    """
+    Collapse a per-window label sequence into runs of the same activity.
+
+    Each window is credited with ``hop_seconds`` (the new data it adds), so
+    segment durations add up to the activity summary.
+
+    Returns:
+        List[dict]: ``start``/``end`` in seconds, the class index and the
+        number of windows for every run, in time order.
+    """
+    labels = np.asarray(labels)
+    if len(labels) == 0:
+        return []
+    change = np.flatnonzero(labels[1:] != labels[:-1]) + 1
+    starts = np.concatenate([[0], change])
+    ends = np.concatenate([change, [len(labels)]])
+    begin = np.asarray(start_seconds, dtype=np.float64)[starts]
+    return [
+        {"start": float(b), "end": float(b + (e - s) * hop_seconds), "label": int(labels[s]), "windows": int(e - s)}
+        for b, s, e in zip(begin, starts, ends)
+    ]
+
+
+def activity_durations(labels: np.ndarray, classes: Sequence, hop_seconds: float) -> Dict[str, float]:
+    """
+    Seconds spent in each predicted activity, for activities that occur at all.
+
+    Args:
+        labels (np.ndarray): Per-window class indices into ``classes``.
+        classes (Sequence): Class names, one per probability column.
+        hop_seconds (float): Seconds of new data per window (``step_size / sampling_rate``).
+
+    Returns:
+        Dict[str, float]: Activity name -> duration in seconds.
+    """
+    counts = np.bincount(np.asarray(labels, dtype=np.intp), minlength=len(classes))
+    return {str(classes[i]): float(c * hop_seconds) for i, c in enumerate(counts) if c}
@@ -0,0 +1,72 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def window_starts(n_samples: int, window_size: int, step_size: int) -> np.ndarray:
+    """
+    Start index of every complete window over ``n_samples`` rows.
+
+    Args:
+        n_samples (int): Number of rows in the signal.
+        window_size (int): Window length in samples.
+        step_size (int): Hop between consecutive windows in samples.
+
+    Returns:
+        np.ndarray: Start indices (possibly empty).
+    """
+    return np.arange(0, max(n_samples - window_size + 1, 0), step_size)
+
+
+def sliding_windows(values: np.ndarray, window_size: int, step_size: int) -> np.ndarray:
+    """
+    Strided, read-only view of all complete windows over a 2-D signal.
+
+    No sample data is copied: overlapping windows share the memory of
+    ``values``. Callers that need to modify a window must copy it first.
+
+    Args:
+        values (np.ndarray): Signal of shape ``(n_samples, n_axes)``.
+        window_size (int): Window length in samples.
+        step_size (int): Hop between consecutive windows in samples.
+
+    Raises:
+        ValueError: If the signal is shorter than one window.
+
+    Returns:
+        np.ndarray: View of shape ``(n_windows, window_size, n_axes)``.
+    """
+    if values.shape[0] < window_size:
+        raise ValueError("No sliding windows could be created. Not enough data.")
+    # sliding_window_view puts the window axis last: (n, n_axes, window_size)
+    view = sliding_window_view(values, window_size, axis=0)[::step_size]
+    return view.transpose(0, 2, 1)
+
+
+def majority_labels(labels: np.ndarray, window_size: int, step_size: int) -> np.ndarray:
+    """
+    Most frequent label of every window, computed without a per-window loop.
+
+    Labels are encoded once, per-class counts for each window come from
+    cumulative sums, and ties resolve to the smallest label (the same rule
+    as ``pd.Series.mode()[0]``).
+
+    Args:
+        labels (np.ndarray): Per-sample labels of shape ``(n_samples,)``.
+        window_size (int): Window length in samples.
+        step_size (int): Hop between consecutive windows in samples.
+
+    Returns:
+        np.ndarray: One label per window, aligned with ``sliding_windows``.
+    """
+    classes, codes = np.unique(labels, return_inverse=True)
+    starts = window_starts(len(labels), window_size, step_size)
+    ends = starts + window_size
+
+    counts = np.empty((len(starts), len(classes)), dtype=np.int64)
+    csum = np.empty(len(labels) + 1, dtype=np.int64)
+    csum[0] = 0
+    for k in range(len(classes)):
+        np.cumsum(codes == k, out=csum[1:])
+        counts[:, k] = csum[ends] - csum[starts]
+    return classes[counts.argmax(axis=1)]
+
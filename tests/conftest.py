@@ -0,0 +1,7 @@
+import sys
+from pathlib import Path
+
+# Tests import the repo the way main.py and the server do: `src.actionguardian...` and `services...`
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
@@ -0,0 +1,65 @@
+import time
+import asyncio
+import threading
+
+import numpy as np
+
+from services.batching import PredictionBatcher
+
+
+class SlowModel:
+    """predict_fn stand-in that records how many calls overlap."""
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.running = 0
+        self.max_running = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, X):
+        with self._lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(self.seconds)
+        with self._lock:
+            self.running -= 1
+        return X * 2
+
+
+def _run(batcher, n_requests, gap):
+    async def request(i):
+        await asyncio.sleep(i * gap)
+        return await batcher.predict(np.full((3, 2), i, dtype=float))
+
+    async def scenario():
+        return await asyncio.gather(*(request(i) for i in range(n_requests)))
+
+    return asyncio.run(scenario())
+
+
+def test_results_are_scattered_back_in_order():
+    batcher = PredictionBatcher(SlowModel(0.01), max_delay_ms=20, n_threads=1)
+    results = _run(batcher, 5, gap=0.0)
+    for i, result in enumerate(results):
+        np.testing.assert_array_equal(result, np.full((3, 2), 2 * i))
+    assert batcher.total_batches == 1 and batcher.total_requests == 5
+
+
+def test_batches_run_concurrently_up_to_n_threads():
+    model = SlowModel(0.2)
+    batcher = PredictionBatcher(model, max_delay_ms=1, n_threads=2)
+    start = time.perf_counter()
+    # Spaced wider than max_delay, so each request closes its own batch
+    _run(batcher, 4, gap=0.02)
+    elapsed = time.perf_counter() - start
+    assert model.max_running == 2
+    assert elapsed < 0.6
+
+
+def test_single_thread_predicts_one_batch_at_a_time():
+    model = SlowModel(0.05)
+    batcher = PredictionBatcher(model, max_delay_ms=1, n_threads=1)
+    _run(batcher, 4, gap=0.01)
+    assert model.max_running == 1
+    # Requests queued while the thread was busy joined a later batch
+    assert batcher.total_batches < 4
@@ -0,0 +1,88 @@
+import os
+import zipfile
+
+import pytest
+
+from src.actionguardian.entity.config_entity import DataIngestionConfig
+from src.actionguardian.components.data_ingestion import DataIngestion
+from src.actionguardian.utils.sensor_source import DirectorySource, ZipSource
+
+CSV = "time,seconds_elapsed,z,y,x\n"
+
+
+def _write_zip(path, members):
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, text in members.items():
+            zf.writestr(name, text)
+
+
+def _members(**overrides):
+    members = {
+        "Sensor_Data/Jogging_1/Accelerometer.csv": CSV + "1,0.0,1,2,3\n",
+        "Sensor_Data/Jogging_1/Gyroscope.csv": CSV + "1,0.0,4,5,6\n",
+        "Sensor_Data/Upstair_all_1/Upstair_1/Accelerometer.csv": CSV + "1,0.0,7,8,9\n",
+        "Sensor_Data/Upstair_all_1/Upstair_1/Gyroscope.csv": CSV + "1,0.0,1,1,1\n",
+        "Sensor_Data/Upstair_all_1/Upstair_2/Accelerometer.csv": CSV + "1,0.0,2,2,2\n",
+        "Sensor_Data/Upstair_all_1/Upstair_2/Gyroscope.csv": CSV + "1,0.0,3,3,3\n",
+    }
+    members.update(overrides)
+    return {name: text for name, text in members.items() if text is not None}
+
+
+@pytest.fixture
+def ingestion(tmp_path):
+    config = DataIngestionConfig(root_dir=tmp_path, source_URL="http://unused", n_workers=2,
+                                 local_data_file=tmp_path / "Sensor_Data.zip", unzip_dir=tmp_path / "data")
+    return DataIngestion(config)
+
+
+def _extracted(ingestion, monkeypatch):
+    calls = []
+    original = ingestion._extract_member
+    monkeypatch.setattr(ingestion, "_extract_member", lambda zf, name: (calls.append(name), original(zf, name)))
+    ingestion.extract_zip_file()
+    return sorted(calls)
+
+
+def test_zip_source_matches_extracted_directory(ingestion, tmp_path):
+    _write_zip(ingestion.config.local_data_file, _members())
+    ingestion.extract_zip_file()
+    root = str(ingestion.config.unzip_dir)
+    base = os.path.join(root, "Sensor_Data")
+    directory, archive = DirectorySource(), ZipSource(ingestion.config.local_data_file, root)
+
+    pattern = os.path.join(base, "Upstair_all_1", "Upstair_*")
+    assert archive.glob(pattern) == directory.glob(pattern)
+    assert len(archive.glob(pattern)) == 2
+    assert archive.find(base, "Gyroscope.csv") == directory.find(base, "Gyroscope.csv")
+    for path in directory.find(base, "Accelerometer.csv"):
+        assert archive.exists(path)
+        with archive.open(path) as a, directory.open(path) as d:
+            assert a.read() == d.read()
+    assert not archive.exists(os.path.join(base, "Walking_1", "Accelerometer.csv"))
+
+
+def test_reextraction_only_touches_changed_and_removed_members(ingestion, monkeypatch):
+    zip_path, root = ingestion.config.local_data_file, ingestion.config.unzip_dir
+    _write_zip(zip_path, _members())
+    assert len(_extracted(ingestion, monkeypatch)) == 6
+    assert _extracted(ingestion, monkeypatch) == []
+
+    changed = "Sensor_Data/Jogging_1/Gyroscope.csv"
+    added = "Sensor_Data/Upstair_all_1/Upstair_3/Accelerometer.csv"
+    _write_zip(zip_path, _members(**{
+        changed: CSV + "1,0.0,9,9,9\n",
+        added: CSV + "1,0.0,5,5,5\n",
+        "Sensor_Data/Upstair_all_1/Upstair_2/Accelerometer.csv": None,
+        "Sensor_Data/Upstair_all_1/Upstair_2/Gyroscope.csv": None,
+    }))
+    assert _extracted(ingestion, monkeypatch) == sorted([changed, added])
+
+    assert (root / changed).read_text().endswith("9,9,9\n")
+    # The removed recording must not be globbed by later stages any more
+    assert not (root / "Sensor_Data/Upstair_all_1/Upstair_2").exists()
+    assert (root / "Sensor_Data/Upstair_all_1/Upstair_1/Gyroscope.csv").exists()
+
+    # A deleted file is restored even though its CRC is unchanged
+    (root / "Sensor_Data/Jogging_1/Accelerometer.csv").unlink()
+    assert _extracted(ingestion, monkeypatch) == ["Sensor_Data/Jogging_1/Accelerometer.csv"]
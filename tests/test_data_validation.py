@@ -0,0 +1,43 @@
+import json
+
+import pytest
+
+from src.actionguardian.entity.config_entity import DataValidationConfig
+from src.actionguardian.components.data_validation import DataValidation
+from src.actionguardian.utils.sensor_source import DirectorySource
+
+
+def _validation(tmp_path):
+    schema = {
+        "ACCELEROMETER_COLUMNS": {c: "float" for c in ("time", "seconds_elapsed", "z", "y", "x")},
+        "GYROSCOPE_COLUMNS": {c: "float" for c in ("time", "seconds_elapsed", "z", "y", "x")},
+    }
+    return DataValidation(DataValidationConfig(
+        root_dir=tmp_path, STATUS_FILE=str(tmp_path / "status.txt"), unzip_data_dir=tmp_path / "Sensor_Data",
+        all_schema=schema, cache_file=tmp_path / "validation_cache.json", n_workers=2
+    ))
+
+
+def test_read_errors_are_not_cached(tmp_path, monkeypatch):
+    recording = tmp_path / "Sensor_Data" / "Jogging_1"
+    recording.mkdir(parents=True)
+    for name in ("Accelerometer.csv", "Gyroscope.csv"):
+        (recording / name).write_text("time,seconds_elapsed,z,y,x\n1.0,0.0,0.1,0.2,0.3\n2.0,0.02,0.1,0.2,0.3\n")
+
+    original_open = DirectorySource.open
+
+    def flaky_open(self, path):
+        if path.endswith("Gyroscope.csv"):
+            raise PermissionError(f"Permission denied: '{path}'")
+        return original_open(self, path)
+
+    monkeypatch.setattr(DirectorySource, "open", flaky_open)
+    with pytest.raises(OSError, match="Could not read 1 sensor files"):
+        _validation(tmp_path).validate_all_sensor_files()
+    cached = json.loads((tmp_path / "validation_cache.json").read_text())["files"]
+    assert [p for p in cached if p.endswith("Gyroscope.csv")] == []
+    assert [p for p in cached if p.endswith("Accelerometer.csv")]
+
+    # Once the file is readable again the next run checks it instead of replaying the failure
+    monkeypatch.setattr(DirectorySource, "open", original_open)
+    assert _validation(tmp_path).validate_all_sensor_files() is True
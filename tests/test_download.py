@@ -0,0 +1,97 @@
+import re
+import json
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pytest
+
+from src.actionguardian.utils.download import ResumableDownloader
+
+PAYLOAD = np.random.default_rng(0).bytes(100_000)
+SHA256 = hashlib.sha256(PAYLOAD).hexdigest()
+CHUNK = 16_384
+
+
+class RangeHandler(BaseHTTPRequestHandler):
+    """Serves PAYLOAD, honouring ``Range``; starts listed in ``truncate`` are cut off halfway once."""
+
+    ranged = True
+    truncate = set()
+    requested = []
+
+    def do_GET(self):
+        match = re.match(r"bytes=(\d+)-(\d+)", self.headers.get("Range", ""))
+        if self.ranged and match:
+            start, end = int(match.group(1)), min(int(match.group(2)), len(PAYLOAD) - 1)
+            self.requested.append(start)
+            body = PAYLOAD[start:end + 1]
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(PAYLOAD)}")
+        else:
+            start, body = 0, PAYLOAD
+            self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if start in self.truncate and len(body) > 1:
+            self.truncate.discard(start)
+            body = body[:len(body) // 2]   # then drop the connection mid-transfer
+            self.close_connection = True
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    RangeHandler.ranged, RangeHandler.truncate, RangeHandler.requested = True, set(), []
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), RangeHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}/Sensor_Data.zip"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _downloader(max_retries):
+    return ResumableDownloader(chunk_size=CHUNK, n_workers=2, max_retries=max_retries, timeout=5.0)
+
+
+def test_truncated_chunk_is_retried(server, tmp_path, monkeypatch):
+    monkeypatch.setattr("time.sleep", lambda s: None)
+    RangeHandler.truncate = {2 * CHUNK}
+    dest = _downloader(max_retries=2).download(server, tmp_path / "data.zip", sha256=SHA256)
+    assert dest.read_bytes() == PAYLOAD
+    assert not (tmp_path / "data.zip.part").exists()
+
+
+def test_interrupted_download_resumes_missing_chunks_only(server, tmp_path):
+    dest = tmp_path / "data.zip"
+    RangeHandler.truncate = {3 * CHUNK}
+    with pytest.raises(OSError):
+        _downloader(max_retries=1).download(server, dest, sha256=SHA256)
+    assert not dest.exists()
+    done = json.loads((tmp_path / "data.zip.part.json").read_text())["done"]
+    assert done and 3 not in done
+
+    RangeHandler.requested = []
+    _downloader(max_retries=1).download(server, dest, sha256=SHA256)
+    # Besides the probe, only chunks missing from the state file are fetched again
+    missing = [i * CHUNK for i in range(-(-len(PAYLOAD) // CHUNK)) if i not in done]
+    assert sorted(RangeHandler.requested) == sorted([0] + missing)
+    assert hashlib.sha256(dest.read_bytes()).hexdigest() == SHA256
+    assert not (tmp_path / "data.zip.part.json").exists()
+
+
+def test_checksum_mismatch_discards_partial_file(server, tmp_path):
+    with pytest.raises(ValueError, match="Checksum mismatch"):
+        _downloader(max_retries=1).download(server, tmp_path / "data.zip", sha256="0" * 64)
+    assert not (tmp_path / "data.zip").exists() and not (tmp_path / "data.zip.part").exists()
+
+
+def test_server_without_ranges_falls_back_to_one_stream(server, tmp_path):
+    RangeHandler.ranged = False
+    dest = _downloader(max_retries=1).download(server, tmp_path / "data.zip", sha256=SHA256)
+    assert dest.read_bytes() == PAYLOAD
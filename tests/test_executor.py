@@ -0,0 +1,49 @@
+import os
+import asyncio
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from services.executor import BoundedProcessPool
+
+
+def _square(x):
+    return x * x
+
+
+def _crash_once(marker):
+    # The first call kills its worker outright, as an OOM kill or a native crash would
+    if not os.path.exists(marker):
+        open(marker, "w").close()
+        os._exit(1)
+    return "recovered"
+
+
+def _crash():
+    os._exit(1)
+
+
+def test_pool_recovers_from_a_dead_worker(tmp_path):
+    async def scenario():
+        pool = BoundedProcessPool(max_workers=1, max_pending=2)
+        try:
+            result = await pool.run(_crash_once, str(tmp_path / "crashed"))
+            # Later jobs run on the replacement executor
+            return result, await pool.run(_square, 7), pool.restarts
+        finally:
+            pool.shutdown()
+
+    assert asyncio.run(scenario()) == ("recovered", 49, 1)
+
+
+def test_pool_gives_up_after_one_retry():
+    async def scenario():
+        pool = BoundedProcessPool(max_workers=1, max_pending=2)
+        try:
+            with pytest.raises(BrokenProcessPool):
+                await pool.run(_crash)
+            return await pool.run(_square, 3), pool.in_flight
+        finally:
+            pool.shutdown()
+
+    assert asyncio.run(scenario()) == (9, 0)
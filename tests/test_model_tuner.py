@@ -0,0 +1,40 @@
+import numpy as np
+import yaml
+
+from src.actionguardian.entity.config_entity import ModelTuningConfig
+from src.actionguardian.components.model_tuner import ModelTuner
+
+
+def _tuner(tmp_path):
+    return ModelTuner(ModelTuningConfig(
+        root_dir=tmp_path, features_path=tmp_path / "X.npy", labels_path=tmp_path / "y.npy",
+        results_file=tmp_path / "results.json", params_file=tmp_path / "params.yaml",
+        params_section="RandomForestClassifier",
+        search_space={"max_depth": [2, None], "max_features": ["sqrt", 0.5]},
+        n_estimators=[4, 8], halving_factor=2, n_candidates=0, validation_size=0.25, test_size=0.2,
+        random_state=0, n_jobs=1
+    ))
+
+
+def test_tuning_keeps_hand_set_params(tmp_path):
+    (tmp_path / "params.yaml").write_text(yaml.safe_dump(
+        {"RandomForestClassifier": {"n_estimators": 300, "random_state": 42, "max_depth": 7}}
+    ))
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(200, 5))
+    y = np.where(X[:, 0] > 0, "walking", "sitting")
+
+    tuner = _tuner(tmp_path)
+    summary = tuner.tune(X, y)
+    assert set(summary["best_params"]) == {"max_depth", "max_features"}
+    assert summary["n_estimators"] == 8
+    assert len(summary["rungs"]) == 2 and len(summary["rungs"][1]["results"]) == 2
+
+    tuner.update_params(summary["best_params"])
+    section = yaml.safe_load((tmp_path / "params.yaml").read_text())["RandomForestClassifier"]
+    assert section == {"n_estimators": 300, "random_state": 42, **summary["best_params"]}
+
+    # Re-running with the same winner leaves the file untouched, so training stays fresh
+    mtime = (tmp_path / "params.yaml").stat().st_mtime_ns
+    tuner.update_params(summary["best_params"])
+    assert (tmp_path / "params.yaml").stat().st_mtime_ns == mtime
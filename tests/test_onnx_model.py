@@ -0,0 +1,77 @@
+import json
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+pytest.importorskip("skl2onnx")
+pytest.importorskip("onnxruntime")
+
+from src.actionguardian.entity.config_entity import ModelTrainerConfig
+from src.actionguardian.components.model_trainer import ModelTrainer
+from src.actionguardian.utils.onnx_model import OnnxClassifier, to_onnx
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(600, 8)).astype(np.float32) * 3 + 1
+    y = np.where(X[:, 0] + X[:, 1] > 2, "walking", np.where(X[:, 2] > 1, "running", "sitting"))
+    return X, y
+
+
+def _export(pipeline, n_features, path):
+    path.write_bytes(to_onnx(pipeline, n_features))
+    return OnnxClassifier(path)
+
+
+def test_forest_predict_proba_matches_sklearn(data, tmp_path):
+    X, y = data
+    forest = RandomForestClassifier(n_estimators=15, max_depth=6, random_state=0).fit(X, y)
+    onnx_model = _export(Pipeline([("forest", forest)]), X.shape[1], tmp_path / "forest.onnx")
+
+    # float32 inputs take the same branch in both runtimes, so only the leaf averaging rounds differently
+    np.testing.assert_allclose(onnx_model.predict_proba(X), forest.predict_proba(X), atol=1e-5)
+    np.testing.assert_array_equal(onnx_model.predict(X), forest.predict(X))
+    np.testing.assert_array_equal(onnx_model.classes_, forest.classes_)
+
+
+def test_scaler_pipeline_parity(data, tmp_path):
+    X, y = data
+    pipeline = Pipeline([("scaler", StandardScaler()),
+                         ("forest", RandomForestClassifier(n_estimators=15, random_state=0))]).fit(X, y)
+    onnx_model = _export(pipeline, X.shape[1], tmp_path / "pipeline.onnx")
+
+    expected = pipeline.predict_proba(X)
+    actual = onnx_model.predict_proba(X)
+    # Scaling runs in float32 in the graph, so a row right on a threshold may flip a single tree
+    assert np.mean(expected.argmax(axis=1) == actual.argmax(axis=1)) >= 0.99
+    assert np.abs(expected - actual).max() <= 1 / 15 + 1e-6
+    assert onnx_model.predict_proba(X[:0]).shape == (0, len(pipeline.classes_))
+
+
+def _trainer(tmp_path, min_agreement):
+    return ModelTrainer(ModelTrainerConfig(
+        root_dir=tmp_path, scaler_filename="scaler.pkl", label_encoder_filename="label_encoder.pkl",
+        model_filename="model.pkl", compiled_model_filename="compiled.pkl", metrics_filename="metrics.json",
+        test_size=0.2, random_state=0, n_estimators=10, features_path=tmp_path / "X.npy",
+        labels_path=tmp_path / "y.npy", n_jobs=1, onnx_model_filename="model.onnx",
+        onnx_min_agreement=min_agreement
+    ))
+
+
+def test_export_onnx_replaces_or_removes_graph(data, tmp_path):
+    X, y = data
+    trainer = _trainer(tmp_path, min_agreement=0.99)
+    trainer.train_and_evaluate(trainer.scale_features(X), trainer.encode_labels(y))
+    assert trainer.export_onnx(X)
+    assert (tmp_path / "model.onnx").exists()
+
+    # A failing parity check must not leave the previous run's graph behind for backend: onnx
+    failing = _trainer(tmp_path, min_agreement=1.01)
+    failing.train_and_evaluate(failing.scale_features(X), failing.encode_labels(y))
+    assert not failing.export_onnx(X)
+    assert not (tmp_path / "model.onnx").exists()
+    assert not (tmp_path / "model.onnx.tmp").exists()
+    assert json.loads((tmp_path / "metrics.json").read_text())["onnx"]["exported"] is False
@@ -0,0 +1,49 @@
+import ast
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("mlflow")       # main.py imports every stage, evaluation included
+pytest.importorskip("matplotlib")
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _package_imports(path):
+    """Files under src/actionguardian that ``path`` imports."""
+    found = set()
+    for node in ast.walk(ast.parse(path.read_text())):
+        if isinstance(node, ast.ImportFrom):
+            modules = [node.module or ""]
+        elif isinstance(node, ast.Import):
+            modules = [alias.name for alias in node.names]
+        else:
+            continue
+        for module in modules:
+            if not module.startswith("src.actionguardian"):
+                continue
+            parts = module.split(".")[2:]
+            candidate = "/".join(parts) + ".py" if parts else "__init__.py"
+            if not (REPO_ROOT / "src/actionguardian" / candidate).exists():
+                candidate = "/".join(parts) + "/__init__.py"
+            found.add(candidate)
+    return found
+
+
+def test_stage_sources_cover_everything_the_stage_imports(monkeypatch):
+    monkeypatch.chdir(REPO_ROOT)
+    import main
+    from src.actionguardian.config.configuration import ConfigurationManager
+
+    for stage, deps in main.stage_dependencies(ConfigurationManager()).items():
+        listed = set(main.COMMON_SOURCES) | set(deps["sources"])
+        assert all((main.PACKAGE_DIR / p).exists() for p in listed), stage
+
+        todo = [p for p in deps["sources"] if p.startswith(("components/", "pipeline/"))]
+        reached = set()
+        while todo:
+            source = todo.pop()
+            if source not in reached:
+                reached.add(source)
+                todo.extend(_package_imports(REPO_ROOT / "src/actionguardian" / source))
+        assert reached <= listed, f"{stage} does not fingerprint {sorted(reached - listed)}"
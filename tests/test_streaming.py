@@ -0,0 +1,113 @@
+import numpy as np
+import pytest
+
+from services.streaming import SensorStream, samples_from_message
+from src.actionguardian.utils.alignment import align_sensors
+from src.actionguardian.utils.windowing import sliding_windows
+
+
+def _samples(n, offset, rate, rng):
+    t = offset + np.arange(n) / rate
+    return np.column_stack([t, rng.normal(size=(n, 3))])
+
+
+def test_stream_matches_batch_alignment():
+    rng = np.random.default_rng(0)
+    acc, gyro = _samples(3000, 0.003, 100, rng), _samples(3000, 0.007, 100, rng)
+    stream = SensorStream(window_size=100, step_size=50, sampling_rate=50, warmup_seconds=5.0)
+    windows = []
+    for i in range(0, len(acc), 37):
+        windows.append(stream.push("accelerometer", acc[i:i + 37])[0])
+        windows.append(stream.push("gyroscope", gyro[i:i + 37])[0])
+    streamed = np.concatenate(windows)
+
+    _, aligned = align_sensors(acc, gyro, 50, start=max(acc[0, 0], gyro[0, 0]) + 5.0)
+    batch = np.array(sliding_windows(aligned, 100, 50))
+    np.testing.assert_array_equal(streamed, batch[:len(streamed)])
+    assert len(batch) - len(streamed) <= 1
+
+
+@pytest.mark.parametrize("message", [
+    {"sensor": "accelerometer", "seconds_elapsed": [0.0, None], "z": [1, 2], "y": [1, 2], "x": [1, 2]},
+    {"sensor": "accelerometer", "seconds_elapsed": [0.0], "z": [{"v": 1}], "y": [1], "x": [1]},
+    {"sensor": "gyroscope", "seconds_elapsed": [0.0], "z": [1]},
+    {"sensor": "gyroscope", "seconds_elapsed": [0.0, 1.0], "z": [1], "y": [1], "x": [1]},
+    {"sensor": "magnetometer"},
+    [1, 2, 3],
+])
+def test_malformed_messages_raise_value_error(message):
+    with pytest.raises(ValueError):
+        samples_from_message(message)
+
+
+def test_one_silent_sensor_keeps_buffers_bounded():
+    rng = np.random.default_rng(0)
+    stream = SensorStream(window_size=100, step_size=50, sampling_rate=50, max_lead_seconds=10.0)
+    acc = _samples(100 * 120, 0.0, 100, rng)
+    for i in range(0, len(acc), 100):
+        stream.push("accelerometer", acc[i:i + 100])
+    assert stream._acc[-1, 0] - stream._acc[0, 0] <= 10.0 + 0.01
+    assert stream.samples_dropped > 0
+
+    # Once the other sensor shows up, windows flow as usual
+    gyro = _samples(100 * 20, 110.0, 100, rng)
+    n_windows = sum(len(stream.push("gyroscope", gyro[i:i + 100])[0]) for i in range(0, len(gyro), 100))
+    assert n_windows > 0
+
+
+@pytest.fixture
+def stream_client(tmp_path, monkeypatch):
+    """TestClient for fast_api_server, serving a tiny forest from a scratch workspace."""
+    import sys
+    import joblib
+    from pathlib import Path
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.preprocessing import LabelEncoder, StandardScaler
+
+    testclient = pytest.importorskip("fastapi.testclient")
+    from src.actionguardian.config.configuration import ConfigurationManager
+    from src.actionguardian.pipeline.prediction_pipeline import extract_features_from_windows
+
+    repo_root = Path(__file__).resolve().parents[1]
+    for name in ("config", "params.yaml", "schema.yaml"):
+        (tmp_path / name).symlink_to(repo_root / name)
+    monkeypatch.chdir(tmp_path)
+
+    cfg = ConfigurationManager().get_serving_config()
+    rng = np.random.default_rng(0)
+    X = extract_features_from_windows(rng.normal(size=(40, cfg.window_size, 6)), cfg.sampling_rate)
+    encoder = LabelEncoder().fit(["sitting", "walking"])
+    scaler = StandardScaler().fit(X)
+    model = RandomForestClassifier(n_estimators=5, random_state=0).fit(scaler.transform(X), np.arange(40) % 2)
+    cfg.model_path.parent.mkdir(parents=True, exist_ok=True)
+    for obj, path in ((model, cfg.model_path), (scaler, cfg.scaler_path), (encoder, cfg.label_encoder_path)):
+        joblib.dump(obj, path)
+
+    sys.modules.pop("fast_api_server", None)
+    import fast_api_server
+    try:
+        with testclient.TestClient(fast_api_server.app) as client:
+            yield client, cfg
+    finally:
+        sys.modules.pop("fast_api_server", None)
+
+
+def _message(sensor, samples):
+    return {"sensor": sensor, **{f: samples[:, i].tolist() for i, f in enumerate(("seconds_elapsed", "z", "y", "x"))}}
+
+
+def test_invalid_json_frame_keeps_the_session_open(stream_client):
+    client, cfg = stream_client
+    rng = np.random.default_rng(1)
+    seconds = cfg.warmup_seconds + 2 * cfg.window_size / cfg.sampling_rate
+    n = int(seconds * cfg.sampling_rate)
+
+    with client.websocket_connect("/stream/") as ws:
+        ws.send_text("this is not json")
+        assert "error" in ws.receive_json()
+
+        ws.send_json(_message("accelerometer", _samples(n, 0.0, cfg.sampling_rate, rng)))
+        ws.send_json(_message("gyroscope", _samples(n, 0.01, cfg.sampling_rate, rng)))
+        reply = ws.receive_json()
+        assert reply["predictions"]
+        assert {p["activity"] for p in reply["predictions"]} <= {"sitting", "walking"}